@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Any, Optional
 
+from port_ocean.context.ocean import ocean
 from port_ocean.core.models import CachingStorageMode
+from port_ocean.helpers.metric.metric import MetricType
+
+
+class CacheEvictionReason:
+    EXPIRED = "expired"
+    SIZE = "size"
 
 
 class CacheProvider(ABC):
@@ -15,11 +22,26 @@ class CacheProvider(ABC):
         pass
 
     @abstractmethod
-    async def set(self, key: str, value: Any) -> None:
-        """Set a value in the cache."""
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Set a value in the cache, expiring after `ttl` seconds when provided.
+
+        Providers that don't support expiry keep the value until the cache is cleared.
+        """
         pass
 
     @abstractmethod
     async def clear(self) -> None:
         """Clear all values from the cache."""
         pass
+
+    def _record_metric(self, name: str, *labels: str, value: float = 1) -> None:
+        if not ocean.initialized:
+            return
+        ocean.metrics.inc_metric(name, [self.STORAGE_TYPE.value, *labels], value)
+
+    def _record_size(self, size_in_bytes: int) -> None:
+        if not ocean.initialized:
+            return
+        ocean.metrics.set_metric(
+            MetricType.CACHE_SIZE_NAME, [self.STORAGE_TYPE.value], size_in_bytes
+        )
@@ -1,10 +1,32 @@
+import asyncio
+import os
 import pickle
+import struct
+import tempfile
+import time
+from contextlib import suppress
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
 
-from port_ocean.cache.base import CacheProvider
+from loguru import logger
+
+from port_ocean.cache.base import CacheEvictionReason, CacheProvider
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
 from port_ocean.core.models import CachingStorageMode
+from port_ocean.helpers.metric.metric import MetricType
+
+DEFAULT_MAX_SIZE_IN_BYTES = 1024 * 1024 * 1024  # 1 gb
+
+CACHE_FILE_SUFFIX = ".pkl"
+TEMP_FILE_SUFFIX = ".tmp"
+# Every cache file starts with a header holding the expiry of the value, 0 when it doesn't expire. Files written
+# without the header by earlier versions are read as a plain pickle that doesn't expire
+HEADER = struct.Struct(">4sd")
+HEADER_MAGIC = b"OCC1"
+NO_EXPIRY = 0.0
+
+_MISS = object()
+_EXPIRED = object()
 
 
 class FailedToReadCacheFileError(FailedToReadCacheError):
@@ -15,47 +37,210 @@ class FailedToWriteCacheFileError(FailedToWriteCacheError):
     pass
 
 
+class _Eviction(NamedTuple):
+    size_in_bytes: int
+    expired: int
+    evicted: int
+
+
+def _read_expiry(f: Any) -> float:
+    header = f.read(HEADER.size)
+    if len(header) == HEADER.size and header[: len(HEADER_MAGIC)] == HEADER_MAGIC:
+        _, expires_at = HEADER.unpack(header)
+        return expires_at
+    f.seek(0)
+    return NO_EXPIRY
+
+
+def _is_expired(expires_at: float, now: float) -> bool:
+    return expires_at != NO_EXPIRY and expires_at <= now
+
+
 class DiskCacheProvider(CacheProvider):
+    """Cache kept in a directory with a file per key, shared by the processes of the integration.
+
+    The files are read and written in a thread, so large values don't block the event loop. A value is written to
+    a temporary file that replaces the cache file once complete, so readers never see a partial value. Expired
+    values are deleted when read, and once the files exceed `max_size_in_bytes` the expired ones and then the least
+    recently read ones are deleted.
+
+    A file per key is kept rather than a sqlite database or append-only segments: a value is loaded without
+    reading or locking the other values, deleting a value frees its space without a compaction, and replacing a
+    file is atomic for all the processes sharing the directory.
+    """
+
     STORAGE_TYPE = CachingStorageMode.disk
 
-    def __init__(self, cache_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        max_size_in_bytes: int | None = DEFAULT_MAX_SIZE_IN_BYTES,
+        default_ttl: float | None = None,
+    ) -> None:
         if cache_dir is None:
             cache_dir = "/tmp/ocean/.ocean_cache"
         self._cache_dir = Path(cache_dir)
         self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._max_size_in_bytes = max_size_in_bytes
+        self._default_ttl = default_ttl
+        # Estimate of the size of the files, unknown until the cache directory is scanned
+        self._size_in_bytes: int | None = None
 
     def _get_cache_path(self, key: str) -> Path:
-        return self._cache_dir / f"{key}.pkl"
+        return self._cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def _read(self, cache_path: Path) -> Any:
+        try:
+            with open(cache_path, "rb") as f:
+                expired = _is_expired(_read_expiry(f), time.time())
+                value = None if expired else pickle.load(f)
+        except FileNotFoundError:
+            return _MISS
+
+        if expired:
+            with suppress(FileNotFoundError):
+                cache_path.unlink()
+            return _EXPIRED
+
+        # The modification time orders the files by their last use for the eviction
+        with suppress(OSError):
+            os.utime(cache_path)
+        return value
+
+    def _write(self, cache_path: Path, value: Any, expires_at: float) -> int | None:
+        fd, temp_path = tempfile.mkstemp(
+            dir=self._cache_dir, prefix=f".{cache_path.stem}.", suffix=TEMP_FILE_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(HEADER_MAGIC, expires_at))
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            if self._max_size_in_bytes is not None and size > self._max_size_in_bytes:
+                os.unlink(temp_path)
+                logger.warning(
+                    f"Not caching {cache_path.stem}, its size of {size} bytes exceeds the cache size limit of "
+                    f"{self._max_size_in_bytes} bytes"
+                )
+                return None
+            os.replace(temp_path, cache_path)
+            return size
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(temp_path)
+            raise
+
+    def _evict_to_fit(self) -> _Eviction:
+        files: list[tuple[float, int, str]] = []
+        for entry in os.scandir(self._cache_dir):
+            if not entry.name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            with suppress(FileNotFoundError):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size_in_bytes = sum(size for _, size, _ in files)
+        if self._max_size_in_bytes is None or size_in_bytes <= self._max_size_in_bytes:
+            return _Eviction(size_in_bytes, 0, 0)
+
+        # Expired files are deleted before the files that are still valid, then the least recently used first
+        now = time.time()
+        expired_paths = set()
+        for _, _, path in files:
+            with suppress(OSError), open(path, "rb") as f:
+                if _is_expired(_read_expiry(f), now):
+                    expired_paths.add(path)
+
+        expired = evicted = 0
+        for _, size, path in sorted(
+            files, key=lambda file: (file[2] not in expired_paths, file[0])
+        ):
+            if size_in_bytes <= self._max_size_in_bytes:
+                break
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+            size_in_bytes -= size
+            if path in expired_paths:
+                expired += 1
+            else:
+                evicted += 1
+        return _Eviction(size_in_bytes, expired, evicted)
+
+    def _clear(self) -> None:
+        for pattern in (f"*{CACHE_FILE_SUFFIX}", f".*{TEMP_FILE_SUFFIX}"):
+            for cache_file in self._cache_dir.glob(pattern):
+                try:
+                    cache_file.unlink()
+                except OSError:
+                    pass
 
     async def get(self, key: str) -> Optional[Any]:
         cache_path = self._get_cache_path(key)
-        if not cache_path.exists():
-            return None
-
         try:
-            with open(cache_path, "rb") as f:
-                return pickle.load(f)
-        except (pickle.PickleError, EOFError) as e:
+            value = await asyncio.to_thread(self._read, cache_path)
+        except (pickle.PickleError, EOFError, OSError) as e:
             raise FailedToReadCacheFileError(
                 f"Failed to read cache file: {cache_path}: {str(e)}"
             )
 
-    async def set(self, key: str, value: Any) -> None:
+        if value is _MISS or value is _EXPIRED:
+            if value is _EXPIRED:
+                self._record_metric(
+                    MetricType.CACHE_EVICTIONS_NAME, CacheEvictionReason.EXPIRED
+                )
+            self._record_metric(MetricType.CACHE_MISSES_NAME)
+            return None
+
+        self._record_metric(MetricType.CACHE_HITS_NAME)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = ttl if ttl is not None else self._default_ttl
+        expires_at = time.time() + ttl if ttl is not None else NO_EXPIRY
         cache_path = self._get_cache_path(key)
         try:
-            with open(cache_path, "wb") as f:
-                pickle.dump(value, f)
+            size = await asyncio.to_thread(self._write, cache_path, value, expires_at)
+            if size is None:
+                self._record_metric(
+                    MetricType.CACHE_EVICTIONS_NAME, CacheEvictionReason.SIZE
+                )
+                return
+
+            # The cache directory is only scanned once the estimate of its size exceeds the limit, the files
+            # written by other processes are accounted for by the next scan
+            if self._size_in_bytes is not None:
+                self._size_in_bytes += size
+            if self._size_in_bytes is not None and (
+                self._max_size_in_bytes is None
+                or self._size_in_bytes <= self._max_size_in_bytes
+            ):
+                self._record_size(self._size_in_bytes)
+                return
+            eviction = await asyncio.to_thread(self._evict_to_fit)
         except (pickle.PickleError, IOError) as e:
             raise FailedToWriteCacheFileError(
                 f"Failed to write cache file: {cache_path}: {str(e)}"
             )
 
+        self._size_in_bytes = eviction.size_in_bytes
+        if eviction.expired:
+            self._record_metric(
+                MetricType.CACHE_EVICTIONS_NAME,
+                CacheEvictionReason.EXPIRED,
+                value=eviction.expired,
+            )
+        if eviction.evicted:
+            self._record_metric(
+                MetricType.CACHE_EVICTIONS_NAME,
+                CacheEvictionReason.SIZE,
+                value=eviction.evicted,
+            )
+        self._record_size(eviction.size_in_bytes)
+
     async def clear(self) -> None:
         try:
-            for cache_file in self._cache_dir.glob("*.pkl"):
-                try:
-                    cache_file.unlink()
-                except OSError:
-                    pass
+            await asyncio.to_thread(self._clear)
         except OSError:
             pass
+        self._size_in_bytes = None
+        self._record_size(0)
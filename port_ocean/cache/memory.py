@@ -1,7 +1,16 @@
-from typing import Any, Optional
-from port_ocean.cache.base import CacheProvider
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+from loguru import logger
+
+from port_ocean.cache.base import CacheEvictionReason, CacheProvider
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
 from port_ocean.core.models import CachingStorageMode
+from port_ocean.helpers.metric.metric import MetricType
+
+DEFAULT_MAX_SIZE_IN_BYTES = 1024 * 1024 * 256  # 256 mb
 
 
 class FailedToReadCacheMemoryError(FailedToReadCacheError):
@@ -12,25 +21,141 @@ class FailedToWriteCacheMemoryError(FailedToWriteCacheError):
     pass
 
 
+class _CacheEntry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float | None
+
+
+def get_approximate_size(value: Any) -> int:
+    """Approximate the memory held by a value, by summing the size of the objects reachable through its containers.
+
+    Objects shared between several containers are only counted once.
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+    return size
+
+
 class InMemoryCacheProvider(CacheProvider):
+    """Least recently used cache kept in the memory of the process.
+
+    Entries expire after their TTL, and the least recently used entries are evicted once the approximate size of
+    the cached values exceeds `max_size_in_bytes`. A value larger than the whole budget is not cached.
+    """
+
     CACHE_KEY = "cache"
     STORAGE_TYPE = CachingStorageMode.memory
 
-    def __init__(self, caching_storage: dict[str, Any] | None = None) -> None:
+    def __init__(
+        self,
+        caching_storage: dict[str, Any] | None = None,
+        max_size_in_bytes: int | None = DEFAULT_MAX_SIZE_IN_BYTES,
+        default_ttl: float | None = None,
+    ) -> None:
         self._storage = caching_storage or {}
-        self._storage[self.CACHE_KEY] = self._storage.get(self.CACHE_KEY, {})
+        self._max_size_in_bytes = max_size_in_bytes
+        self._default_ttl = default_ttl
+        self._storage[self.CACHE_KEY] = OrderedDict(
+            (key, _CacheEntry(value, get_approximate_size(value), None))
+            for key, value in self._storage.get(self.CACHE_KEY, {}).items()
+        )
+        self._size_in_bytes = sum(entry.size for entry in self._entries.values())
+
+    @property
+    def _entries(self) -> OrderedDict[str, _CacheEntry]:
+        return self._storage[self.CACHE_KEY]
+
+    @property
+    def size_in_bytes(self) -> int:
+        return self._size_in_bytes
+
+    def _evict(self, key: str, reason: str) -> None:
+        entry = self._entries.pop(key)
+        self._size_in_bytes -= entry.size
+        self._record_metric(MetricType.CACHE_EVICTIONS_NAME, reason)
 
     async def get(self, key: str) -> Optional[Any]:
         try:
-            return self._storage.get(self.CACHE_KEY, {}).get(key)
+            entry = self._entries.get(key)
         except KeyError as e:
             raise FailedToReadCacheMemoryError(f"Failed to read cache: {str(e)}")
 
-    async def set(self, key: str, value: Any) -> None:
-        try:
-            self._storage[self.CACHE_KEY][key] = value
-        except KeyError as e:
-            raise FailedToWriteCacheMemoryError(f"Failed to write cache: {str(e)}")
+        if entry is None:
+            self._record_metric(MetricType.CACHE_MISSES_NAME)
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._evict(key, CacheEvictionReason.EXPIRED)
+            self._record_size(self._size_in_bytes)
+            self._record_metric(MetricType.CACHE_MISSES_NAME)
+            return None
+
+        self._entries.move_to_end(key)
+        self._record_metric(MetricType.CACHE_HITS_NAME)
+        return entry.value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = ttl if ttl is not None else self._default_ttl
+        if key in self._entries:
+            self._size_in_bytes -= self._entries.pop(key).size
+        size = get_approximate_size(value)
+
+        if self._max_size_in_bytes is not None and size > self._max_size_in_bytes:
+            logger.warning(
+                f"Not caching {key}, its approximate size of {size} bytes exceeds the cache size limit of "
+                f"{self._max_size_in_bytes} bytes"
+            )
+            self._record_metric(
+                MetricType.CACHE_EVICTIONS_NAME, CacheEvictionReason.SIZE
+            )
+            self._record_size(self._size_in_bytes)
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = _CacheEntry(value, size, expires_at)
+        self._size_in_bytes += size
+        self._evict_to_fit()
+        self._record_size(self._size_in_bytes)
+
+    def _evict_to_fit(self) -> None:
+        if (
+            self._max_size_in_bytes is None
+            or self._size_in_bytes <= self._max_size_in_bytes
+        ):
+            return
+
+        # Expired entries are freed before evicting entries that are still valid
+        now = time.monotonic()
+        expired_keys = [
+            key
+            for key, entry in self._entries.items()
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        for key in expired_keys:
+            self._evict(key, CacheEvictionReason.EXPIRED)
+
+        while self._size_in_bytes > self._max_size_in_bytes:
+            least_recently_used_key = next(iter(self._entries))
+            self._evict(least_recently_used_key, CacheEvictionReason.SIZE)
 
     async def clear(self) -> None:
-        self._storage[self.CACHE_KEY].clear()
+        self._entries.clear()
+        self._size_in_bytes = 0
+        self._record_size(self._size_in_bytes)
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 from loguru import logger
@@ -15,6 +16,7 @@ from port_ocean.clients.port.utils import (
     get_internal_http_client,
     handle_port_status_code,
 )
+from port_ocean.config.settings import PortHttpSettings
 from port_ocean.exceptions.clients import KafkaCredentialsNotFound
 
 
@@ -34,8 +36,10 @@ class PortClient(
         integration_type: str,
         integration_version: str,
         ingest_url: str,
+        http_settings: PortHttpSettings | None = None,
     ):
         self.api_url = f"{base_url}/v1"
+        self.http_settings = http_settings or PortHttpSettings()
         self.client = get_internal_http_client(self)
         self.auth = PortAuthentication(
             self.client,
@@ -47,7 +51,9 @@ class PortClient(
             integration_version,
             ingest_url,
         )
-        EntityClientMixin.__init__(self, self.auth, self.client)
+        EntityClientMixin.__init__(
+            self, self.auth, self.client, self.http_settings.max_connections
+        )
         IntegrationClientMixin.__init__(
             self, integration_identifier, integration_version, self.auth, self.client
         )
@@ -98,3 +104,33 @@ class PortClient(
             logger.info("Integration resync state updated successfully")
 
         return response.json().get("integration", {})
+
+    async def prewarm_connections(self) -> None:
+        """Open the configured number of connections to Port, so the first requests don't pay for the handshakes."""
+        count = self.http_settings.prewarm_connections
+        if count <= 0:
+            return
+
+        logger.info(f"Opening {count} connections to Port")
+        headers = await self.auth.headers()
+        try:
+            # The requests are concurrent, so each of them needs a connection of its own
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(
+                        self.client.head(self.api_url, headers=headers)
+                        for _ in range(count)
+                    ),
+                    return_exceptions=True,
+                ),
+                timeout=self.http_settings.timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Timed out opening connections to Port")
+            return
+
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            logger.warning(
+                f"Failed to open {len(failures)} of {count} connections to Port, error: {failures[0]}"
+            )
@@ -1,7 +1,7 @@
 import asyncio
-from typing import Any, Literal
+from collections import defaultdict
+from typing import Any, AsyncIterator, Literal
 from urllib.parse import quote_plus
-import json
 
 import httpx
 from loguru import logger
@@ -17,62 +17,100 @@ from port_ocean.core.models import (
     Entity,
     PortAPIErrorMessage,
 )
+from port_ocean.core.ocean_types import EntityKey
 from starlette import status
 
 from port_ocean.helpers.metric.metric import MetricPhase, MetricType
-
-ENTITIES_BULK_SAMPLES_SIZE = 10
-ENTITIES_BULK_ESTIMATED_SIZE_MULTIPLIER = 1.5
-ENTITIES_BULK_MINIMUM_BATCH_SIZE = 1
+from port_ocean.utils import serialization
+from port_ocean.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+# The body of a bulk upsert request is the serialized entities joined between these
+ENTITIES_BULK_BODY_PREFIX = b'{"entities":['
+ENTITIES_BULK_BODY_SEPARATOR = b","
+ENTITIES_BULK_BODY_SUFFIX = b"]}"
+# Bulk upserts in flight are bounded by an adaptive limit starting at ENTITIES_BULK_UPSERT_CONCURRENCY
 ENTITIES_BULK_UPSERT_CONCURRENCY = 5
+ENTITIES_BULK_UPSERT_MIN_CONCURRENCY = 1
+ENTITIES_BULK_UPSERT_MAX_CONCURRENCY = 20
+# Bulk upserts slower than this (including their retries) are treated as a sign Port is overloaded
+ENTITIES_BULK_UPSERT_LATENCY_THRESHOLD_SECONDS = 15
+# Maximum number of entities of a single blueprint deleted by one bulk delete request
+ENTITIES_BULK_DELETE_MAX_SIZE = 100
+# Number of entities fetched by each request when paginating the entities of the integration
+SEARCH_ENTITIES_PAGE_SIZE = 1000
 
 
 class EntityClientMixin:
-    def __init__(self, auth: PortAuthentication, client: httpx.AsyncClient):
+    def __init__(
+        self,
+        auth: PortAuthentication,
+        client: httpx.AsyncClient,
+        max_connections: int = PORT_HTTP_MAX_CONNECTIONS_LIMIT,
+    ):
         self.auth = auth
         self.client = client
         # Semaphore is used to limit the number of concurrent requests to port, to avoid overloading it.
         # The number of concurrent requests is set to 90% of the max connections limit, to leave some room for other
         # requests that are not related to entities.
         self.semaphore = asyncio.Semaphore(
-            round(0.5 * PORT_HTTP_MAX_CONNECTIONS_LIMIT)
+            round(0.5 * max_connections)
         )  # 50% of the max connections limit in order to avoid overloading port
+        # Shared by every bulk upsert of the client in the process (all kinds and live events), each forked
+        # resync worker adapts its own limit
+        self.bulk_upsert_limiter = AdaptiveConcurrencyLimiter(
+            ENTITIES_BULK_UPSERT_CONCURRENCY,
+            min_limit=ENTITIES_BULK_UPSERT_MIN_CONCURRENCY,
+            max_limit=ENTITIES_BULK_UPSERT_MAX_CONCURRENCY,
+            latency_threshold_seconds=ENTITIES_BULK_UPSERT_LATENCY_THRESHOLD_SECONDS,
+        )
 
-    def calculate_entities_batch_size(self, entities: list[Entity]) -> int:
+    @staticmethod
+    def _serialize_entity(entity: Entity) -> bytes:
+        return serialization.dumps(entity.dict(exclude_unset=True, by_alias=True))
+
+    def _pack_entities_in_bulks(
+        self, entities: list[Entity]
+    ) -> list[tuple[list[Entity], list[bytes]]]:
         """
-        Calculate the optimal batch size based on entity size and configured limits.
+        Pack the entities, in order, in bulks filled up to the maximum length and size of a bulk request.
+
+        Every entity is serialized exactly once and its size is measured on the serialized bytes, which are
+        reused as the body of the bulk request. An entity larger than the maximum size is sent in a bulk
+        of its own.
 
         Args:
-            entities: List of entities to calculate batch size for
+            entities: List of entities to pack
 
         Returns:
-            int: The optimal batch size to use
+            list[tuple[list[Entity], list[bytes]]]: The entities of each bulk with their serialized bytes
         """
-        if not entities:
-            return ENTITIES_BULK_MINIMUM_BATCH_SIZE
-
-        # Calculate average entity size from a sample
-        SAMPLE_SIZE = min(ENTITIES_BULK_SAMPLES_SIZE, len(entities))
-        sample_entities = entities[:SAMPLE_SIZE]
-        average_entity_size = (
-            sum(
-                len(json.dumps(entity.dict(exclude_unset=True, by_alias=True)).encode())
-                for entity in sample_entities
-            )
-            / SAMPLE_SIZE
+        max_length = ocean.config.upsert_entities_batch_max_length
+        max_size = ocean.config.upsert_entities_batch_max_size_in_bytes
+        empty_bulk_size = len(ENTITIES_BULK_BODY_PREFIX) + len(
+            ENTITIES_BULK_BODY_SUFFIX
         )
 
-        # Use a conservative estimate to ensure we stay under the limit
-        estimated_entity_size = int(
-            average_entity_size * ENTITIES_BULK_ESTIMATED_SIZE_MULTIPLIER
-        )
-        max_entities_per_batch = min(
-            ocean.config.upsert_entities_batch_max_length,
-            ocean.config.upsert_entities_batch_max_size_in_bytes
-            // estimated_entity_size,
-        )
+        bulks: list[tuple[list[Entity], list[bytes]]] = []
+        bulk_entities: list[Entity] = []
+        bulk_serialized_entities: list[bytes] = []
+        bulk_size = empty_bulk_size
+        for entity in entities:
+            serialized_entity = self._serialize_entity(entity)
+            entity_size = len(serialized_entity) + len(ENTITIES_BULK_BODY_SEPARATOR)
+            if bulk_entities and (
+                len(bulk_entities) >= max_length or bulk_size + entity_size > max_size
+            ):
+                bulks.append((bulk_entities, bulk_serialized_entities))
+                bulk_entities, bulk_serialized_entities = [], []
+                bulk_size = empty_bulk_size
+
+            bulk_entities.append(entity)
+            bulk_serialized_entities.append(serialized_entity)
+            bulk_size += entity_size
 
-        return max(ENTITIES_BULK_MINIMUM_BATCH_SIZE, max_entities_per_batch)
+        if bulk_entities:
+            bulks.append((bulk_entities, bulk_serialized_entities))
+        return bulks
 
     async def upsert_entity(
         self,
@@ -106,10 +144,13 @@ class EntityClientMixin:
             logger.debug(
                 f"{'Validating' if validation_only else 'Upserting'} entity: {entity.identifier} of blueprint: {entity.blueprint}"
             )
-            headers = await self.auth.headers(user_agent_type)
+            headers = {
+                **await self.auth.headers(user_agent_type),
+                **serialization.JSON_CONTENT_TYPE_HEADERS,
+            }
             response = await self.client.post(
                 f"{self.auth.api_url}/blueprints/{entity.blueprint}/entities",
-                json=entity.dict(exclude_unset=True, by_alias=True),
+                content=self._serialize_entity(entity),
                 headers=headers,
                 params={
                     "upsert": "true",
@@ -160,7 +201,7 @@ class EntityClientMixin:
         result = response.json()
 
         result_entity = (
-            Entity.parse_obj(result["entity"]) if result.get("entity") else entity
+            Entity.from_trusted(result["entity"]) if result.get("entity") else entity
         )
 
         # Happens when upsert fails and search identifier is defined.
@@ -176,6 +217,7 @@ class EntityClientMixin:
         request_options: RequestOptions,
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
+        serialized_entities: list[bytes] | None = None,
     ) -> list[tuple[bool | None, Entity]] | httpx.HTTPStatusError:
         """
         This function upserts a list of entities into Port.
@@ -194,26 +236,33 @@ class EntityClientMixin:
         :param request_options: A dictionary specifying how to upsert the entity
         :param user_agent_type: a UserAgentType specifying who is preforming the action
         :param should_raise: A boolean specifying whether the error should be raised or handled silently
+        :param serialized_entities: The already serialized entities, in the order of the entities
         :return: A list of tuples where each tuple contains:
             - First value: True if entity was created successfully, False if there was an error, None if there was an error and the entity use search identifier
             - Second value: The original entity (if failed) or the reduced entity with updated identifier (if successful)
         :return: httpx.HTTPStatusError if there was an HTTP error and should_raise is False
         """
         validation_only = request_options["validation_only"]
-        bulk_semaphore = asyncio.Semaphore(ENTITIES_BULK_UPSERT_CONCURRENCY)
-        async with bulk_semaphore:
+        if serialized_entities is None:
+            serialized_entities = [
+                self._serialize_entity(entity) for entity in entities
+            ]
+        body = (
+            ENTITIES_BULK_BODY_PREFIX
+            + ENTITIES_BULK_BODY_SEPARATOR.join(serialized_entities)
+            + ENTITIES_BULK_BODY_SUFFIX
+        )
+        async with self.bulk_upsert_limiter.acquire() as slot:
             logger.debug(
                 f"{'Validating' if validation_only else 'Upserting'} {len(entities)} of blueprint: {blueprint}"
             )
-            headers = await self.auth.headers(user_agent_type)
+            headers = {
+                **await self.auth.headers(user_agent_type),
+                **serialization.JSON_CONTENT_TYPE_HEADERS,
+            }
             response = await self.client.post(
                 f"{self.auth.api_url}/blueprints/{blueprint}/entities/bulk",
-                json={
-                    "entities": [
-                        entity.dict(exclude_unset=True, by_alias=True)
-                        for entity in entities
-                    ]
-                },
+                content=body,
                 headers=headers,
                 params={
                     "upsert": "true",
@@ -225,6 +274,7 @@ class EntityClientMixin:
                 },
                 extensions={"retryable": True},
             )
+            slot.record(response.status_code)
         if response.is_error:
             logger.error(
                 f"Error {'Validating' if validation_only else 'Upserting'} "
@@ -341,8 +391,9 @@ class EntityClientMixin:
     ) -> list[tuple[bool, Entity]]:
         """
         This function upserts a list of entities into Port in batches.
-        The batch size is calculated based on both the number of entities and their size.
-        Batches are processed in parallel using asyncio.gather, with concurrency controlled by the semaphore.
+        The entities are packed in batches by both their number and their serialized size.
+        Batches are processed in parallel using asyncio.gather, with concurrency controlled by the adaptive
+        bulk upsert limiter shared by the client.
 
         :param entities: A list of Entities to be upserted
         :param request_options: A dictionary specifying how to upsert the entity
@@ -355,10 +406,7 @@ class EntityClientMixin:
         entities_results: list[tuple[bool, Entity]] = []
         blueprint = entities[0].blueprint
 
-        bulk_size = self.calculate_entities_batch_size(entities)
-        bulks = [
-            entities[i : i + bulk_size] for i in range(0, len(entities), bulk_size)
-        ]
+        packed_bulks = self._pack_entities_in_bulks(entities)
 
         bulk_results = await asyncio.gather(
             *(
@@ -368,13 +416,14 @@ class EntityClientMixin:
                     request_options,
                     user_agent_type,
                     should_raise=should_raise,
+                    serialized_entities=serialized_bulk,
                 )
-                for bulk in bulks
+                for bulk, serialized_bulk in packed_bulks
             ),
             return_exceptions=True,
         )
 
-        for bulk, bulk_result in zip(bulks, bulk_results):
+        for (bulk, _), bulk_result in zip(packed_bulks, bulk_results):
             if isinstance(bulk_result, httpx.HTTPStatusError) or isinstance(
                 bulk_result, Exception
             ):
@@ -457,6 +506,56 @@ class EntityClientMixin:
 
             handle_port_status_code(response, should_raise)
 
+    async def delete_entities_bulk(
+        self,
+        blueprint: str,
+        entities: list[Entity],
+        request_options: RequestOptions,
+        user_agent_type: UserAgentType | None = None,
+    ) -> list[Entity]:
+        """
+        Delete entities of a single blueprint in one request.
+
+        :return: The entities that were not confirmed as deleted, all of them when the request failed
+        """
+        async with self.semaphore:
+            logger.info(
+                f"Bulk delete {len(entities)} entities of blueprint: {blueprint}"
+            )
+            response = await self.client.request(
+                "DELETE",
+                f"{self.auth.api_url}/blueprints/{blueprint}/bulk/entities",
+                content=serialization.dumps(
+                    {"entities": [entity.identifier for entity in entities]}
+                ),
+                headers={
+                    **await self.auth.headers(user_agent_type),
+                    **serialization.JSON_CONTENT_TYPE_HEADERS,
+                },
+                params={
+                    "delete_dependents": str(
+                        request_options["delete_dependent_entities"]
+                    ).lower()
+                },
+            )
+
+        if response.is_error:
+            logger.warning(
+                f"Error bulk deleting {len(entities)} entities of blueprint: {blueprint},"
+                f" status code: {response.status_code}"
+            )
+            return entities
+
+        deleted_entities = response.json().get("deletedEntities")
+        if deleted_entities is None:
+            return []
+        deleted_identifiers = set(deleted_entities)
+        return [
+            entity
+            for entity in entities
+            if entity.identifier not in deleted_identifiers
+        ]
+
     async def batch_delete_entities(
         self,
         entities: list[Entity],
@@ -464,6 +563,45 @@ class EntityClientMixin:
         user_agent_type: UserAgentType | None = None,
         should_raise: bool = True,
     ) -> None:
+        """
+        Delete the entities with bulk requests grouped per blueprint, the entities a bulk request
+        didn't delete are retried one by one.
+        """
+        blueprint_groups: dict[str, list[Entity]] = defaultdict(list)
+        for entity in entities:
+            blueprint_groups[entity.blueprint].append(entity)
+
+        batches = [
+            (blueprint, blueprint_entities[i : i + ENTITIES_BULK_DELETE_MAX_SIZE])
+            for blueprint, blueprint_entities in blueprint_groups.items()
+            for i in range(0, len(blueprint_entities), ENTITIES_BULK_DELETE_MAX_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(
+                self.delete_entities_bulk(
+                    blueprint, batch, request_options, user_agent_type
+                )
+                for blueprint, batch in batches
+            ),
+            return_exceptions=True,
+        )
+
+        not_deleted_entities: list[Entity] = []
+        for (blueprint, batch), result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    f"Failed to bulk delete {len(batch)} entities of blueprint: {blueprint}, error: {result}"
+                )
+                not_deleted_entities.extend(batch)
+            else:
+                not_deleted_entities.extend(result)
+
+        if not not_deleted_entities:
+            return
+
+        logger.info(
+            f"Deleting {len(not_deleted_entities)} entities that were not deleted in bulk one by one"
+        )
         await asyncio.gather(
             *(
                 self.delete_entity(
@@ -472,7 +610,7 @@ class EntityClientMixin:
                     user_agent_type,
                     should_raise=should_raise,
                 )
-                for entity in entities
+                for entity in not_deleted_entities
             ),
             return_exceptions=True,
         )
@@ -484,23 +622,13 @@ class EntityClientMixin:
         parameters_to_include: list[str] | None = None,
     ) -> list[Entity]:
         if query is None:
-            datasource_prefix = f"port-ocean/{self.auth.integration_type}/"
-            datasource_suffix = (
-                f"/{self.auth.integration_identifier}/{user_agent_type.value}"
-            )
-            logger.info(
-                f"Searching entities with datasource prefix: {datasource_prefix} and suffix: {datasource_suffix}"
-            )
-
-            response = await self.client.post(
-                f"{self.auth.api_url}/blueprints/entities/datasource-entities",
-                json={
-                    "datasource_prefix": datasource_prefix,
-                    "datasource_suffix": datasource_suffix,
-                },
-                headers=await self.auth.headers(user_agent_type),
-                extensions={"retryable": True},
-            )
+            return [
+                Entity.from_trusted(result)
+                async for page in self._search_datasource_entities_pages(
+                    user_agent_type
+                )
+                for result in page
+            ]
         else:
             default_query = {
                 "combinator": "and",
@@ -524,8 +652,11 @@ class EntityClientMixin:
             logger.info(f"Searching entities with custom query: {query}")
             response = await self.client.post(
                 f"{self.auth.api_url}/entities/search",
-                json=query,
-                headers=await self.auth.headers(user_agent_type),
+                content=serialization.dumps(query),
+                headers={
+                    **await self.auth.headers(user_agent_type),
+                    **serialization.JSON_CONTENT_TYPE_HEADERS,
+                },
                 params={
                     "exclude_calculated_properties": "true",
                     "include": parameters_to_include or ["blueprint", "identifier"],
@@ -534,10 +665,68 @@ class EntityClientMixin:
             )
 
         handle_port_status_code(response)
-        return [Entity.parse_obj(result) for result in response.json()["entities"]]
+        return [Entity.from_trusted(result) for result in response.json()["entities"]]
+
+    async def _search_datasource_entities_pages(
+        self, user_agent_type: UserAgentType
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        datasource_prefix = f"port-ocean/{self.auth.integration_type}/"
+        datasource_suffix = (
+            f"/{self.auth.integration_identifier}/{user_agent_type.value}"
+        )
+        logger.info(
+            f"Searching entities with datasource prefix: {datasource_prefix} and suffix: {datasource_suffix}"
+        )
+
+        cursor: str | None = None
+        while True:
+            params: dict[str, Any] = {"limit": SEARCH_ENTITIES_PAGE_SIZE}
+            if cursor is not None:
+                params["from"] = cursor
+            response = await self.client.post(
+                f"{self.auth.api_url}/blueprints/entities/datasource-entities",
+                content=serialization.dumps(
+                    {
+                        "datasource_prefix": datasource_prefix,
+                        "datasource_suffix": datasource_suffix,
+                    }
+                ),
+                headers={
+                    **await self.auth.headers(user_agent_type),
+                    **serialization.JSON_CONTENT_TYPE_HEADERS,
+                },
+                params=params,
+                extensions={"retryable": True},
+            )
+            handle_port_status_code(response)
+            result = response.json()
+            yield result["entities"]
+
+            cursor = result.get("next")
+            if not cursor:
+                return
+
+    async def search_entity_keys(
+        self, user_agent_type: UserAgentType
+    ) -> set[EntityKey]:
+        """
+        Search the (blueprint, identifier) keys of the entities of the integration.
+
+        The entities are fetched page by page and only their keys are kept, so the memory used doesn't
+        depend on the size of the entities.
+        """
+        entity_keys: set[EntityKey] = set()
+        async for page in self._search_datasource_entities_pages(user_agent_type):
+            entity_keys.update(
+                (entity["blueprint"], entity["identifier"]) for entity in page
+            )
+        return entity_keys
 
     async def search_batch_entities(
-        self, user_agent_type: UserAgentType, entities_to_search: list[Entity]
+        self,
+        user_agent_type: UserAgentType,
+        entities_to_search: list[Entity],
+        parameters_to_include: list[str] | None = None,
     ) -> list[Entity]:
         search_rules = []
         for entity in entities_to_search:
@@ -565,6 +754,7 @@ class EntityClientMixin:
                 "combinator": "and",
                 "rules": [{"combinator": "or", "rules": search_rules}],
             },
+            parameters_to_include,
         )
 
     @staticmethod
@@ -579,8 +769,8 @@ class EntityClientMixin:
         Returns:
             Entity: A new entity with only the essential data
         """
-        reduced_entity = Entity(
-            identifier=entity.identifier, blueprint=entity.blueprint
+        reduced_entity = Entity.from_trusted(
+            {"identifier": entity.identifier, "blueprint": entity.blueprint}
         )
 
         # Turning dict typed relations (raw search relations) is required
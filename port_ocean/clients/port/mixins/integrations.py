@@ -9,6 +9,7 @@ from port_ocean.clients.port.authentication import PortAuthentication
 from port_ocean.clients.port.utils import handle_port_status_code
 from port_ocean.exceptions.port_defaults import DefaultsProvisionFailed
 from port_ocean.log.sensetive import sensitive_log_filter
+from port_ocean.utils import serialization
 
 if TYPE_CHECKING:
     from port_ocean.core.handlers.port_app_config.models import PortAppConfig
@@ -267,10 +268,12 @@ class IntegrationClientMixin:
         headers = await self.auth.headers()
         response = await self.client.post(
             f"{self.auth.api_url}/integration/{quote_plus(self.integration_identifier)}/kinds/{quote_plus(kind)}/examples",
-            headers=headers,
-            json={
-                "examples": sensitive_log_filter.mask_object(data, full_hide=True),
-            },
+            headers={**headers, **serialization.JSON_CONTENT_TYPE_HEADERS},
+            content=serialization.dumps(
+                {
+                    "examples": sensitive_log_filter.mask_object(data, full_hide=True),
+                }
+            ),
         )
         handle_port_status_code(response, should_log=should_log)
         logger.debug(f"Examples for kind {kind} successfully ingested")
@@ -297,10 +300,12 @@ class IntegrationClientMixin:
         headers = await self.auth.headers()
         response = await self.client.post(
             f"{self.auth.ingest_url}/lakehouse/integration-type/{self.auth.integration_type}/integration/{self.integration_identifier}/sync/{sync_id}/kind/{kind}/items",
-            headers=headers,
-            json={
-                "items": raw_data,
-            },
+            headers={**headers, **serialization.JSON_CONTENT_TYPE_HEADERS},
+            content=serialization.dumps(
+                {
+                    "items": raw_data,
+                }
+            ),
         )
         handle_port_status_code(response, should_log=False)
         logger.debug("Finished POST raw data request")
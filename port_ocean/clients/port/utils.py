@@ -1,14 +1,19 @@
-from typing import TYPE_CHECKING
+import time
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
 
 import httpx
 from loguru import logger
 from werkzeug.local import LocalStack, LocalProxy
 
 from port_ocean.clients.port.retry_transport import TokenRetryTransport
+from port_ocean.context.ocean import ocean
 from port_ocean.helpers.async_client import OceanAsyncClient
+from port_ocean.helpers.metric.metric import MetricType
 
 if TYPE_CHECKING:
     from port_ocean.clients.port.client import PortClient
+    from port_ocean.config.settings import PortHttpSettings
 
 # In case the framework sends more requests to port in parallel than allowed by the limits, a PoolTimeout exception will
 # be raised.
@@ -16,34 +21,123 @@ if TYPE_CHECKING:
 # period of time, before raising an exception.
 # The max_connections value can't be too high, as it will cause the application to run out of memory.
 # The max_keepalive_connections can't be too high, as it will cause the application to run out of available connections.
+# The defaults are overridden by the port http settings (OCEAN__PORT__HTTP__*).
 PORT_HTTP_MAX_CONNECTIONS_LIMIT = 100
 PORT_HTTP_MAX_KEEP_ALIVE_CONNECTIONS = 50
 PORT_HTTP_TIMEOUT = 60.0
 
-PORT_HTTPX_TIMEOUT = httpx.Timeout(PORT_HTTP_TIMEOUT)
-PORT_HTTPX_LIMITS = httpx.Limits(
-    max_connections=PORT_HTTP_MAX_CONNECTIONS_LIMIT,
-    max_keepalive_connections=PORT_HTTP_MAX_KEEP_ALIVE_CONNECTIONS,
-)
-
 _http_client: LocalStack[httpx.AsyncClient] = LocalStack()
 
 FIVE_MINUETS = 60 * 5
 
 
+class PortHttpPoolMonitor:
+    """
+    Report how long the requests to Port wait for a connection of the pool, and how many connections of the pool
+    are active or idle, to tell pool starvation apart from Port latency.
+
+    The wait of a request ends with the first event traced by httpcore, which happens once the request got a
+    connection (either opening it or sending the request over it).
+
+    The connection pool is found through private attributes of httpx, the connections are not reported when
+    it can't be found.
+    """
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+        self._is_pool_reported = True
+
+    def _get_connection_pool(self) -> Any:
+        if not self._is_pool_reported:
+            return None
+
+        # The retry transports wrap the httpx transport, which holds the connection pool
+        transport = getattr(self._client, "_transport", None)
+        while transport is not None and not isinstance(
+            transport, httpx.AsyncHTTPTransport
+        ):
+            transport = getattr(transport, "_wrapped_transport", None)
+        pool = getattr(transport, "_pool", None)
+        if pool is None or not hasattr(pool, "connections"):
+            logger.debug(
+                "Could not find the connection pool of the Port client, its connections won't be reported"
+            )
+            self._is_pool_reported = False
+            return None
+        return pool
+
+    def _record(self, wait_seconds: float) -> None:
+        if not ocean.initialized:
+            return
+
+        kind = ocean.metrics.current_resource_kind()
+        ocean.metrics.inc_metric(
+            MetricType.PORT_HTTP_POOL_WAIT_NAME, [kind], wait_seconds
+        )
+        ocean.metrics.inc_metric(MetricType.PORT_HTTP_REQUESTS_NAME, [kind], 1)
+
+        pool = self._get_connection_pool()
+        if pool is None:
+            return
+        connections = pool.connections
+        idle_connections = sum(1 for connection in connections if connection.is_idle())
+        ocean.metrics.set_metric(
+            MetricType.PORT_HTTP_POOL_CONNECTIONS_NAME,
+            ["active"],
+            len(connections) - idle_connections,
+        )
+        ocean.metrics.set_metric(
+            MetricType.PORT_HTTP_POOL_CONNECTIONS_NAME, ["idle"], idle_connections
+        )
+
+    async def on_request(self, request: httpx.Request) -> None:
+        started_at: float | None = time.monotonic()
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal started_at
+            if started_at is None:
+                return
+            wait_seconds = time.monotonic() - started_at
+            # Retries of the request reuse the trace, only the first connection acquisition is measured
+            started_at = None
+            self._record(wait_seconds)
+
+        request.extensions["trace"] = trace
+
+
+def _create_http_client(
+    port_client: "PortClient", settings: "PortHttpSettings"
+) -> httpx.AsyncClient:
+    http2 = settings.http2
+    if http2 and find_spec("h2") is None:
+        logger.warning(
+            "HTTP/2 is enabled for the Port client but the h2 package is not installed, falling back to HTTP/1.1"
+        )
+        http2 = False
+
+    client = OceanAsyncClient(
+        TokenRetryTransport,
+        transport_kwargs={
+            "port_client": port_client,
+            "max_backoff_wait": FIVE_MINUETS,
+            "base_delay": 0.3,
+        },
+        timeout=httpx.Timeout(settings.timeout),
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        http2=http2,
+    )
+    client.event_hooks["request"].append(PortHttpPoolMonitor(client).on_request)
+    return client
+
+
 def _get_http_client_context(port_client: "PortClient") -> httpx.AsyncClient:
     client = _http_client.top
     if client is None:
-        client = OceanAsyncClient(
-            TokenRetryTransport,
-            transport_kwargs={
-                "port_client": port_client,
-                "max_backoff_wait": FIVE_MINUETS,
-                "base_delay": 0.3,
-            },
-            timeout=PORT_HTTPX_TIMEOUT,
-            limits=PORT_HTTPX_LIMITS,
-        )
+        client = _create_http_client(port_client, port_client.http_settings)
         _http_client.push(client)
 
     return client
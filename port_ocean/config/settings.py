@@ -12,6 +12,7 @@ from port_ocean.core.event_listener import EventListenerSettingsType
 from port_ocean.core.models import (
     CachingStorageMode,
     CreatePortResourcesOrigin,
+    JQTransformBackend,
     ProcessExecutionMode,
     Runtime,
 )
@@ -41,12 +42,25 @@ class ApplicationSettings(BaseSettings):
             return env_settings, init_settings
 
 
+class PortHttpSettings(BaseOceanModel, extra=Extra.allow):
+    # Requests wait up to the timeout for a connection when all the connections of the pool are in use
+    max_connections: int = 100
+    max_keepalive_connections: int = 50
+    keepalive_expiry: float = 5.0
+    timeout: float = 60.0
+    # Multiplexes the requests over fewer connections, requires the h2 package
+    http2: bool = False
+    # Number of connections opened to Port when the integration starts
+    prewarm_connections: int = 0
+
+
 class PortSettings(BaseOceanModel, extra=Extra.allow):
     client_id: str = Field(..., sensitive=True)
     client_secret: str = Field(..., sensitive=True)
     base_url: AnyHttpUrl = parse_obj_as(AnyHttpUrl, "https://api.getport.io")
     port_app_config_cache_ttl: int = 60
     ingest_url: AnyHttpUrl = parse_obj_as(AnyHttpUrl, "https://ingest.getport.io")
+    http: PortHttpSettings = Field(default_factory=PortHttpSettings)
 
 
 class IntegrationSettings(BaseOceanModel, extra=Extra.allow):
@@ -80,6 +94,15 @@ class StreamingSettings(BaseOceanModel, extra=Extra.allow):
     location: str = Field(default="/tmp/ocean/streaming")
 
 
+class CachingSettings(BaseOceanModel, extra=Extra.allow):
+    # Approximate size of the values kept by the memory cache, the least recently used are evicted beyond it
+    memory_max_size_in_bytes: int | None = Field(default=1024 * 1024 * 256)  # 256 mb
+    # Size of the files kept by the disk cache, the least recently used are deleted beyond it
+    disk_max_size_in_bytes: int | None = Field(default=1024 * 1024 * 1024)  # 1 gb
+    # Expiry of the cached values, they are kept until the end of the resync by default
+    ttl_seconds: float | None = Field(default=None, gt=0)
+
+
 class IntegrationConfiguration(BaseOceanSettings, extra=Extra.allow):
     _integration_config_model: BaseModel | None = None
 
@@ -111,15 +134,38 @@ class IntegrationConfiguration(BaseOceanSettings, extra=Extra.allow):
     caching_storage_mode: Optional[CachingStorageMode] = Field(
         default=CachingStorageMode.disk
     )
+    caching: CachingSettings = Field(default_factory=CachingSettings)
     process_execution_mode: Optional[ProcessExecutionMode] = Field(
         default=ProcessExecutionMode.multi_process
     )
+    # Number of resource kinds processed in parallel during a resync
+    resync_kinds_concurrency: int = Field(default=1, ge=1)
+    # Number of tasks a multi process worker executes before being replaced, unlimited by default
+    multi_process_worker_max_tasks: Optional[int] = Field(default=None, ge=1)
 
     upsert_entities_batch_max_length: int = 20
     upsert_entities_batch_max_size_in_bytes: int = 1024 * 1024
     lakehouse_enabled: bool = False
     yield_items_to_parse: bool = False
     yield_items_to_parse_batch_size: int = 10
+    # Compare the resynced entities with an on-disk index of the entities at Port instead of searching them at Port
+    entity_state_index_enabled: bool = False
+    entity_state_index_dir: str = "/tmp/ocean/.entity_state_index"
+    # Seconds after which the index is seeded again from Port, to pick up changes made outside the integration
+    entity_state_index_max_age_seconds: float = Field(default=24 * 60 * 60, ge=0)
+    # Reconcile every kind once it completes, deleting only the entities it stopped emitting since its previous run
+    incremental_reconciliation_enabled: bool = False
+    incremental_reconciliation_dir: str = "/tmp/ocean/.kind_reconciliation_index"
+    # Number of fetched batches and mapped chunks buffered between the extract, transform and load stages of a kind
+    resync_pipeline_queue_size: int = Field(default=2, ge=1)
+    # Maximum number of items mapped and upserted at once when a batch is larger or uses `itemsToParse`
+    parse_items_chunk_size: int = Field(default=1000, ge=1)
+    # Evaluate the selector and the whole mapping of a batch of raw items in a single JQ program
+    jq_batch_evaluation: bool = True
+    # Run the batch JQ evaluation in a pool of processes to use all the cores, `jq_batch_evaluation` must be enabled
+    jq_transform_backend: JQTransformBackend = JQTransformBackend.thread
+    # Number of processes of the JQ process pool, defaults to the number of CPUs
+    jq_process_pool_size: Optional[int] = Field(default=None, ge=1)
 
     streaming: StreamingSettings = Field(default_factory=lambda: StreamingSettings())
 
@@ -3,7 +3,7 @@ from abc import abstractmethod
 from port_ocean.clients.port.types import UserAgentType
 from port_ocean.core.handlers.base import BaseHandler
 from port_ocean.core.models import Entity
-from port_ocean.core.ocean_types import EntityDiff
+from port_ocean.core.ocean_types import EntityDiff, EntityKey
 
 
 class BaseEntitiesStateApplier(BaseHandler):
@@ -44,6 +44,25 @@ class BaseEntitiesStateApplier(BaseHandler):
         """
         pass
 
+    @abstractmethod
+    async def delete_diff_by_keys(
+        self,
+        entity_keys_before: set[EntityKey],
+        entities_after: list[Entity],
+        user_agent: UserAgentType,
+    ) -> bool:
+        """Delete the entities whose keys are in the state before but not in the state after.
+
+        Args:
+            entity_keys_before (set[EntityKey]): The (blueprint, identifier) keys of the entities before.
+            entities_after (list[Entity]): The entities after.
+            user_agent (UserAgentType): The user agent responsible for the deletion.
+
+        Returns:
+            bool: False when the deletion was skipped because of the entity deletion threshold.
+        """
+        pass
+
     @abstractmethod
     async def upsert(
         self, entities: list[Entity], user_agent_type: UserAgentType
@@ -1,3 +1,4 @@
+import asyncio
 from collections import defaultdict
 from loguru import logger
 
@@ -13,9 +14,12 @@ from port_ocean.context.ocean import ocean
 from port_ocean.helpers.metric.metric import MetricType, MetricPhase
 from port_ocean.helpers.metric.utils import TimeMetric
 from port_ocean.core.models import Entity
-from port_ocean.core.ocean_types import EntityDiff
+from port_ocean.core.ocean_types import EntityDiff, EntityKey
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
-from port_ocean.core.utils.utils import is_same_entity, get_port_diff
+from port_ocean.core.utils.utils import get_entity_key, get_port_diff
+
+# Number of entities fetched by a single search request when fetching entities by their keys
+SEARCH_BATCH_SIZE = 50
 
 
 class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
@@ -40,16 +44,19 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
             entities_to_protect, self.context.port_client
         )
 
+        related_entity_keys = {get_entity_key(entity) for entity in related_entities}
+        # Entities using a search identifier can't match the entities to delete, which are Port entities
+        protected_entity_keys = {
+            get_entity_key(entity)
+            for entity in entities_to_protect
+            if not entity.is_using_search_identifier
+        }
         allowed_entities_to_delete = []
 
         for entity_to_delete in entities_to_delete:
-            is_part_of_related = any(
-                is_same_entity(entity, entity_to_delete) for entity in related_entities
-            )
-            is_part_of_created = any(
-                is_same_entity(entity, entity_to_delete)
-                for entity in entities_to_protect
-            )
+            entity_key = get_entity_key(entity_to_delete)
+            is_part_of_related = entity_key in related_entity_keys
+            is_part_of_created = entity_key in protected_entity_keys
             if is_part_of_related:
                 if event.port_app_config.create_missing_related_entities:
                     logger.info(
@@ -78,6 +85,46 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
 
         await self._safe_delete(diff.deleted, modified_entities, user_agent_type)
 
+    def _record_deleted_entities(self, count: int) -> None:
+        ocean.metrics.inc_metric(
+            name=MetricType.OBJECT_COUNT_NAME,
+            labels=[
+                ocean.metrics.current_resource_kind(),
+                MetricPhase.DELETE,
+                MetricPhase.DeletionResult.DELETED,
+            ],
+            value=count,
+        )
+
+    def _is_deletion_allowed(
+        self,
+        deleting_count: int,
+        keeping_count: int,
+        total_count: int,
+        entity_deletion_threshold: float | None,
+    ) -> bool:
+        logger.info(
+            f"Determining entities to delete ({deleting_count}/{keeping_count})",
+            deleting_entities=deleting_count,
+            keeping_entities=keeping_count,
+            entity_deletion_threshold=entity_deletion_threshold,
+        )
+
+        deletion_rate = deleting_count / total_count
+        if (
+            entity_deletion_threshold is not None
+            and deletion_rate <= entity_deletion_threshold
+        ):
+            return True
+
+        logger.info(
+            f"Skipping deletion of entities with deletion rate {deletion_rate}",
+            deletion_rate=deletion_rate,
+            deleting_entities=deleting_count,
+            total_entities=total_count,
+        )
+        return False
+
     async def delete_diff(
         self,
         entities: EntityDiff,
@@ -87,48 +134,75 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
         diff = get_port_diff(entities["before"], entities["after"])
 
         if not diff.deleted:
-            ocean.metrics.inc_metric(
-                name=MetricType.OBJECT_COUNT_NAME,
-                labels=[
-                    ocean.metrics.current_resource_kind(),
-                    MetricPhase.DELETE,
-                    MetricPhase.DeletionResult.DELETED,
-                ],
-                value=0,
-            )
+            self._record_deleted_entities(0)
             return
 
         kept_entities = diff.created + diff.modified
 
-        logger.info(
-            f"Determining entities to delete ({len(diff.deleted)}/{len(kept_entities)})",
-            deleting_entities=len(diff.deleted),
-            keeping_entities=len(kept_entities),
-            entity_deletion_threshold=entity_deletion_threshold,
-        )
-
-        deletion_rate = len(diff.deleted) / len(entities["before"])
-        if (
-            entity_deletion_threshold is not None
-            and deletion_rate <= entity_deletion_threshold
+        if self._is_deletion_allowed(
+            len(diff.deleted),
+            len(kept_entities),
+            len(entities["before"]),
+            entity_deletion_threshold,
         ):
             await self._safe_delete(diff.deleted, kept_entities, user_agent_type)
-            ocean.metrics.inc_metric(
-                name=MetricType.OBJECT_COUNT_NAME,
-                labels=[
-                    ocean.metrics.current_resource_kind(),
-                    MetricPhase.DELETE,
-                    MetricPhase.DeletionResult.DELETED,
-                ],
-                value=len(diff.deleted),
-            )
-        else:
-            logger.info(
-                f"Skipping deletion of entities with deletion rate {deletion_rate}",
-                deletion_rate=deletion_rate,
-                deleting_entities=len(diff.deleted),
-                total_entities=len(entities),
+            self._record_deleted_entities(len(diff.deleted))
+
+    async def _get_entities_by_keys(
+        self, entity_keys: list[EntityKey], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        entities = [
+            Entity.from_trusted({"identifier": identifier, "blueprint": blueprint})
+            for blueprint, identifier in entity_keys
+        ]
+        if event.port_app_config.delete_dependent_entities:
+            return entities
+
+        # The relations are needed to delete the entities in the order of their dependencies
+        batches = await asyncio.gather(
+            *(
+                self.context.port_client.search_batch_entities(
+                    user_agent_type,
+                    entities[start_index : start_index + SEARCH_BATCH_SIZE],
+                    parameters_to_include=["blueprint", "identifier", "relations"],
+                )
+                for start_index in range(0, len(entities), SEARCH_BATCH_SIZE)
             )
+        )
+        return [entity for batch in batches for entity in batch]
+
+    async def delete_diff_by_keys(
+        self,
+        entity_keys_before: set[EntityKey],
+        entities_after: list[Entity],
+        user_agent_type: UserAgentType,
+        entity_deletion_threshold: float | None = None,
+    ) -> bool:
+        entity_keys_after = {
+            get_entity_key(entity)
+            for entity in entities_after
+            if not entity.is_using_search_identifier
+        }
+        deleted_keys = list(entity_keys_before - entity_keys_after)
+
+        if not deleted_keys:
+            self._record_deleted_entities(0)
+            return True
+
+        if not self._is_deletion_allowed(
+            len(deleted_keys),
+            len(entities_after),
+            len(entity_keys_before),
+            entity_deletion_threshold,
+        ):
+            return False
+
+        deleted_entities = await self._get_entities_by_keys(
+            deleted_keys, user_agent_type
+        )
+        await self._safe_delete(deleted_entities, entities_after, user_agent_type)
+        self._record_deleted_entities(len(deleted_keys))
+        return True
 
     async def upsert(
         self, entities: list[Entity], user_agent_type: UserAgentType
@@ -170,13 +244,16 @@ class HttpEntitiesStateApplier(BaseEntitiesStateApplier):
                 should_raise=False,
             )
         else:
-            ordered_deleted_entities = (
-                EntityTopologicalSorter.order_by_entities_dependencies(entities)
+            # The dependency order is kept between the waves, the entities of a wave are deleted in bulk
+            deletion_waves = (
+                EntityTopologicalSorter.order_by_entities_dependencies_in_waves(
+                    entities
+                )
             )
 
-            for entity in ordered_deleted_entities:
-                await self.context.port_client.delete_entity(
-                    entity,
+            for wave in deletion_waves:
+                await self.context.port_client.batch_delete_entities(
+                    wave,
                     event.port_app_config.get_port_request_options(),
                     user_agent_type,
                     should_raise=False,
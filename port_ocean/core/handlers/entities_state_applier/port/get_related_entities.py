@@ -24,15 +24,11 @@ async def get_related_entities(
             for blueprint_identifier in blueprint_identifier_to_entity.keys()
         )
     )
+    blueprints_by_identifier = {
+        blueprint.identifier: blueprint for blueprint in blueprints
+    }
     entity_to_blueprint = [
-        (
-            entity,
-            next(
-                blueprint
-                for blueprint in blueprints
-                if blueprint.identifier == entity.blueprint
-            ),
-        )
+        (entity, blueprints_by_identifier[entity.blueprint])
         for entity in entities_with_relations
     ]
 
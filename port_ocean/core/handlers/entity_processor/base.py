@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import AsyncGenerator
 
 from loguru import logger
 from port_ocean.core.handlers.base import BaseHandler
@@ -29,6 +30,19 @@ class BaseEntityProcessor(BaseHandler):
     ) -> CalculationResult:
         pass
 
+    async def _parse_items_in_chunks(
+        self,
+        mapping: ResourceConfig,
+        raw_data: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+        chunk_size: int | None = None,
+    ) -> AsyncGenerator[CalculationResult, None]:
+        # Processors that can't map the raw data in chunks map it all at once
+        yield await self._parse_items(
+            mapping, raw_data, parse_all, send_raw_data_examples_amount
+        )
+
     async def parse_items(
         self,
         mapping: ResourceConfig,
@@ -53,3 +67,34 @@ class BaseEntityProcessor(BaseHandler):
             return await self._parse_items(
                 mapping, raw_data, parse_all, send_raw_data_examples_amount
             )
+
+    async def parse_items_in_chunks(
+        self,
+        mapping: ResourceConfig,
+        raw_data: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+        chunk_size: int | None = None,
+    ) -> AsyncGenerator[CalculationResult, None]:
+        """Public method to parse raw entity data and yield the EntityDiff of each chunk as soon as it is mapped.
+
+        Unlike `parse_items`, only a chunk of the mapped entities (and of the items expanded by `itemsToParse`)
+        is held at once.
+
+        Args:
+            mapping (ResourceConfig): The configuration for entity mapping.
+            raw_data (list[RawEntity]): The raw data to be parsed.
+            parse_all (bool): Whether to parse all data or just data that passed the selector.
+            send_raw_data_examples_amount (bool): Whether to send example data to the integration service.
+            chunk_size (int | None): The maximum number of items mapped per chunk, all of them when None.
+
+        Yields:
+            EntityDiff: The parsed entity differences of each chunk.
+        """
+        with logger.contextualize(kind=mapping.kind):
+            if not raw_data:
+                return
+            async for result in self._parse_items_in_chunks(
+                mapping, raw_data, parse_all, send_raw_data_examples_amount, chunk_size
+            ):
+                yield result
@@ -1,16 +1,20 @@
 import asyncio
+import json
 from asyncio import Task
 from dataclasses import dataclass, field
 
 from functools import lru_cache
-from typing import Any, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
 import jq  # type: ignore
 from loguru import logger
 
 from port_ocean.context.ocean import ocean
 from port_ocean.core.handlers.entity_processor.base import BaseEntityProcessor
+from port_ocean.core.handlers.entity_processor.jq_process_pool import (
+    evaluate_in_process_pool,
+)
 from port_ocean.core.handlers.port_app_config.models import ResourceConfig
-from port_ocean.core.models import Entity
+from port_ocean.core.models import Entity, JQTransformBackend
 from port_ocean.core.ocean_types import (
     RAW_ITEM,
     EntitySelectorDiff,
@@ -80,6 +84,52 @@ class MappedEntity:
     misconfigurations: dict[str, str] = field(default_factory=dict)
 
 
+def _batch_search_expression(pattern: str) -> str:
+    # Mirrors `_search`, the first output of the pattern or null when it has no output or fails.
+    # The pattern is put on its own lines so comments in it can't swallow the rest of the program
+    return f"(try ([first(\n{pattern}\n)] | .[0]) catch null)"
+
+
+def _batch_object_expression(obj: dict[str, Any]) -> str | None:
+    """
+    Build a JQ object expression evaluating all the patterns of a mapping at once, the same way `_search_as_object` does.
+    Returns None for mappings `_search_as_object` handles in a way that can't be expressed in a single program.
+    """
+    fields = []
+    for key, value in obj.items():
+        if isinstance(value, str):
+            expression: str | None = _batch_search_expression(value)
+        elif isinstance(value, dict):
+            expression = _batch_object_expression(value)
+        elif isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            items = [_batch_object_expression(item) for item in value]
+            expression = (
+                f"[{', '.join(item for item in items if item is not None)}]"
+                if all(item is not None for item in items)
+                else None
+            )
+        else:
+            expression = None
+
+        if expression is None:
+            return None
+        fields.append(f"{json.dumps(key)}: {expression}")
+    return "{" + ", ".join(fields) + "}"
+
+
+def _collect_misconfigurations(
+    obj: dict[str, Any], result: dict[str, Any], misconfigurations: dict[str, str]
+) -> None:
+    for key, value in obj.items():
+        if isinstance(value, list):
+            for item, item_result in zip(value, result[key]):
+                _collect_misconfigurations(item, item_result, misconfigurations)
+        elif isinstance(value, dict):
+            _collect_misconfigurations(value, result[key], misconfigurations)
+        elif result[key] is None:
+            misconfigurations[key] = value
+
+
 class JQEntityProcessor(BaseEntityProcessor):
     """Processes and parses entities using JQ expressions.
 
@@ -88,11 +138,15 @@ class JQEntityProcessor(BaseEntityProcessor):
     searching for data in dictionaries, and transforming data based on object mappings.
     """
 
+    @staticmethod
+    def _with_environment_access(pattern: str) -> str:
+        if not ocean.config.allow_environment_variables_jq_access:
+            return "def env: {}; {} as $ENV | " + pattern
+        return pattern
+
     @lru_cache
     def _compile(self, pattern: str) -> Any:
-        if not ocean.config.allow_environment_variables_jq_access:
-            pattern = "def env: {}; {} as $ENV | " + pattern
-        return jq.compile(pattern)
+        return jq.compile(self._with_environment_access(pattern))
 
     @staticmethod
     def _stop_iterator_handler(func: Any) -> Any:
@@ -275,6 +329,170 @@ class JQEntityProcessor(BaseEntityProcessor):
             )
         return entities, errors
 
+    def _compile_batch_program(
+        self,
+        raw_entity_mappings: dict[str, Any],
+        selector_query: str,
+        parse_all: bool = False,
+    ) -> str | None:
+        """
+        Compile the selector and the whole mapping into a single JQ program producing, for each raw item,
+        the selector value and the mapped entity (or the selector error).
+        Returns None when the mapping can't be evaluated in a single program.
+        """
+        entity_expression = _batch_object_expression(raw_entity_mappings)
+        if entity_expression is None:
+            return None
+
+        program = (
+            f'(try {{"selector": ([first(\n{selector_query}\n)] | .[0])}} catch {{"error": tostring}}) as $result'
+            f' | if ($result | has("error")) or (({json.dumps(parse_all)} or $result.selector == true) | not)'
+            f' then $result else $result + {{"entity": {entity_expression}}} end'
+        )
+        try:
+            self._compile(program)
+            return program
+        except Exception as exc:
+            logger.debug(
+                f"Failed to compile the mapping into a single JQ program, evaluating it field by field. Error: {exc}"
+            )
+            return None
+
+    async def _evaluate_batch(self, pattern: str, items: list[Any]) -> list[Any]:
+        """Run a pattern producing exactly one output per item over all the items with the configured backend."""
+        if ocean.config.jq_transform_backend == JQTransformBackend.process:
+            return await evaluate_in_process_pool(
+                self._with_environment_access(pattern),
+                items,
+                ocean.config.jq_process_pool_size,
+            )
+
+        loop = asyncio.get_event_loop()
+        program = self._compile(pattern)
+        return await loop.run_in_executor(
+            None, lambda: program.input_values(items).all()
+        )
+
+    async def _search_items_to_parse(
+        self, raw_results: list[RAW_ITEM], items_to_parse: str
+    ) -> list[Any]:
+        if ocean.config.jq_batch_evaluation:
+            try:
+                return await self._evaluate_batch(
+                    _batch_search_expression(items_to_parse), raw_results
+                )
+            except Exception as exc:
+                logger.debug(
+                    f"Search failed for pattern '{items_to_parse}', Error: {exc}"
+                )
+                return [None] * len(raw_results)
+
+        return await asyncio.gather(
+            *(self._search(data, items_to_parse) for data in raw_results)
+        )
+
+    async def _iter_raw_data_chunks(
+        self,
+        mapping: ResourceConfig,
+        raw_results: list[RAW_ITEM],
+        chunk_size: int | None,
+    ) -> AsyncIterator[list[dict[Any, Any]]]:
+        """
+        Yield the items to map in chunks of up to `chunk_size` items (a single chunk when it is None).
+        The items to parse of the raw results are expanded lazily, so only a chunk of the expanded items is held at once.
+        """
+        size = chunk_size or max(len(raw_results), 1)
+        items_to_parse = mapping.port.items_to_parse
+        if ocean.config.yield_items_to_parse or not items_to_parse:
+            for start in range(0, len(raw_results), size):
+                yield raw_results[start : start + size]
+            return
+
+        chunk: list[dict[Any, Any]] = []
+        for start in range(0, len(raw_results), size):
+            raw_results_chunk = raw_results[start : start + size]
+            items_per_result = await self._search_items_to_parse(
+                raw_results_chunk, items_to_parse
+            )
+            for data, items in zip(raw_results_chunk, items_per_result):
+                if not isinstance(items, list):
+                    logger.warning(
+                        f"Failed to parse items for JQ expression {items_to_parse}, Expected list but got {type(items)}."
+                        f" Skipping..."
+                    )
+                    continue
+                for item in items:
+                    chunk.append({mapping.port.items_to_parse_name: item, **data})
+                    if chunk_size is not None and len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+        if chunk:
+            yield chunk
+
+    async def _calculate_entities_in_batch(
+        self,
+        program: str,
+        raw_data: list[dict[Any, Any]],
+        raw_entity_mappings: dict[str, Any],
+        parse_all: bool = False,
+    ) -> tuple[list[MappedEntity], list[Exception]] | None:
+        """
+        Map all the items with a program compiled by `_compile_batch_program` in a single evaluation.
+        Returns None when the program fails, so the items can be mapped field by field instead.
+        """
+        try:
+            results = await self._evaluate_batch(program, raw_data)
+        except Exception as exc:
+            logger.debug(
+                f"Failed to map the batch with a single JQ program, evaluating it field by field. Error: {exc}"
+            )
+            return None
+
+        entities: list[MappedEntity] = []
+        errors: list[Exception] = []
+        for data, result in zip(raw_data, results):
+            if "error" in result:
+                errors.append(EntityProcessorException(result["error"]))
+                continue
+
+            should_run = result["selector"]
+            if not isinstance(should_run, bool):
+                errors.append(
+                    EntityProcessorException(
+                        f"Expected boolean value, got value:{should_run} of type: {type(should_run)} instead"
+                    )
+                )
+                continue
+
+            if parse_all or should_run:
+                misconfigurations: dict[str, str] = {}
+                _collect_misconfigurations(
+                    raw_entity_mappings, result["entity"], misconfigurations
+                )
+                entities.append(
+                    MappedEntity(
+                        result["entity"],
+                        did_entity_pass_selector=should_run,
+                        raw_data=data,
+                        misconfigurations=misconfigurations,
+                    )
+                )
+            else:
+                entities.append(
+                    MappedEntity(
+                        {},
+                        did_entity_pass_selector=False,
+                        raw_data=data,
+                        misconfigurations={},
+                    )
+                )
+
+        if errors:
+            logger.error(
+                f"Failed to calculate entities with {len(errors)} errors. errors: {errors}"
+            )
+        return entities, errors
+
     @staticmethod
     async def _send_examples(data: list[dict[str, Any]], kind: str) -> None:
         try:
@@ -288,59 +506,102 @@ class JQEntityProcessor(BaseEntityProcessor):
                 exc_info=True,
             )
 
-    async def _parse_items(
+    async def _calculate_entities(
         self,
         mapping: ResourceConfig,
-        raw_results: list[RAW_ITEM],
+        raw_data: list[dict[Any, Any]],
+        raw_entity_mappings: dict[str, Any],
+        batch_program: str | None,
         parse_all: bool = False,
-        send_raw_data_examples_amount: int = 0,
-    ) -> CalculationResult:
-        raw_entity_mappings: dict[str, Any] = mapping.port.entity.mappings.dict(
-            exclude_unset=True
-        )
-        logger.info(f"Parsing {len(raw_results)} raw results into entities")
-        calculated_entities_results, errors = zip_and_sum(
+    ) -> tuple[list[MappedEntity], list[Exception]]:
+        if batch_program is not None:
+            batch_results = await self._calculate_entities_in_batch(
+                batch_program, raw_data, raw_entity_mappings, parse_all
+            )
+            if batch_results is not None:
+                return batch_results
+
+        # The items to parse are already expanded by `_iter_raw_data_chunks`
+        return zip_and_sum(
             await process_in_queue(
-                raw_results,
+                raw_data,
                 self._calculate_entity,
                 raw_entity_mappings,
-                mapping.port.items_to_parse,
+                None,
                 mapping.port.items_to_parse_name,
                 mapping.selector.query,
                 parse_all,
             )
         )
-        logger.debug(
-            f"Finished parsing raw results into entities with {len(errors)} errors. errors: {errors}"
+
+    async def _parse_items_in_chunks(
+        self,
+        mapping: ResourceConfig,
+        raw_results: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+        chunk_size: int | None = None,
+    ) -> AsyncGenerator[CalculationResult, None]:
+        raw_entity_mappings: dict[str, Any] = mapping.port.entity.mappings.dict(
+            exclude_unset=True
         )
+        logger.info(f"Parsing {len(raw_results)} raw results into entities")
+        batch_program = None
+        if ocean.config.jq_batch_evaluation:
+            batch_program = self._compile_batch_program(
+                raw_entity_mappings, mapping.selector.query, parse_all
+            )
 
-        passed_entities = []
-        failed_entities = []
-        examples_to_send = ExampleStates(send_raw_data_examples_amount)
+        examples_left = send_raw_data_examples_amount
         entity_misconfigurations: dict[str, str] = {}
         missing_required_fields: bool = False
         entity_mapping_fault_counter: int = 0
-        for result in calculated_entities_results:
-            if len(result.misconfigurations) > 0:
-                entity_misconfigurations |= result.misconfigurations
-
-            if (
-                len(examples_to_send) < send_raw_data_examples_amount
-                and result.raw_data is not None
-            ):
-                examples_to_send.add_example(
-                    result.did_entity_pass_selector, result.raw_data
-                )
+        async for raw_data in self._iter_raw_data_chunks(
+            mapping, raw_results, chunk_size
+        ):
+            calculated_entities_results, errors = await self._calculate_entities(
+                mapping, raw_data, raw_entity_mappings, batch_program, parse_all
+            )
+            logger.debug(
+                f"Finished parsing {len(raw_data)} items into entities with {len(errors)} errors. errors: {errors}"
+            )
+
+            passed_entities = []
+            failed_entities = []
+            examples_to_send = ExampleStates(examples_left)
+            chunk_misconfigurations: dict[str, str] = {}
+            for result in calculated_entities_results:
+                if len(result.misconfigurations) > 0:
+                    chunk_misconfigurations |= result.misconfigurations
+
+                if (
+                    len(examples_to_send) < examples_left
+                    and result.raw_data is not None
+                ):
+                    examples_to_send.add_example(
+                        result.did_entity_pass_selector, result.raw_data
+                    )
 
-            if result.entity.get("identifier") and result.entity.get("blueprint"):
-                parsed_entity = Entity.parse_obj(result.entity)
-                if result.did_entity_pass_selector:
-                    passed_entities.append(parsed_entity)
+                if result.entity.get("identifier") and result.entity.get("blueprint"):
+                    parsed_entity = Entity.parse_obj(result.entity)
+                    if result.did_entity_pass_selector:
+                        passed_entities.append(parsed_entity)
+                    else:
+                        failed_entities.append(parsed_entity)
                 else:
-                    failed_entities.append(parsed_entity)
-            else:
-                missing_required_fields = True
-                entity_mapping_fault_counter += 1
+                    missing_required_fields = True
+                    entity_mapping_fault_counter += 1
+
+            examples = examples_to_send.get_examples()
+            examples_left -= len(examples)
+            await self._send_examples(examples, mapping.kind)
+            entity_misconfigurations |= chunk_misconfigurations
+
+            yield CalculationResult(
+                EntitySelectorDiff(passed=passed_entities, failed=failed_entities),
+                errors,
+                misconfigured_entity_keys=chunk_misconfigurations,
+            )
 
         self._notify_mapping_issues(
             entity_misconfigurations,
@@ -348,7 +609,24 @@ class JQEntityProcessor(BaseEntityProcessor):
             entity_mapping_fault_counter,
         )
 
-        await self._send_examples(examples_to_send.get_examples(), mapping.kind)
+    async def _parse_items(
+        self,
+        mapping: ResourceConfig,
+        raw_results: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+    ) -> CalculationResult:
+        passed_entities: list[Entity] = []
+        failed_entities: list[Entity] = []
+        errors: list[Exception] = []
+        entity_misconfigurations: dict[str, str] = {}
+        async for result in self._parse_items_in_chunks(
+            mapping, raw_results, parse_all, send_raw_data_examples_amount
+        ):
+            passed_entities.extend(result.entity_selector_diff.passed)
+            failed_entities.extend(result.entity_selector_diff.failed)
+            errors.extend(result.errors)
+            entity_misconfigurations |= result.misconfigured_entity_keys
 
         return CalculationResult(
             EntitySelectorDiff(passed=passed_entities, failed=failed_entities),
@@ -0,0 +1,83 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any
+
+import jq  # type: ignore
+
+# Number of raw items evaluated at once by a worker process of the pool
+PROCESS_POOL_CHUNK_SIZE = 500
+
+_executor: ProcessPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+@lru_cache(maxsize=128)
+def _compile(program: str) -> Any:
+    # Runs in the worker processes, so each of them keeps its own compiled programs
+    return jq.compile(program)
+
+
+def _evaluate(program: str, items: list[Any]) -> list[Any]:
+    return _compile(program).input_values(items).all()
+
+
+def _get_executor(max_workers: int | None) -> ProcessPoolExecutor:
+    global _executor, _executor_pid
+    # A pool inherited from a forked parent (e.g. a multi process resync worker) belongs to the parent,
+    # every process creates its own pool
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def shutdown_process_pool() -> None:
+    global _executor, _executor_pid
+    if _executor is not None and _executor_pid == os.getpid():
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executor_pid = None
+
+
+async def evaluate_in_process_pool(
+    program: str, items: list[Any], max_workers: int | None = None
+) -> list[Any]:
+    """
+    Run a JQ program over every item in a pool of worker processes, returning the first output for each item.
+
+    The items are split into chunks evaluated in parallel, so the transformation isn't bound to a single core.
+
+    Args:
+        program: The JQ program, it must produce exactly one output per item
+        items: The items to run the program over
+        max_workers: The number of worker processes, defaults to the number of CPUs. Only used when creating the pool
+
+    Returns:
+        list[Any]: The output of the program for each item, in the order of the items
+    """
+    executor = _get_executor(max_workers)
+    loop = asyncio.get_running_loop()
+    try:
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    _evaluate,
+                    program,
+                    items[start : start + PROCESS_POOL_CHUNK_SIZE],
+                )
+                for start in range(0, len(items), PROCESS_POOL_CHUNK_SIZE)
+            )
+        )
+    except BrokenProcessPool:
+        # A worker died, the pool can't be used anymore and is recreated on the next evaluation
+        shutdown_process_pool()
+        raise
+    return [result for chunk in chunks for result in chunk]
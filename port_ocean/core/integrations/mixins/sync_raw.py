@@ -1,23 +1,31 @@
 import asyncio
+import hashlib
+import json
+import os
 import sys
-import uuid
-from graphlib import CycleError
+from collections import defaultdict
 import inspect
 import typing
-from typing import Callable, Awaitable, Any
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Callable, Awaitable, Any
 import multiprocessing
 import httpx
 from loguru import logger
 from port_ocean.clients.port.types import UserAgentType
+from port_ocean.clients.port.utils import (
+    _get_http_client_context as _get_port_http_client_context,
+)
 from port_ocean.context.event import TriggerType, event_context, EventType, event
 from port_ocean.context.metric_resource import metric_resource_context
 from port_ocean.context.ocean import ocean
 from port_ocean.context.resource import resource_context
 from port_ocean.context import resource
+from port_ocean.core.handlers.entity_processor.jq_process_pool import (
+    shutdown_process_pool,
+)
 from port_ocean.core.handlers.port_app_config.models import ResourceConfig
 from port_ocean.core.integrations.mixins import HandlerMixin, EventsMixin
 from port_ocean.core.integrations.mixins.utils import (
-    ProcessWrapper,
     clear_http_client_context,
     is_resource_supported,
     unsupported_kind_response,
@@ -32,8 +40,21 @@ from port_ocean.core.ocean_types import (
     ASYNC_GENERATOR_RESYNC_TYPE,
     RAW_ITEM,
     CalculationResult,
+    EntitySelectorDiff,
+)
+from port_ocean.core.utils.entity_state_index import EntityStateIndex
+from port_ocean.core.utils.kind_reconciliation_index import KindReconciliationIndex
+from port_ocean.core.utils.kind_scheduler import (
+    KindScheduler,
+    get_static_blueprint,
+    resolve_kinds_dependencies,
 )
+from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
 from port_ocean.core.utils.utils import (
+    CompactEntity,
+    compact_entity,
+    expand_compact_entity,
+    get_entity_key,
     resolve_entities_diff,
     zip_and_sum,
     gather_and_split_errors_from_results,
@@ -42,6 +63,7 @@ from port_ocean.exceptions.core import (
     IntegrationSubProcessFailedException,
     OceanAbortException,
 )
+from port_ocean.exceptions.utils import WorkerTaskFailedException
 from port_ocean.helpers.metric.metric import (
     MetricResourceKind,
     SyncState,
@@ -49,10 +71,18 @@ from port_ocean.helpers.metric.metric import (
     MetricPhase,
 )
 from port_ocean.helpers.metric.utils import TimeMetric, TimeMetricWithResourceKind
-from port_ocean.utils.ipc import FileIPC
+from port_ocean.utils.async_http import _get_http_client_context
+from port_ocean.utils.worker_pool import SubprocessWorkerPool
 
 SEND_RAW_DATA_EXAMPLES_AMOUNT = 5
 
+# Number of entities sent at once from a worker process to the resync process
+WORKER_RESULT_CHUNK_SIZE = 1000
+
+# Number of passes over the entities that failed to upsert,
+# each pass only retries the entities that are still failing
+FAILED_ENTITIES_UPSERT_ATTEMPTS = 3
+
 
 class SyncRawMixin(HandlerMixin, EventsMixin):
     """Mixin class for synchronization of raw constructed entities.
@@ -67,6 +97,8 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
     def __init__(self) -> None:
         HandlerMixin.__init__(self)
         EventsMixin.__init__(self)
+        self._worker_pool: SubprocessWorkerPool | None = None
+        self._entity_state_index: EntityStateIndex | None = None
 
     async def _on_resync(self, kind: str) -> RAW_RESULT:
         raise NotImplementedError("on_resync must be implemented")
@@ -197,6 +229,17 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         ):
             return entities
 
+        if (
+            self._entity_state_index is not None
+            and await self._seed_entity_state_index(
+                self._entity_state_index,
+                entities[0].blueprint,
+                resource,
+                user_agent_type,
+            )
+        ):
+            return self._entity_state_index.get_changed_entities(entities)
+
         MIN_ENTITIES_TO_MAP = 10
         if len(entities) <= MIN_ENTITIES_TO_MAP:
             return entities
@@ -221,16 +264,96 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             return resolve_entities_diff(entities, entities_at_port_with_properties)
         return entities
 
-    async def _fetch_entities_batch_from_port(
+    def _record_entity_states(
+        self, entities: list[Entity], upserted_entities: list[Entity]
+    ) -> None:
+        if self._entity_state_index is None:
+            return
+
+        upserted_keys = {
+            (entity.blueprint, entity.identifier) for entity in upserted_entities
+        }
+        self._entity_state_index.update(
+            entity
+            for entity in entities
+            if not entity.is_using_search_identifier
+            and not entity.is_using_search_relation
+            and (entity.blueprint, entity.identifier) in upserted_keys
+        )
+
+    def _prepare_entity_state_index(
+        self, user_agent_type: UserAgentType
+    ) -> EntityStateIndex | None:
+        """Open the entity state index of the resync, it is cleared and seeded again when it can't be trusted."""
+        if not ocean.config.entity_state_index_enabled:
+            return None
+
+        index = EntityStateIndex(
+            os.path.join(
+                ocean.config.entity_state_index_dir,
+                f"{ocean.config.integration.identifier}-{user_agent_type.value}.sqlite",
+            )
+        )
+        reseed = not index.is_valid(ocean.config.entity_state_index_max_age_seconds)
+        if reseed:
+            logger.info(
+                "Seeding the entity state index again from the entities at Port"
+            )
+        index.start_resync(reseed=reseed)
+        return index
+
+    async def _seed_entity_state_index(
         self,
-        entities_batch: list[Entity],
+        index: EntityStateIndex,
+        blueprint: str,
         resource: ResourceConfig,
         user_agent_type: UserAgentType,
-    ) -> list[Entity]:
-        query = self._construct_search_query_for_entities(entities_batch)
-        return await ocean.port_client.search_entities(
-            user_agent_type,
-            parameters_to_include=["blueprint", "identifier"]
+    ) -> bool:
+        """Seed the entity state index with the entities of the blueprint at Port, once per blueprint and mapped fields.
+
+        Only the fields mapped by the resource are fetched, so an entity at Port has the same fingerprint as the
+        mapped entity when the mapped fields are unchanged.
+
+        Returns:
+            bool: Whether the index is seeded, when seeding failed the entities are compared with Port instead.
+        """
+        parameters_to_include = self._get_mapped_parameters(resource)
+        seed_key = json.dumps([blueprint, sorted(parameters_to_include)])
+        if index.is_seeded(seed_key):
+            return True
+
+        logger.info(
+            f"Seeding the entity state index from the entities of blueprint {blueprint} at Port"
+        )
+        try:
+            entities_at_port = await ocean.port_client.search_entities(
+                user_agent_type,
+                query={
+                    "combinator": "and",
+                    "rules": [
+                        {
+                            "property": "$blueprint",
+                            "operator": "=",
+                            "value": blueprint,
+                        }
+                    ],
+                },
+                parameters_to_include=parameters_to_include,
+            )
+        except httpx.HTTPError as e:
+            logger.warning(
+                f"Failed to seed the entity state index, comparing the entities with Port instead: {e}"
+            )
+            return False
+
+        index.seed(seed_key, entities_at_port)
+        return True
+
+    @staticmethod
+    def _get_mapped_parameters(resource: ResourceConfig) -> list[str]:
+        """The fields of the entities at Port mapped by the resource, to search them with."""
+        return (
+            ["blueprint", "identifier"]
             + (["title"] if resource.port.entity.mappings.title != None else [])
             + (["team"] if resource.port.entity.mappings.team != None else [])
             + [
@@ -240,10 +363,60 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             + [
                 f"relations.{relation}"
                 for relation in resource.port.entity.mappings.relations
-            ],
+            ]
+        )
+
+    async def _fetch_entities_batch_from_port(
+        self,
+        entities_batch: list[Entity],
+        resource: ResourceConfig,
+        user_agent_type: UserAgentType,
+    ) -> list[Entity]:
+        query = self._construct_search_query_for_entities(entities_batch)
+        return await ocean.port_client.search_entities(
+            user_agent_type,
+            parameters_to_include=self._get_mapped_parameters(resource),
             query=query,
         )
 
+    def _should_parse_in_chunks(
+        self, resource: ResourceConfig, results: list[RAW_ITEM]
+    ) -> bool:
+        # Batches fitting in a single chunk are mapped at once
+        return bool(
+            resource.port.items_to_parse and not ocean.config.yield_items_to_parse
+        ) or len(results) > ocean.config.parse_items_chunk_size
+
+    async def _calculate_raw_in_chunks(
+        self,
+        resource: ResourceConfig,
+        results: list[RAW_ITEM],
+        parse_all: bool = False,
+        send_raw_data_examples_amount: int = 0,
+    ) -> AsyncGenerator[CalculationResult, None]:
+        """
+        Yield the calculation result of each chunk of the raw results as soon as it is mapped, so only a chunk of
+        the entities (e.g. of the items expanded by `itemsToParse`) is held at once.
+        """
+        if not self._should_parse_in_chunks(resource, results):
+            objects_diff = await self._calculate_raw(
+                [(resource, results)], parse_all, send_raw_data_examples_amount
+            )
+            yield objects_diff[0]
+            return
+
+        async with aclosing(
+            self.entity_processor.parse_items_in_chunks(
+                resource,
+                results,
+                parse_all,
+                send_raw_data_examples_amount,
+                ocean.config.parse_items_chunk_size,
+            )
+        ) as calculation_results:
+            async for calculation_result in calculation_results:
+                yield calculation_result
+
     async def _register_resource_raw(
         self,
         resource: ResourceConfig,
@@ -252,10 +425,51 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         parse_all: bool = False,
         send_raw_data_examples_amount: int = 0,
     ) -> CalculationResult:
-        objects_diff = await self._calculate_raw(
-            [(resource, results)], parse_all, send_raw_data_examples_amount
+        if not self._should_parse_in_chunks(resource, results):
+            objects_diff = await self._calculate_raw(
+                [(resource, results)], parse_all, send_raw_data_examples_amount
+            )
+            return await self._register_calculation_result(
+                resource, objects_diff[0], user_agent_type
+            )
+
+        modified_objects: list[Entity] = []
+        failed_entities: list[Entity] = []
+        errors: list[Exception] = []
+        misconfigured_entity_keys: dict[str, str] = {}
+        number_of_transformed_entities = 0
+        async with aclosing(
+            self._calculate_raw_in_chunks(
+                resource, results, parse_all, send_raw_data_examples_amount
+            )
+        ) as calculation_results:
+            async for calculation_result in calculation_results:
+                registered = await self._register_calculation_result(
+                    resource, calculation_result, user_agent_type
+                )
+                modified_objects.extend(registered.entity_selector_diff.passed)
+                failed_entities.extend(registered.entity_selector_diff.failed)
+                errors.extend(registered.errors)
+                misconfigured_entity_keys |= registered.misconfigured_entity_keys
+                number_of_transformed_entities += (
+                    registered.number_of_transformed_entities
+                )
+
+        return CalculationResult(
+            number_of_transformed_entities=number_of_transformed_entities,
+            entity_selector_diff=EntitySelectorDiff(
+                passed=modified_objects, failed=failed_entities
+            ),
+            errors=errors,
+            misconfigured_entity_keys=misconfigured_entity_keys,
         )
 
+    async def _register_calculation_result(
+        self,
+        resource: ResourceConfig,
+        calculation_result: CalculationResult,
+        user_agent_type: UserAgentType,
+    ) -> CalculationResult:
         ocean.metrics.inc_metric(
             name=MetricType.OBJECT_COUNT_NAME,
             labels=[
@@ -263,7 +477,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 MetricPhase.TRANSFORM,
                 MetricPhase.TransformResult.FAILED,
             ],
-            value=len(objects_diff[0].entity_selector_diff.failed),
+            value=len(calculation_result.entity_selector_diff.failed),
         )
 
         modified_objects = []
@@ -271,7 +485,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         if event.event_type == EventType.RESYNC:
             try:
                 changed_entities = await self._map_entities_compared_with_port(
-                    objects_diff[0].entity_selector_diff.passed,
+                    calculation_result.entity_selector_diff.passed,
                     resource,
                     user_agent_type,
                 )
@@ -279,7 +493,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                     logger.info(
                         "Upserting changed entities",
                         changed_entities=len(changed_entities),
-                        total_entities=len(objects_diff[0].entity_selector_diff.passed),
+                        total_entities=len(calculation_result.entity_selector_diff.passed),
                     )
                     ocean.metrics.inc_metric(
                         name=MetricType.OBJECT_COUNT_NAME,
@@ -288,17 +502,18 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                             MetricPhase.LOAD,
                             MetricPhase.LoadResult.SKIPPED,
                         ],
-                        value=len(objects_diff[0].entity_selector_diff.passed)
+                        value=len(calculation_result.entity_selector_diff.passed)
                         - len(changed_entities),
                     )
-                    await self.entities_state_applier.upsert(
+                    upserted_entities = await self.entities_state_applier.upsert(
                         changed_entities, user_agent_type
                     )
+                    self._record_entity_states(changed_entities, upserted_entities)
 
                 else:
                     logger.info(
                         "Entities in batch didn't changed since last sync, skipping",
-                        total_entities=len(objects_diff[0].entity_selector_diff.passed),
+                        total_entities=len(calculation_result.entity_selector_diff.passed),
                     )
                     ocean.metrics.inc_metric(
                         name=MetricType.OBJECT_COUNT_NAME,
@@ -307,33 +522,33 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                             MetricPhase.LOAD,
                             MetricPhase.LoadResult.SKIPPED,
                         ],
-                        value=len(objects_diff[0].entity_selector_diff.passed),
+                        value=len(calculation_result.entity_selector_diff.passed),
                     )
                 modified_objects = [
                     ocean.port_client._reduce_entity(entity)
-                    for entity in objects_diff[0].entity_selector_diff.passed
+                    for entity in calculation_result.entity_selector_diff.passed
                 ]
             except Exception as e:
                 logger.warning(
                     f"Failed to resolve batch entities with Port, falling back to upserting all entities: {str(e)}"
                 )
                 modified_objects = await self.entities_state_applier.upsert(
-                    objects_diff[0].entity_selector_diff.passed, user_agent_type
+                    calculation_result.entity_selector_diff.passed, user_agent_type
                 )
         else:
             modified_objects = await self.entities_state_applier.upsert(
-                objects_diff[0].entity_selector_diff.passed, user_agent_type
+                calculation_result.entity_selector_diff.passed, user_agent_type
             )
 
         return CalculationResult(
             number_of_transformed_entities=len(
-                objects_diff[0].entity_selector_diff.passed
+                calculation_result.entity_selector_diff.passed
             ),
-            entity_selector_diff=objects_diff[0].entity_selector_diff._replace(
+            entity_selector_diff=calculation_result.entity_selector_diff._replace(
                 passed=modified_objects
             ),
-            errors=objects_diff[0].errors,
-            misconfigured_entity_keys=objects_diff[0].misconfigured_entity_keys
+            errors=calculation_result.errors,
+            misconfigured_entity_keys=calculation_result.misconfigured_entity_keys
         )
 
     async def _unregister_resource_raw(
@@ -359,7 +574,10 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
 
     @TimeMetric(MetricPhase.RESYNC)
     async def _register_in_batches(
-        self, resource_config: ResourceConfig, user_agent_type: UserAgentType
+        self,
+        resource_config: ResourceConfig,
+        user_agent_type: UserAgentType,
+        on_entities_registered: Callable[[list[Entity]], Awaitable[None]] | None = None,
     ) -> tuple[list[Entity], list[Exception]]:
         results, errors = await self._get_resource_raw_results(resource_config)
         async_generators: list[ASYNC_GENERATOR_RESYNC_TYPE] = []
@@ -378,57 +596,89 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             SEND_RAW_DATA_EXAMPLES_AMOUNT if ocean.config.send_raw_data_examples else 0
         )
 
-        passed_entities = []
+        # The registered entities are handed to on_entities_registered as they are upserted when it is given,
+        # instead of being collected for the whole kind
+        passed_entities: list[Entity] = []
+        number_of_passed_entities = 0
         number_of_raw_results = 0
         number_of_transformed_entities = 0
 
-        if raw_results:
-            number_of_raw_results += len(raw_results)
-            calculation_result = await self._register_resource_raw(
-                resource_config,
-                raw_results,
-                user_agent_type,
-                send_raw_data_examples_amount=send_raw_data_examples_amount,
-            )
-            errors.extend(calculation_result.errors)
-            passed_entities = list(calculation_result.entity_selector_diff.passed)
-            number_of_transformed_entities += (
-                calculation_result.number_of_transformed_entities
-            )
-            logger.info(
-                f"Finished registering change for {len(raw_results)} raw results for kind: {resource_config.kind}. {len(passed_entities)} entities were affected"
-            )
-
-        for generator in async_generators:
-            try:
-                async for items in generator:
-                    if lakehouse_data_enabled:
-                        await ocean.port_client.post_integration_raw_data(items, event.id, resource_config.kind)
-                    number_of_raw_results += len(items)
-                    if send_raw_data_examples_amount > 0:
-                        send_raw_data_examples_amount = max(
-                            0, send_raw_data_examples_amount - len(passed_entities)
-                        )
+        # Fetching a batch, mapping the previous one and upserting the one before it overlap,
+        # the bounded queues stop a stage from running too far ahead of the next one
+        queue_size = ocean.config.resync_pipeline_queue_size
+        extracted: asyncio.Queue[list[RAW_ITEM] | None] = asyncio.Queue(queue_size)
+        transformed: asyncio.Queue[CalculationResult | None] = asyncio.Queue(
+            queue_size
+        )
 
-                    calculation_result = await self._register_resource_raw(
+        async def extract() -> None:
+            nonlocal number_of_raw_results
+            if raw_results:
+                number_of_raw_results += len(raw_results)
+                await extracted.put(raw_results)
+
+            for generator in async_generators:
+                try:
+                    async for items in generator:
+                        if lakehouse_data_enabled:
+                            await ocean.port_client.post_integration_raw_data(items, event.id, resource_config.kind)
+                        number_of_raw_results += len(items)
+                        await extracted.put(items)
+                except* OceanAbortException as error:
+                    ocean.metrics.sync_state = SyncState.FAILED
+                    errors.append(error)
+            await extracted.put(None)
+
+        async def transform() -> None:
+            nonlocal send_raw_data_examples_amount
+            while (items := await extracted.get()) is not None:
+                async with aclosing(
+                    self._calculate_raw_in_chunks(
                         resource_config,
                         items,
-                        user_agent_type,
                         send_raw_data_examples_amount=send_raw_data_examples_amount,
                     )
-                    passed_entities.extend(
-                        calculation_result.entity_selector_diff.passed
-                    )
-                    errors.extend(calculation_result.errors)
-                    number_of_transformed_entities += (
-                        calculation_result.number_of_transformed_entities
-                    )
-            except* OceanAbortException as error:
-                ocean.metrics.sync_state = SyncState.FAILED
-                errors.append(error)
+                ) as calculation_results:
+                    async for calculation_result in calculation_results:
+                        send_raw_data_examples_amount = max(
+                            0,
+                            send_raw_data_examples_amount
+                            - len(calculation_result.entity_selector_diff.passed),
+                        )
+                        await transformed.put(calculation_result)
+            await transformed.put(None)
+
+        async def load() -> None:
+            nonlocal number_of_passed_entities, number_of_transformed_entities
+            while (calculation_result := await transformed.get()) is not None:
+                registered = await self._register_calculation_result(
+                    resource_config, calculation_result, user_agent_type
+                )
+                number_of_passed_entities += len(registered.entity_selector_diff.passed)
+                if on_entities_registered is not None:
+                    await on_entities_registered(registered.entity_selector_diff.passed)
+                else:
+                    passed_entities.extend(registered.entity_selector_diff.passed)
+                errors.extend(registered.errors)
+                number_of_transformed_entities += (
+                    registered.number_of_transformed_entities
+                )
+
+        stages = [
+            asyncio.create_task(extract()),
+            asyncio.create_task(transform()),
+            asyncio.create_task(load()),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            # A failing stage stops the whole pipeline
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
 
         logger.info(
-            f"Finished registering kind: {resource_config.kind}-{resource.resource.index} ,{len(passed_entities)} entities out of {number_of_raw_results} raw results"
+            f"Finished registering kind: {resource_config.kind}-{resource.resource.index} ,{number_of_passed_entities} entities out of {number_of_raw_results} raw results"
         )
 
         ocean.metrics.set_metric(
@@ -663,64 +913,127 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 user_agent_type,
             )
 
-    async def sort_and_upsert_failed_entities(
-        self, user_agent_type: UserAgentType
-    ) -> None:
-        try:
-            if not event.entity_topological_sorter.should_execute():
-                return None
-            logger.info(
-                f"Executings topological sort of {event.entity_topological_sorter.get_entities_count()} entities failed to upsert.",
-                failed_toupsert_entities_count=event.entity_topological_sorter.get_entities_count(),
-            )
+    async def _upsert_failed_entities_wave(
+        self, entities: list[Entity], user_agent_type: UserAgentType
+    ) -> list[Entity]:
+        """Upsert a wave of entities in bulk per blueprint, returning the ones that failed again."""
+        blueprint_groups: dict[str, list[Entity]] = defaultdict(list)
+        for entity in entities:
+            blueprint_groups[entity.blueprint].append(entity)
 
-            for entity in event.entity_topological_sorter.get_entities():
-                await self.entities_state_applier.context.port_client.upsert_entity(
-                    entity,
+        port_client = self.entities_state_applier.context.port_client
+        results = await asyncio.gather(
+            *(
+                port_client.upsert_entities_in_batches(
+                    blueprint_entities,
                     event.port_app_config.get_port_request_options(),
                     user_agent_type,
                     should_raise=False,
                 )
-
-        except OceanAbortException as ocean_abort:
-            logger.info(
-                f"Failed topological sort of failed to upsert entites - trying to upsert unordered {event.entity_topological_sorter.get_entities_count()} entities.",
-                failed_topological_sort_entities_count=event.entity_topological_sorter.get_entities_count(),
+                for blueprint_entities in blueprint_groups.values()
             )
-            if isinstance(ocean_abort.__cause__, CycleError):
-                for entity in event.entity_topological_sorter.get_entities(False):
-                    await self.entities_state_applier.context.port_client.upsert_entity(
-                        entity,
-                        event.port_app_config.get_port_request_options(),
-                        user_agent_type,
-                        should_raise=False,
-                    )
+        )
+        failed_entity_keys = {
+            get_entity_key(entity)
+            for blueprint_results in results
+            for is_upserted, entity in blueprint_results
+            if not is_upserted
+        }
+        return [
+            entity
+            for entity in entities
+            if get_entity_key(entity) in failed_entity_keys
+        ]
 
-    def process_resource_in_subprocess(
-        self,
-        file_ipc_map: dict[str, FileIPC],
-        resource: ResourceConfig,
-        index: int,
-        user_agent_type: UserAgentType,
+    async def sort_and_upsert_failed_entities(
+        self, user_agent_type: UserAgentType
     ) -> None:
+        if not event.entity_topological_sorter.should_execute():
+            return None
         logger.info(
-            f"process started successfully for {resource.kind} with index {index}"
+            f"Executings topological sort of {event.entity_topological_sorter.get_entities_count()} entities failed to upsert.",
+            failed_toupsert_entities_count=event.entity_topological_sorter.get_entities_count(),
         )
 
-        clear_http_client_context()
+        waves = event.entity_topological_sorter.get_entities_in_waves()
+        for attempt in range(FAILED_ENTITIES_UPSERT_ATTEMPTS):
+            entities_count = sum(len(wave) for wave in waves)
+            failed_entities: list[Entity] = []
+            # The waves are upserted one after the other,
+            # so the relation targets of an entity are upserted before it
+            for wave in waves:
+                failed_entities.extend(
+                    await self._upsert_failed_entities_wave(wave, user_agent_type)
+                )
 
-        async def process_resource_task() -> None:
-            result = await self._process_resource(resource, index, user_agent_type)
-            file_ipc_map["process_resource"].save(result)
-            file_ipc_map["topological_entities"].save(
-                event.entity_topological_sorter.entities
+            if not failed_entities or len(failed_entities) == entities_count:
+                return None
+            if attempt + 1 < FAILED_ENTITIES_UPSERT_ATTEMPTS:
+                logger.info(
+                    f"Retrying the upsert of {len(failed_entities)} entities that still failed to upsert",
+                    failed_toupsert_entities_count=len(failed_entities),
+                )
+                waves = EntityTopologicalSorter.order_by_entities_dependencies_in_waves(
+                    failed_entities
+                )
+
+    async def _process_resource_in_worker(
+        self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType
+    ) -> AsyncIterator[tuple[str, list[Any]]]:
+        # The worker is reused between kinds, so only the failed entities of this kind are sent back
+        event.entity_topological_sorter.entities = []
+        # The entities are sent to the parent as they are upserted. Sending them is synchronous,
+        # so the queue only holds the entities upserted while the previous ones are being sent
+        registered: asyncio.Queue[list[Entity] | None] = asyncio.Queue()
+        with logger.contextualize(resource_kind=resource.kind, index=index):
+            task = asyncio.create_task(
+                self._process_resource(resource, index, user_agent_type, registered.put)
             )
+        task.add_done_callback(lambda _: registered.put_nowait(None))
+        try:
+            while (entities := await registered.get()) is not None:
+                for start in range(0, len(entities), WORKER_RESULT_CHUNK_SIZE):
+                    yield "entities", [
+                        compact_entity(entity)
+                        for entity in entities[start : start + WORKER_RESULT_CHUNK_SIZE]
+                    ]
+            _, errors = await task
+        finally:
+            # The parent stopped reading the results
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        topological_entities = event.entity_topological_sorter.entities
+        for start in range(0, len(topological_entities), WORKER_RESULT_CHUNK_SIZE):
+            yield "topological_entities", topological_entities[
+                start : start + WORKER_RESULT_CHUNK_SIZE
+            ]
+        yield "errors", errors
 
-        asyncio.run(process_resource_task())
-        logger.info(f"Process finished for {resource.kind} with index {index}")
+    async def _resync_reconciliation_in_worker(
+        self,
+        compact_creation_results: list[tuple[list[CompactEntity], list[Exception]]],
+        topological_entities: list[Entity],
+        *args: Any,
+    ) -> bool:
+        # The worker only holds the failed entities of the last kind it processed,
+        # the parent sends the failed entities of every kind of the resync
+        event.entity_topological_sorter.entities = topological_entities
+        return await self._resync_reconciliation(
+            [
+                ([expand_compact_entity(entity) for entity in entities], errors)
+                for entities, errors in compact_creation_results
+            ],
+            *args,
+        )
 
     async def _process_resource(
-        self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType
+        self,
+        resource: ResourceConfig,
+        index: int,
+        user_agent_type: UserAgentType,
+        on_entities_registered: Callable[[list[Entity]], Awaitable[None]] | None = None,
     ) -> tuple[list[Entity], list[Exception]]:
         # create resource context per resource kind, so resync method could have access to the resource
         # config as we might have multiple resources in the same event
@@ -732,7 +1045,9 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             )
 
             task = asyncio.create_task(
-                self._register_in_batches(resource, user_agent_type)
+                self._register_in_batches(
+                    resource, user_agent_type, on_entities_registered
+                )
             )
             event.on_abort(lambda: task.cancel())
             kind_results: tuple[list[Entity], list[Exception]] = await task
@@ -747,70 +1062,163 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
 
             return kind_results
 
-    def resync_reconciliation_in_subprocess(
+    async def process_resource(
+        self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType
+    ) -> tuple[list[Entity], list[Exception]]:
+        with logger.contextualize(resource_kind=resource.kind, index=index):
+            if ocean.app.process_execution_mode == ProcessExecutionMode.multi_process:
+                return await self._process_resource_with_worker(
+                    resource, index, user_agent_type
+                )
+            else:
+                return await self._process_resource(resource, index, user_agent_type)
+
+    async def _process_resource_with_worker(
+        self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType
+    ) -> tuple[list[Entity], list[Exception]]:
+        entities: list[Entity] = []
+        errors: list[Exception] = []
+        topological_entities: list[Entity] = []
+        try:
+            async with self._get_worker_pool() as worker_pool:
+                async for chunk_type, chunk in worker_pool.stream(
+                    "process_resource", resource, index, user_agent_type
+                ):
+                    if chunk_type == "entities":
+                        entities.extend(
+                            expand_compact_entity(entity) for entity in chunk
+                        )
+                    elif chunk_type == "topological_entities":
+                        topological_entities.extend(chunk)
+                    else:
+                        errors.extend(chunk)
+        except WorkerTaskFailedException as e:
+            logger.error(str(e))
+            return [], [
+                IntegrationSubProcessFailedException(
+                    f"Subprocess failed for {resource.kind} with index {index}"
+                )
+            ]
+
+        event.entity_topological_sorter.entities.extend(topological_entities)
+        return entities, errors
+
+    def _get_kind_reconciliation_index(
+        self, user_agent_type: UserAgentType
+    ) -> KindReconciliationIndex | None:
+        if not ocean.config.incremental_reconciliation_enabled:
+            return None
+
+        return KindReconciliationIndex(
+            os.path.join(
+                ocean.config.incremental_reconciliation_dir,
+                f"{ocean.config.integration.identifier}-{user_agent_type.value}.sqlite",
+            )
+        )
+
+    @staticmethod
+    def _get_reconciliation_kind(resource: ResourceConfig, index: int) -> str:
+        # A changed mapping is a new kind, so it is reconciled in full once before being reconciled incrementally
+        mapping_hash = hashlib.sha256(
+            resource.json(sort_keys=True).encode()
+        ).hexdigest()[:16]
+        return f"{resource.kind}-{index}-{mapping_hash}"
+
+    async def _reconcile_kind(
         self,
-        file_ipc_map: dict[str, FileIPC],
-        creation_results: list[tuple[list[Entity], list[Exception]]],
-        did_fetched_current_state: bool,
+        kind_index: KindReconciliationIndex,
+        kind: str,
+        entities: list[Entity],
+        errors: list[Exception],
         user_agent_type: UserAgentType,
         app_config: Any,
-        silent: bool = True,
-    ) -> None:
-        logger.info("Resync reconciliation subprocess started successfully")
+    ) -> bool:
+        """Delete the entities the kind stopped emitting since its previous run.
 
-        clear_http_client_context()
+        A kind that failed is left untouched, and a kind that never completed is recorded and left to the full
+        reconciliation.
 
-        async def resync_reconciliation_task() -> None:
-            result = await self._resync_reconciliation(
-                creation_results,
-                did_fetched_current_state,
-                user_agent_type,
-                app_config,
-                silent,
+        Returns:
+            bool: Whether the kind was reconciled, its entities are then left out of the full reconciliation.
+        """
+        if errors:
+            logger.warning(
+                f"Kind {kind} failed with {len(errors)} errors, skipping its incremental reconciliation"
             )
-            file_ipc_map["resync_reconciliation"].save(result)
+            return False
 
-        asyncio.run(resync_reconciliation_task())
-        logger.info("Resync reconciliation subprocess finished")
+        generation = kind_index.start_kind(kind)
+        kind_index.record(kind, generation, entities)
+        if not kind_index.is_completed(kind):
+            logger.info(
+                f"Kind {kind} was never reconciled, leaving it to the full reconciliation"
+            )
+            return False
 
-    async def process_resource(
-        self, resource: ResourceConfig, index: int, user_agent_type: UserAgentType
-    ) -> tuple[list[Entity], list[Exception]]:
-        with logger.contextualize(resource_kind=resource.kind, index=index):
-            if ocean.app.process_execution_mode == ProcessExecutionMode.multi_process:
-                id = uuid.uuid4()
-                logger.info(f"Starting subprocess with id {id}")
-                file_ipc_map = {
-                    "process_resource": FileIPC(
-                        str(id),
-                        "process_resource",
-                        (
-                            [],
-                            [
-                                IntegrationSubProcessFailedException(
-                                    f"Subprocess failed for {resource.kind} with index {index}"
-                                )
-                            ],
-                        ),
-                    ),
-                    "topological_entities": FileIPC(
-                        str(id), "topological_entities", []
-                    ),
-                }
-                process = ProcessWrapper(
-                    target=self.process_resource_in_subprocess,
-                    args=(file_ipc_map, resource, index, user_agent_type),
-                )
-                process.start()
-                await process.join_async()
+        stale_keys = kind_index.get_stale_keys(kind, generation)
+        logger.info(
+            f"Reconciling kind {kind}, {len(stale_keys)} entities are not emitted anymore"
+        )
+        is_deleted = await self.entities_state_applier.delete_diff_by_keys(
+            stale_keys
+            | {
+                get_entity_key(entity)
+                for entity in entities
+                if not entity.is_using_search_identifier
+            },
+            entities,
+            user_agent_type,
+            app_config.get_entity_deletion_threshold(),
+        )
+        # Stale entities kept by the deletion threshold stay in the index, the next run of the kind retries them
+        if is_deleted:
+            kind_index.complete_kind(kind)
+        return True
 
-                event.entity_topological_sorter.entities.extend(
-                    file_ipc_map["topological_entities"].load()
+    async def _delete_entities_missing_from_resync(
+        self,
+        generated_entities: list[Entity],
+        user_agent_type: UserAgentType,
+        app_config: Any,
+        reconciled_kinds: list[str],
+    ) -> None:
+        kind_index = self._get_kind_reconciliation_index(user_agent_type)
+        try:
+            kinds = [
+                self._get_reconciliation_kind(resource, index)
+                for index, resource in enumerate(app_config.resources)
+            ]
+            if kind_index is not None and (
+                set(reconciled_kinds) == set(kinds) == kind_index.get_kinds()
+            ):
+                logger.info(
+                    "Every kind was reconciled incrementally, skipping the full reconciliation"
                 )
-                return file_ipc_map["process_resource"].load()
+                return
 
-            else:
-                return await self._process_resource(resource, index, user_agent_type)
+            logger.info(
+                f"Running resync diff calculation, number of entities created during sync: {len(generated_entities)}"
+            )
+            entity_keys_at_port = await ocean.port_client.search_entity_keys(
+                user_agent_type
+            )
+            if kind_index is not None and reconciled_kinds:
+                # The kinds reconciled incrementally already deleted the entities they stopped emitting
+                entity_keys_at_port -= kind_index.get_keys(reconciled_kinds)
+
+            is_deleted = await self.entities_state_applier.delete_diff_by_keys(
+                entity_keys_at_port,
+                generated_entities,
+                user_agent_type,
+                app_config.get_entity_deletion_threshold(),
+            )
+            if kind_index is not None and is_deleted:
+                for kind in set(kinds) - set(reconciled_kinds):
+                    kind_index.complete_kind(kind)
+                kind_index.retain_kinds(kinds)
+        finally:
+            if kind_index is not None:
+                kind_index.close()
 
     @TimeMetricWithResourceKind(MetricPhase.RESYNC)
     async def _resync_reconciliation(
@@ -820,6 +1228,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         user_agent_type: UserAgentType,
         app_config: Any,
         silent: bool = True,
+        reconciled_kinds: list[str] | None = None,
     ) -> bool:
         """Handle the reconciliation phase of the resync process.
 
@@ -837,6 +1246,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             user_agent_type (UserAgentType): The type of user agent
             app_config (Any): The application configuration
             silent (bool): Whether to raise exceptions or handle them silently
+            reconciled_kinds (list[str] | None): The kinds already reconciled incrementally during the resync
 
         """
         await self.sort_and_upsert_failed_entities(user_agent_type)
@@ -866,16 +1276,12 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
             logger.error(message, exc_info=error_group)
             return False
 
-        logger.info(
-            f"Running resync diff calculation, number of entities created during sync: {len(generated_entities)}"
+        await self._delete_entities_missing_from_resync(
+            generated_entities, user_agent_type, app_config, reconciled_kinds or []
         )
-        entities_at_port = await ocean.port_client.search_entities(user_agent_type)
 
-        await self.entities_state_applier.delete_diff(
-            {"before": entities_at_port, "after": generated_entities},
-            user_agent_type,
-            app_config.get_entity_deletion_threshold(),
-        )
+        if self._entity_state_index is not None:
+            self._entity_state_index.complete_resync()
 
         logger.info("Resync finished successfully")
 
@@ -897,32 +1303,25 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
         user_agent_type: UserAgentType,
         app_config: Any,
         silent: bool = True,
+        reconciled_kinds: list[str] | None = None,
     ) -> bool:
         if ocean.app.process_execution_mode == ProcessExecutionMode.multi_process:
-            id = uuid.uuid4()
-            logger.info(f"Starting resync reconciliation in subprocess with id {id}")
-
-            file_ipc_map = {
-                "resync_reconciliation": FileIPC(
-                    str(id), "resync_reconciliation", False
-                ),
-            }
-
-            process = ProcessWrapper(
-                target=self.resync_reconciliation_in_subprocess,
-                args=(
-                    file_ipc_map,
-                    creation_results,
+            logger.info("Starting resync reconciliation in a worker process")
+            async with self._get_worker_pool() as worker_pool:
+                return await worker_pool.run(
+                    "resync_reconciliation",
+                    [
+                        ([compact_entity(entity) for entity in entities], errors)
+                        for entities, errors in creation_results
+                    ],
+                    event.entity_topological_sorter.entities,
                     did_fetched_current_state,
                     user_agent_type,
                     app_config,
                     silent,
-                ),
-            )
-            process.start()
-            await process.join_async()
-
-            return file_ipc_map["resync_reconciliation"].load()
+                    reconciled_kinds,
+                    default=False,
+                )
         else:
             return await self._resync_reconciliation(
                 creation_results,
@@ -930,7 +1329,75 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 user_agent_type,
                 app_config,
                 silent,
+                reconciled_kinds,
+            )
+
+    def _create_worker_pool(self, size: int) -> SubprocessWorkerPool:
+        def initialize_worker() -> None:
+            # Http clients can't be shared with the parent process, each worker creates its own
+            # and keeps them for all the tasks it executes
+            clear_http_client_context()
+            _get_port_http_client_context(ocean.port_client)
+            _get_http_client_context()
+
+        def finalize_worker() -> None:
+            # The JQ process pool of the worker would outlive it otherwise. Doesn't wait for the
+            # pool, as it also runs from the SIGTERM handler of a terminated worker
+            shutdown_process_pool()
+
+        return SubprocessWorkerPool(
+            {
+                "process_resource": self._process_resource_in_worker,
+                "resync_reconciliation": self._resync_reconciliation_in_worker,
+            },
+            size=size,
+            initializer=initialize_worker,
+            max_tasks_per_worker=ocean.config.multi_process_worker_max_tasks,
+            finalizer=finalize_worker,
+        )
+
+    @asynccontextmanager
+    async def _get_worker_pool(self) -> AsyncIterator[SubprocessWorkerPool]:
+        """Use the worker pool of the running resync, or a dedicated worker outside of a resync."""
+        if self._worker_pool is not None:
+            yield self._worker_pool
+            return
+
+        worker_pool = self._create_worker_pool(size=1)
+        try:
+            yield worker_pool
+        finally:
+            await worker_pool.close()
+
+    async def _get_kinds_dependencies(
+        self, resources: list[ResourceConfig]
+    ) -> dict[int, set[int]]:
+        """Resolve the dependency hints between the resync kinds using the relations of their blueprints.
+
+        Failing to fetch the blueprints is not fatal, the kinds are then scheduled without hints.
+        """
+        blueprint_identifiers = {
+            blueprint
+            for resource in resources
+            if resource.port.entity.mappings.relations
+            and (blueprint := get_static_blueprint(resource))
+        }
+        try:
+            blueprints = await asyncio.gather(
+                *(
+                    ocean.port_client.get_blueprint(identifier, should_log=False)
+                    for identifier in blueprint_identifiers
+                )
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to fetch blueprints for kinds dependencies, scheduling kinds without dependencies: {e}"
             )
+            return {}
+
+        return resolve_kinds_dependencies(
+            resources, {blueprint.identifier: blueprint for blueprint in blueprints}
+        )
 
     @TimeMetric(MetricPhase.RESYNC)
     async def sync_raw_all(
@@ -1008,14 +1475,66 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 multiprocessing.set_start_method("spawn", True)
             else:
                 multiprocessing.set_start_method("fork", True)
+
+            # Opened before the workers are forked, so they share it
+            entity_state_index = self._prepare_entity_state_index(user_agent_type)
+            self._entity_state_index = entity_state_index
+            kind_index = self._get_kind_reconciliation_index(user_agent_type)
+            reconciled_kinds: list[str] = []
+
+            worker_pool: SubprocessWorkerPool | None = None
+            if (
+                ocean.app.process_execution_mode
+                == ProcessExecutionMode.multi_process
+            ):
+                # The workers live for the duration of the resync, they are forked with its event context
+                # and their prometheus metric files are cleaned up along with the resync metrics
+                worker_pool = self._create_worker_pool(
+                    size=ocean.config.resync_kinds_concurrency
+                )
+                self._worker_pool = worker_pool
             try:
-                for index, resource in enumerate(app_config.resources):
+                concurrency = ocean.config.resync_kinds_concurrency
+                kind_scheduler = KindScheduler(
+                    app_config.resources,
+                    concurrency,
+                    (
+                        await self._get_kinds_dependencies(app_config.resources)
+                        if concurrency > 1
+                        else None
+                    ),
+                )
+
+                async def process_scheduled_resource(
+                    resource: ResourceConfig, index: int
+                ) -> tuple[list[Entity], list[Exception]]:
                     logger.info(
                         f"Starting processing resource {resource.kind} with index {index}"
                     )
-                    creation_results.append(
-                        await self.process_resource(resource, index, user_agent_type)
+                    entities, errors = await self.process_resource(
+                        resource, index, user_agent_type
                     )
+                    if kind_index is None or not did_fetched_current_state:
+                        return entities, errors
+
+                    kind = self._get_reconciliation_kind(resource, index)
+                    with logger.contextualize(resource_kind=resource.kind, index=index):
+                        if await self._reconcile_kind(
+                            kind_index,
+                            kind,
+                            entities,
+                            errors,
+                            user_agent_type,
+                            app_config,
+                        ):
+                            reconciled_kinds.append(kind)
+                            # The full reconciliation doesn't need the entities of a reconciled kind
+                            return [], errors
+                    return entities, errors
+
+                creation_results.extend(
+                    await kind_scheduler.run(process_scheduled_resource)
+                )
             except asyncio.CancelledError as e:
                 logger.warning(
                     "Resync aborted successfully, skipping delete phase. This leads to an incomplete state"
@@ -1038,6 +1557,7 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                     user_agent_type,
                     app_config,
                     silent,
+                    reconciled_kinds,
                 )
 
                 async with metric_resource_context(MetricResourceKind.RECONCILIATION):
@@ -1048,6 +1568,16 @@ class SyncRawMixin(HandlerMixin, EventsMixin):
                 return success
             finally:
                 await ocean.app.cache_provider.clear()
+                if entity_state_index is not None:
+                    if self._entity_state_index is entity_state_index:
+                        self._entity_state_index = None
+                    entity_state_index.close()
+                if kind_index is not None:
+                    kind_index.close()
+                if worker_pool is not None:
+                    if self._worker_pool is worker_pool:
+                        self._worker_pool = None
+                    await worker_pool.close()
                 if (
                     ocean.app.process_execution_mode
                     == ProcessExecutionMode.multi_process
@@ -3,8 +3,6 @@ from typing import Awaitable, Generator, Callable, cast
 
 from loguru import logger
 
-import asyncio
-import multiprocessing
 
 from port_ocean.core.handlers.entity_processor.jq_entity_processor import JQEntityProcessor
 from port_ocean.core.handlers.port_app_config.models import ResourceConfig
@@ -109,19 +107,6 @@ def unsupported_kind_response(
     return [], [KindNotImplementedException(kind, available_resync_kinds)]
 
 
-class ProcessWrapper(multiprocessing.Process):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-    async def join_async(self) -> None:
-        while self.exitcode is None:
-            await asyncio.sleep(2)
-        if self.exitcode != 0:
-            logger.error(f"Process {self.pid} failed with exit code {self.exitcode}")
-        else:
-            logger.info(f"Process {self.pid} finished with exit code {self.exitcode}")
-        return super().join()
-
 def clear_http_client_context() -> None:
     try:
         while _http_client.top is not None:
@@ -21,6 +21,11 @@ class CachingStorageMode(StrEnum):
     memory = "memory"
 
 
+class JQTransformBackend(StrEnum):
+    thread = "thread"
+    process = "process"
+
+
 class Runtime(Enum):
     Saas = "Saas"
     OnPrem = "OnPrem"
@@ -55,6 +60,16 @@ class Entity(BaseModel):
     properties: dict[str, Any] = {}
     relations: dict[str, Any] = {}
 
+    @classmethod
+    def from_trusted(cls, data: dict[str, Any]) -> "Entity":
+        """
+        Build an entity without validating it, for data that is already known to be a valid entity
+        (returned by Port). Unknown fields are dropped like `parse_obj` does.
+        """
+        return cls.construct(
+            **{key: value for key, value in data.items() if key in cls.__fields__}
+        )
+
     @property
     def is_using_search_identifier(self) -> bool:
         return isinstance(self.identifier, dict)
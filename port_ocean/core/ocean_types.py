@@ -28,6 +28,10 @@ class RawEntityDiff(TypedDict):
     after: list[RAW_ITEM]
 
 
+# The (blueprint, identifier) pair identifying an entity in Port
+EntityKey = tuple[str, str]
+
+
 class EntityDiff(TypedDict):
     before: list[Entity]
     after: list[Entity]
@@ -0,0 +1,192 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+from port_ocean.core.models import Entity
+from port_ocean.core.ocean_types import EntityKey
+from port_ocean.core.utils.utils import get_entity_fingerprint, get_entity_key
+
+# Number of entities looked up per query, keeps the query under the sqlite variables limit
+LOOKUP_BATCH_SIZE = 400
+
+
+class EntityStateIndex:
+    """On-disk index of the fingerprint of the entities at Port, keyed by blueprint and identifier.
+
+    An entity is written to the index only once Port accepted it, so an entity with the same fingerprint as its
+    entry doesn't need to be upserted again. Each resync runs in a new generation, the entries that weren't
+    seen by a successful resync are pruned at its end, and the next resync only trusts the index when the
+    previous one completed.
+
+    The index is seeded from Port once per seed key, e.g. per blueprint and mapped fields, so the seeded
+    fingerprints cover the same fields as the fingerprints of the mapped entities.
+
+    The index is a sqlite database, so the worker processes of a multi process resync share it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # A sqlite connection can't be used by a forked process, every process opens its own
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entity_fingerprints ("
+                "blueprint TEXT NOT NULL, identifier TEXT NOT NULL, fingerprint BLOB NOT NULL, "
+                "generation INTEGER NOT NULL, PRIMARY KEY (blueprint, identifier)"
+                ") WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS seeds (key TEXT PRIMARY KEY)"
+            )
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._connection_pid = None
+
+    def _get_metadata(self, key: str) -> float | None:
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_metadata(self, key: str, value: float) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @property
+    def generation(self) -> int:
+        return int(self._get_metadata("generation") or 0)
+
+    def is_valid(self, max_age_seconds: float) -> bool:
+        """Whether the previous resync completed and the index was seeded from Port less than max_age_seconds ago."""
+        completed_at = self._get_metadata("completed_at")
+        seeded_at = self._get_metadata("seeded_at")
+        return (
+            completed_at is not None
+            and seeded_at is not None
+            and time.time() - seeded_at <= max_age_seconds
+        )
+
+    def start_resync(self, reseed: bool = False) -> None:
+        """
+        Start the generation of a new resync. When reseed is set, the index is cleared and seeded again during the resync.
+        The index stays invalid until the resync completes, so an interrupted resync makes the next one seed it again.
+        """
+        with self.connection as connection:
+            connection.execute("DELETE FROM metadata WHERE key = 'completed_at'")
+            self._set_metadata("generation", self.generation + 1)
+            if reseed:
+                connection.execute("DELETE FROM entity_fingerprints")
+                connection.execute("DELETE FROM seeds")
+                self._set_metadata("seeded_at", time.time())
+
+    def is_seeded(self, seed_key: str) -> bool:
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM seeds WHERE key = ?", (seed_key,)
+            ).fetchone()
+            is not None
+        )
+
+    def seed(self, seed_key: str, entities: Iterable[Entity]) -> None:
+        """Record the fingerprints of the entities at Port, the entries of entities already seen keep their generation."""
+        with self.connection as connection:
+            # Seeded entries belong to no resync, they are pruned unless the resync sees them
+            connection.executemany(
+                "INSERT INTO entity_fingerprints (blueprint, identifier, fingerprint, generation) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT (blueprint, identifier) DO UPDATE SET fingerprint = excluded.fingerprint",
+                (
+                    (*get_entity_key(entity), get_entity_fingerprint(entity))
+                    for entity in entities
+                ),
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO seeds (key) VALUES (?)", (seed_key,)
+            )
+
+    def get_changed_entities(self, entities: list[Entity]) -> list[Entity]:
+        """Return the entities whose content differs from their entry, the unchanged ones are marked as seen."""
+        fingerprints = {
+            get_entity_key(entity): get_entity_fingerprint(entity)
+            for entity in entities
+        }
+        keys = list(fingerprints)
+        stored_fingerprints: dict[EntityKey, bytes] = {}
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start : start + LOOKUP_BATCH_SIZE]
+            placeholders = ", ".join(["(?, ?)"] * len(batch))
+            rows = self.connection.execute(
+                "SELECT blueprint, identifier, fingerprint FROM entity_fingerprints "
+                f"WHERE (blueprint, identifier) IN (VALUES {placeholders})",
+                [value for key in batch for value in key],
+            )
+            stored_fingerprints.update(
+                ((blueprint, identifier), fingerprint)
+                for blueprint, identifier, fingerprint in rows
+            )
+
+        unchanged_keys = [
+            key
+            for key, fingerprint in fingerprints.items()
+            if stored_fingerprints.get(key) == fingerprint
+        ]
+        with self.connection as connection:
+            connection.executemany(
+                "UPDATE entity_fingerprints SET generation = ? WHERE blueprint = ? AND identifier = ?",
+                ((self.generation, *key) for key in unchanged_keys),
+            )
+
+        logger.info(
+            "Compared entities with the entity state index",
+            unchanged_entities=len(unchanged_keys),
+            total_entities=len(entities),
+        )
+        changed_keys = set(fingerprints) - set(unchanged_keys)
+        return [entity for entity in entities if get_entity_key(entity) in changed_keys]
+
+    def update(self, entities: Iterable[Entity]) -> None:
+        """Record the content of entities Port accepted."""
+        generation = self.generation
+        with self.connection as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entity_fingerprints (blueprint, identifier, fingerprint, generation) VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        *get_entity_key(entity),
+                        get_entity_fingerprint(entity),
+                        generation,
+                    )
+                    for entity in entities
+                ),
+            )
+
+    def complete_resync(self) -> None:
+        """Prune the entries the resync didn't see and let the next resync trust the index."""
+        with self.connection as connection:
+            pruned = connection.execute(
+                "DELETE FROM entity_fingerprints WHERE generation != ?",
+                (self.generation,),
+            ).rowcount
+            self._set_metadata("completed_at", time.time())
+        logger.info(f"Entity state index completed, pruned {pruned} entries")
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Any, Generator
 from port_ocean.context import event
 from port_ocean.core.models import Entity
@@ -11,6 +12,12 @@ from port_ocean.exceptions.core import OceanAbortException
 
 Node = tuple[str, str]
 
+CYCLIC_DEPENDENCIES_ERROR_MESSAGE = (
+    "Cannot order entities due to cyclic dependencies. \n"
+    "If you do want to have cyclic dependencies, please make sure to set the keys"
+    " 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
+)
+
 
 class EntityTopologicalSorter:
     def __init__(self) -> None:
@@ -43,48 +50,150 @@ class EntityTopologicalSorter:
         for entity in sorted_and_mapped:
             yield entity
 
+    def get_entities_in_waves(self) -> list[list[Entity]]:
+        return EntityTopologicalSorter.order_by_entities_dependencies_in_waves(
+            self.entities
+        )
+
     @staticmethod
     def node(entity: Entity) -> Node:
         return entity.identifier, entity.blueprint
 
     @staticmethod
-    def order_by_entities_dependencies(entities: list[Entity]) -> list[Entity]:
+    def _build_dependency_graph(
+        entities: list[Entity],
+    ) -> tuple[dict[Node, Set[Node]], dict[Node, Entity]]:
         nodes: dict[Node, Set[Node]] = {}
         entities_map = {}
+        # Relation targets are matched by identifier only, as a relation doesn't carry the target blueprint
+        identifier_index: dict[Any, list[Node]] = defaultdict(list)
         for entity in entities:
-            nodes[EntityTopologicalSorter.node(entity)] = set()
-            entities_map[EntityTopologicalSorter.node(entity)] = entity
+            entity_node = EntityTopologicalSorter.node(entity)
+            if entity_node not in nodes:
+                identifier_index[entity.identifier].append(entity_node)
+            nodes[entity_node] = set()
+            entities_map[entity_node] = entity
 
         for entity in entities:
-            relation_target_ids: list[str] = sum(
-                [
+            entity_node = EntityTopologicalSorter.node(entity)
+            for identifiers in entity.relations.values():
+                if identifiers is None:
+                    continue
+                for identifier in (
                     identifiers if isinstance(identifiers, list) else [identifiers]
-                    for identifiers in entity.relations.values()
-                    if identifiers is not None
-                ],
-                [],
-            )
-            related_entities = [
-                related
-                for related in entities
-                if related.identifier in relation_target_ids
-            ]
-
-            for related_entity in related_entities:
-                if (
-                    entity.blueprint is not related_entity.blueprint
-                    or entity.identifier is not related_entity.identifier
                 ):
-                    nodes[EntityTopologicalSorter.node(entity)].add(
-                        EntityTopologicalSorter.node(related_entity)
-                    )
-
-        sort_op = TopologicalSorter(nodes)
-        try:
-            return [entities_map[item] for item in sort_op.static_order()]
-        except CycleError as ex:
+                    # Search relations can't be resolved to one of the entities
+                    if isinstance(identifier, dict):
+                        continue
+                    for related_node in identifier_index.get(identifier, []):
+                        if related_node != entity_node:
+                            nodes[entity_node].add(related_node)
+
+        return nodes, entities_map
+
+    @staticmethod
+    def _strongly_connected_components(
+        nodes: dict[Node, Set[Node]],
+    ) -> list[list[Node]]:
+        """Tarjan's algorithm, iterative so deep dependency chains don't hit the recursion limit."""
+        index: dict[Node, int] = {}
+        lowlink: dict[Node, int] = {}
+        stack: list[Node] = []
+        on_stack: Set[Node] = set()
+        components: list[list[Node]] = []
+
+        for root in nodes:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(nodes[root]))]
+            while work:
+                current, dependencies = work[-1]
+                for dependency in dependencies:
+                    if dependency not in index:
+                        index[dependency] = lowlink[dependency] = len(index)
+                        stack.append(dependency)
+                        on_stack.add(dependency)
+                        work.append((dependency, iter(nodes[dependency])))
+                        break
+                    if dependency in on_stack:
+                        lowlink[current] = min(lowlink[current], index[dependency])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[current])
+                    if lowlink[current] == index[current]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == current:
+                                break
+                        components.append(component)
+
+        return components
+
+    @staticmethod
+    def _order_in_waves(
+        entities: list[Entity],
+    ) -> tuple[list[list[Entity]], bool]:
+        nodes, entities_map = EntityTopologicalSorter._build_dependency_graph(entities)
+        components = EntityTopologicalSorter._strongly_connected_components(nodes)
+        component_of = {
+            member: component_index
+            for component_index, component in enumerate(components)
+            for member in component
+        }
+        # The graph of the components is acyclic, so it is always sorted in a single pass
+        components_graph: dict[int, Set[int]] = {
+            component_index: {
+                component_of[dependency]
+                for member in component
+                for dependency in nodes[member]
+                if component_of[dependency] != component_index
+            }
+            for component_index, component in enumerate(components)
+        }
+
+        sort_op = TopologicalSorter(components_graph)
+        sort_op.prepare()
+        waves: list[list[Entity]] = []
+        while sort_op.is_active():
+            ready = sort_op.get_ready()
+            waves.append(
+                [
+                    entities_map[member]
+                    for component_index in ready
+                    for member in components[component_index]
+                ]
+            )
+            sort_op.done(*ready)
+
+        has_cycles = any(len(component) > 1 for component in components)
+        return waves, has_cycles
+
+    @staticmethod
+    def order_by_entities_dependencies(entities: list[Entity]) -> list[Entity]:
+        waves, has_cycles = EntityTopologicalSorter._order_in_waves(entities)
+        if has_cycles:
             raise OceanAbortException(
-                "Cannot order entities due to cyclic dependencies. \n"
-                "If you do want to have cyclic dependencies, please make sure to set the keys"
-                " 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
-            ) from ex
+                CYCLIC_DEPENDENCIES_ERROR_MESSAGE
+            ) from CycleError("Entities have cyclic dependencies")
+        return [entity for wave in waves for entity in wave]
+
+    @staticmethod
+    def order_by_entities_dependencies_in_waves(
+        entities: list[Entity],
+    ) -> list[list[Entity]]:
+        """
+        Group the entities in waves, every entity is in a later wave than the entities it depends on.
+        The entities of a wave don't depend on each other, so they can be handled concurrently as long as
+        the waves are handled one after the other. Entities with cyclic dependencies can't be ordered, each
+        cycle is placed in a single wave.
+        """
+        waves, _ = EntityTopologicalSorter._order_in_waves(entities)
+        return waves
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+from port_ocean.core.models import Entity
+from port_ocean.core.ocean_types import EntityKey
+
+# Number of kinds looked up per query, keeps the query under the sqlite variables limit
+LOOKUP_BATCH_SIZE = 400
+
+
+class KindReconciliationIndex:
+    """On-disk record of the entities emitted by each kind of the resync, keyed by kind, blueprint and identifier.
+
+    Every run of a kind starts a new generation of the kind, and the entities it emits are recorded with it. Once
+    the kind completed, the entities it emitted in a previous generation but not in the current one are stale and
+    can be deleted without looking at the rest of the resync. An entity is never stale while another kind still
+    emits it.
+
+    A kind is only reconciled incrementally once a previous run of it completed, either incrementally or by a full
+    reconciliation, so the entities it created before the index existed are left to the full reconciliation.
+
+    The index is a sqlite database, so the worker processes of a multi process resync share it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # A sqlite connection can't be used by a forked process, every process opens its own
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS kind_entities ("
+                "kind TEXT NOT NULL, blueprint TEXT NOT NULL, identifier TEXT NOT NULL, "
+                "generation INTEGER NOT NULL, PRIMARY KEY (kind, blueprint, identifier)"
+                ") WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS kind_entities_key ON kind_entities (blueprint, identifier)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS kind_generations ("
+                "kind TEXT PRIMARY KEY, generation INTEGER NOT NULL, completed_generation INTEGER"
+                ")"
+            )
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._connection_pid = None
+
+    def get_kinds(self) -> set[str]:
+        return {
+            kind
+            for (kind,) in self.connection.execute("SELECT kind FROM kind_generations")
+        }
+
+    def is_completed(self, kind: str) -> bool:
+        """Whether a previous run of the kind completed, so its stale entities can be trusted."""
+        row = self.connection.execute(
+            "SELECT completed_generation FROM kind_generations WHERE kind = ?", (kind,)
+        ).fetchone()
+        return row is not None and row[0] is not None
+
+    def start_kind(self, kind: str) -> int:
+        """Start a new generation of the kind and return it."""
+        with self.connection as connection:
+            connection.execute(
+                "INSERT INTO kind_generations (kind, generation) VALUES (?, 1) "
+                "ON CONFLICT (kind) DO UPDATE SET generation = generation + 1",
+                (kind,),
+            )
+            (generation,) = connection.execute(
+                "SELECT generation FROM kind_generations WHERE kind = ?", (kind,)
+            ).fetchone()
+        return generation
+
+    def record(self, kind: str, generation: int, entities: Iterable[Entity]) -> None:
+        """Record the entities emitted by the generation of the kind."""
+        with self.connection as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO kind_entities (kind, blueprint, identifier, generation) VALUES (?, ?, ?, ?)",
+                (
+                    (kind, entity.blueprint, str(entity.identifier), generation)
+                    for entity in entities
+                    if not entity.is_using_search_identifier
+                ),
+            )
+
+    def get_stale_keys(self, kind: str, generation: int) -> set[EntityKey]:
+        """
+        Return the keys the kind emitted before the generation but not in it, and that no other kind still emits.
+
+        An entity is still emitted by another kind when it was recorded by the last completed generation of that
+        kind or by a later one, or by any generation of a kind that never completed.
+        """
+        rows = self.connection.execute(
+            "SELECT stale.blueprint, stale.identifier FROM kind_entities AS stale "
+            "WHERE stale.kind = ? AND stale.generation < ? AND NOT EXISTS ("
+            "SELECT 1 FROM kind_entities AS other "
+            "JOIN kind_generations AS other_kind ON other_kind.kind = other.kind "
+            "WHERE other.blueprint = stale.blueprint AND other.identifier = stale.identifier "
+            "AND other.kind != stale.kind AND ("
+            "other_kind.completed_generation IS NULL "
+            "OR other.generation >= other_kind.completed_generation"
+            "))",
+            (kind, generation),
+        )
+        return {(blueprint, identifier) for blueprint, identifier in rows}
+
+    def get_keys(self, kinds: list[str]) -> set[EntityKey]:
+        """Return the keys recorded by the kinds."""
+        keys: set[EntityKey] = set()
+        for start in range(0, len(kinds), LOOKUP_BATCH_SIZE):
+            batch = kinds[start : start + LOOKUP_BATCH_SIZE]
+            placeholders = ", ".join(["?"] * len(batch))
+            keys.update(
+                (blueprint, identifier)
+                for blueprint, identifier in self.connection.execute(
+                    f"SELECT blueprint, identifier FROM kind_entities WHERE kind IN ({placeholders})",
+                    batch,
+                )
+            )
+        return keys
+
+    def complete_kind(self, kind: str) -> None:
+        """Prune the entries of the previous generations of the kind and mark its current generation as completed."""
+        with self.connection as connection:
+            row = connection.execute(
+                "SELECT generation FROM kind_generations WHERE kind = ?", (kind,)
+            ).fetchone()
+            if row is None:
+                return
+            (generation,) = row
+            pruned = connection.execute(
+                "DELETE FROM kind_entities WHERE kind = ? AND generation < ?",
+                (kind, generation),
+            ).rowcount
+            connection.execute(
+                "UPDATE kind_generations SET completed_generation = ? WHERE kind = ?",
+                (generation, kind),
+            )
+        logger.info(
+            f"Kind reconciliation index completed generation {generation} of {kind}, pruned {pruned} entries"
+        )
+
+    def retain_kinds(self, kinds: Iterable[str]) -> None:
+        """Forget the kinds that are not part of the resync anymore."""
+        removed_kinds = self.get_kinds() - set(kinds)
+        if not removed_kinds:
+            return
+
+        with self.connection as connection:
+            for kind in removed_kinds:
+                connection.execute("DELETE FROM kind_entities WHERE kind = ?", (kind,))
+                connection.execute(
+                    "DELETE FROM kind_generations WHERE kind = ?", (kind,)
+                )
+        logger.info(
+            f"Removed {len(removed_kinds)} kinds from the kind reconciliation index"
+        )
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from typing import Any, Callable, Coroutine, TypeVar
+
+from loguru import logger
+
+from port_ocean.core.handlers.port_app_config.models import ResourceConfig
+from port_ocean.core.models import Blueprint
+
+T = TypeVar("T")
+
+
+def get_static_blueprint(resource: ResourceConfig) -> str | None:
+    """
+    Return the blueprint identifier of a resource when its mapping is a JQ string literal (e.g. '"service"'),
+    blueprints computed from the raw data can't be known before the resync.
+    """
+    blueprint = resource.port.entity.mappings.blueprint.strip()
+    if not (
+        len(blueprint) > 1 and blueprint.startswith('"') and blueprint.endswith('"')
+    ):
+        return None
+    try:
+        value = json.loads(blueprint)
+    except ValueError:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def resolve_kinds_dependencies(
+    resources: list[ResourceConfig], blueprints: dict[str, Blueprint]
+) -> dict[int, set[int]]:
+    """
+    Build dependency hints between the resources of the port app config.
+
+    A resource depends on another resource if one of the relations it maps points to the blueprint
+    the other resource creates, so the relation target is ingested before the entities relating to it.
+    Resources of the same blueprint never depend on each other, and resources with a dynamic blueprint have no hints.
+
+    Args:
+        resources: The resources of the port app config, in their configured order
+        blueprints: The blueprints of the resources, by identifier
+
+    Returns:
+        dict[int, set[int]]: The indices of the resources each resource index depends on
+    """
+    resources_blueprints = [get_static_blueprint(resource) for resource in resources]
+    blueprint_to_indices: dict[str, set[int]] = {}
+    for index, resource_blueprint in enumerate(resources_blueprints):
+        if resource_blueprint is not None:
+            blueprint_to_indices.setdefault(resource_blueprint, set()).add(index)
+
+    dependencies: dict[int, set[int]] = {}
+    for index, resource in enumerate(resources):
+        resource_blueprint = resources_blueprints[index]
+        dependencies[index] = set()
+        blueprint = blueprints.get(resource_blueprint) if resource_blueprint else None
+        if blueprint is None:
+            continue
+        for relation_name in resource.port.entity.mappings.relations:
+            relation = blueprint.relations.get(relation_name)
+            if relation is None or relation.target == resource_blueprint:
+                continue
+            dependencies[index] |= blueprint_to_indices.get(relation.target, set())
+
+    return dependencies
+
+
+class KindScheduler:
+    """Runs the resources of a resync with a bounded parallelism.
+
+    Resources are started in their configured order, a resource with dependency hints is only started
+    once all the resources it depends on are done. When the hints contain a cycle, the first pending
+    resource is started regardless of its hints so the resync always makes progress.
+    """
+
+    def __init__(
+        self,
+        resources: list[ResourceConfig],
+        concurrency: int = 1,
+        dependencies: dict[int, set[int]] | None = None,
+    ) -> None:
+        self.resources = resources
+        self.concurrency = max(1, concurrency)
+        self.dependencies = dependencies or {}
+
+    def _next_ready(
+        self, pending: list[int], done: set[int], running: int
+    ) -> int | None:
+        for index in pending:
+            if self.dependencies.get(index, set()) <= done:
+                return index
+
+        if running == 0 and pending:
+            logger.warning(
+                "Kinds dependency hints contain a cycle, starting the next kind regardless of its dependencies",
+                kind_index=pending[0],
+            )
+            return pending[0]
+        return None
+
+    async def run(
+        self, process: Callable[[ResourceConfig, int], Coroutine[Any, Any, T]]
+    ) -> list[T]:
+        """
+        Process every resource and return the results in the configured order of the resources.
+        The first failure cancels the rest of the running resources and is raised.
+        """
+        pending = list(range(len(self.resources)))
+        done: set[int] = set()
+        results: dict[int, T] = {}
+        running: dict[asyncio.Task[T], int] = {}
+
+        try:
+            while pending or running:
+                while len(running) < self.concurrency:
+                    index = self._next_ready(pending, done, len(running))
+                    if index is None:
+                        break
+                    pending.remove(index)
+                    running[
+                        asyncio.create_task(process(self.resources[index], index))
+                    ] = index
+
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    index = running.pop(task)
+                    results[index] = task.result()
+                    done.add(index)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return [results[index] for index in range(len(self.resources))]
@@ -10,7 +10,7 @@ from pydantic import parse_obj_as, ValidationError
 from port_ocean.clients.port.client import PortClient
 from port_ocean.core.models import Entity, Runtime
 from port_ocean.core.models import EntityPortDiff
-from port_ocean.core.ocean_types import RAW_RESULT
+from port_ocean.core.ocean_types import RAW_RESULT, EntityKey
 from port_ocean.exceptions.core import (
     RawObjectValidationException,
     IntegrationRuntimeException,
@@ -18,12 +18,18 @@ from port_ocean.exceptions.core import (
 
 T = TypeVar("T", bound=tuple[list[Any], ...])
 
+# The fields of an entity the resync reconciliation relies on: identifier, blueprint and relations
+CompactEntity = tuple[Any, Any, dict[str, Any]]
+
 
 def zip_and_sum(collection: Iterable[T]) -> T:
     return tuple(sum(items, []) for items in zip(*collection))  # type: ignore
 
 
 def validate_result(result: Any) -> RAW_RESULT:
+    # Pages are almost always a list of dicts already, the validation is only needed to coerce anything else
+    if isinstance(result, list) and all(isinstance(item, dict) for item in result):
+        return result
     try:
         return parse_obj_as(list[dict[str, Any]], result)
     except ValidationError as e:
@@ -37,6 +43,21 @@ def is_same_entity(first_entity: Entity, second_entity: Entity) -> bool:
     )
 
 
+def get_entity_key(entity: Entity) -> EntityKey:
+    return entity.blueprint, entity.identifier
+
+
+def compact_entity(entity: Entity) -> CompactEntity:
+    return entity.identifier, entity.blueprint, entity.relations
+
+
+def expand_compact_entity(compact: CompactEntity) -> Entity:
+    identifier, blueprint, relations = compact
+    return Entity.construct(
+        identifier=identifier, blueprint=blueprint, relations=relations
+    )
+
+
 async def validate_integration_runtime(
     port_client: PortClient,
     requested_runtime: Runtime,
@@ -80,82 +101,50 @@ async def gather_and_split_errors_from_results(
 
 
 def get_port_diff(before: Iterable[Entity], after: Iterable[Entity]) -> EntityPortDiff:
-    before_dict = {}
-    after_dict = {}
-    created = []
-    modified = []
-    deleted = []
-
-    # Create dictionaries for before and after lists
-    for entity in before:
-        key = (entity.identifier, entity.blueprint)
-        before_dict[key] = entity
-
-    for entity in after:
-        key = (entity.identifier, entity.blueprint)
-        after_dict[key] = entity
+    before_dict = {get_entity_key(entity): entity for entity in before}
+    after_dict = {get_entity_key(entity): entity for entity in after}
 
     # Find created, modified, and deleted objects
-    for key, obj in after_dict.items():
-        if key not in before_dict:
-            created.append(obj)
-        else:
-            modified.append(obj)
-
-    for key, obj in before_dict.items():
-        if key not in after_dict:
-            deleted.append(obj)
+    created = [obj for key, obj in after_dict.items() if key not in before_dict]
+    modified = [obj for key, obj in after_dict.items() if key in before_dict]
+    deleted = [obj for key, obj in before_dict.items() if key not in after_dict]
 
     return EntityPortDiff(created=created, modified=modified, deleted=deleted)
 
 
-def are_teams_different(
-    first_team: str | None | list[Any] | dict[str, Any],
-    second_team: str | None | list[Any] | dict[str, Any],
-) -> bool:
-    if isinstance(first_team, list) and isinstance(second_team, list):
-        return sorted(first_team) != sorted(second_team)
-    return first_team != second_team
-
-
-def are_entities_fields_equal(
-    first_entity_field: dict[str, Any], second_entity_field: dict[str, Any]
-) -> bool:
+def get_entity_fingerprint(entity: Entity) -> bytes:
     """
-    Compare two entity fields by serializing them to JSON and comparing their SHA-256 hashes.
-    Removes keys with None values before comparison if the corresponding key doesn't exist in the other dict.
+    Digest of the fields of an entity that are compared with Port: title, team, properties and relations.
 
-    Args:
-        first_entity_field: First entity field dictionary to compare
-        second_entity_field: Second entity field dictionary to compare
-
-    Returns:
-        bool: True if the entity fields have identical content
+    The fields are serialized canonically (sorted keys, sorted team list), so two entities with the same content
+    have the same fingerprint. Null properties and relations are left out on both sides of the comparison, a field
+    that is null is the same as a field that is missing, as upserting either leaves the entity at Port unchanged.
     """
-    first_entity_field_copy = first_entity_field.copy()
-
-    for key in list(first_entity_field.keys()):
-        if first_entity_field[key] is None and key not in second_entity_field:
-            del first_entity_field_copy[key]
-
-    first_props = json.dumps(first_entity_field_copy, sort_keys=True)
-    second_props = json.dumps(second_entity_field, sort_keys=True)
-    first_hash = hashlib.sha256(first_props.encode()).hexdigest()
-    second_hash = hashlib.sha256(second_props.encode()).hexdigest()
-    return first_hash == second_hash
+    team = sorted(entity.team) if isinstance(entity.team, list) else entity.team
+    content = json.dumps(
+        [
+            entity.title,
+            team,
+            {
+                key: value
+                for key, value in entity.properties.items()
+                if value is not None
+            },
+            {
+                key: value
+                for key, value in entity.relations.items()
+                if value is not None
+            },
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(content.encode(), digest_size=16).digest()
 
 
 def are_entities_different(first_entity: Entity, second_entity: Entity) -> bool:
-    if first_entity.title != second_entity.title:
-        return True
-    if are_teams_different(first_entity.team, second_entity.team):
-        return True
-    if not are_entities_fields_equal(first_entity.properties, second_entity.properties):
-        return True
-    if not are_entities_fields_equal(first_entity.relations, second_entity.relations):
-        return True
-
-    return False
+    return get_entity_fingerprint(first_entity) != get_entity_fingerprint(second_entity)
 
 
 def resolve_entities_diff(
@@ -170,24 +159,19 @@ def resolve_entities_diff(
     Returns:
         list[Entity]: Filtered list of source entities, excluding matches found in target
     """
-    target_entities_dict = {}
-    source_entities_dict = {}
+    target_entities_dict = {
+        get_entity_key(entity): entity for entity in target_entities
+    }
     changed_entities = []
 
-    for entity in target_entities:
-        key = (entity.identifier, entity.blueprint)
-        target_entities_dict[key] = entity
-
     for entity in source_entities:
         if entity.is_using_search_identifier or entity.is_using_search_relation:
             return source_entities
-        key = (entity.identifier, entity.blueprint)
-        source_entities_dict[key] = entity
 
-        entity_at_target = target_entities_dict.get(key, None)
+        entity_at_target = target_entities_dict.get(get_entity_key(entity))
         if entity_at_target is None:
             changed_entities.append(entity)
-        elif are_entities_different(entity, target_entities_dict[key]):
+        elif are_entities_different(entity, entity_at_target):
             changed_entities.append(entity)
 
     return changed_entities
@@ -1,3 +1,4 @@
+from port_ocean.exceptions.base import BaseOceanException
 from port_ocean.exceptions.core import OceanAbortException
 
 
@@ -7,3 +8,7 @@ class SignalHandlerNotInitialized(OceanAbortException):
 
 class SignalHandlerAlreadyInitialized(OceanAbortException):
     pass
+
+
+class WorkerTaskFailedException(BaseOceanException):
+    pass
@@ -50,6 +50,15 @@ class MetricType:
     OBJECT_COUNT_NAME = "object_count"
     SUCCESS_NAME = "success"
     RATE_LIMIT_WAIT_NAME = "rate_limit_wait_seconds"
+    PORT_HTTP_POOL_WAIT_NAME = "port_http_pool_wait_seconds"
+    PORT_HTTP_REQUESTS_NAME = "port_http_requests"
+    PORT_HTTP_POOL_CONNECTIONS_NAME = "port_http_pool_connections"
+    CACHE_HITS_NAME = "cache_hits"
+    CACHE_MISSES_NAME = "cache_misses"
+    CACHE_EVICTIONS_NAME = "cache_evictions"
+    CACHE_SIZE_NAME = "cache_size_bytes"
+    CACHE_FUNCTION_HITS_NAME = "cache_function_hits"
+    CACHE_FUNCTION_MISSES_NAME = "cache_function_misses"
 
 
 class SyncState:
@@ -87,6 +96,51 @@ _metrics_registry: Dict[str, Tuple[str, str, List[str]]] = {
         "rate_limit_wait description",
         ["kind", "phase", "endpoint"],
     ),
+    MetricType.PORT_HTTP_POOL_WAIT_NAME: (
+        MetricType.PORT_HTTP_POOL_WAIT_NAME,
+        "Time the requests to Port waited for a connection of the pool",
+        ["kind"],
+    ),
+    MetricType.PORT_HTTP_REQUESTS_NAME: (
+        MetricType.PORT_HTTP_REQUESTS_NAME,
+        "Number of requests sent to Port",
+        ["kind"],
+    ),
+    MetricType.PORT_HTTP_POOL_CONNECTIONS_NAME: (
+        MetricType.PORT_HTTP_POOL_CONNECTIONS_NAME,
+        "Number of connections of the Port client pool, by state (active or idle)",
+        ["state"],
+    ),
+    MetricType.CACHE_HITS_NAME: (
+        MetricType.CACHE_HITS_NAME,
+        "Number of cache lookups that found a valid entry",
+        ["storage"],
+    ),
+    MetricType.CACHE_MISSES_NAME: (
+        MetricType.CACHE_MISSES_NAME,
+        "Number of cache lookups that found no entry or an expired one",
+        ["storage"],
+    ),
+    MetricType.CACHE_EVICTIONS_NAME: (
+        MetricType.CACHE_EVICTIONS_NAME,
+        "Number of cache entries evicted, by reason (expired or size)",
+        ["storage", "reason"],
+    ),
+    MetricType.CACHE_SIZE_NAME: (
+        MetricType.CACHE_SIZE_NAME,
+        "Approximate size of the cached values",
+        ["storage"],
+    ),
+    MetricType.CACHE_FUNCTION_HITS_NAME: (
+        MetricType.CACHE_FUNCTION_HITS_NAME,
+        "Number of calls of a cached function answered from the cache or by a call in flight",
+        ["function"],
+    ),
+    MetricType.CACHE_FUNCTION_MISSES_NAME: (
+        MetricType.CACHE_FUNCTION_MISSES_NAME,
+        "Number of calls of a cached function that executed it",
+        ["function"],
+    ),
 }
 
 
@@ -132,7 +186,8 @@ class Metrics:
         self._integration_version: Optional[str] = None
         self._ocean_version: Optional[str] = None
         self._event_id = ""
-        self.sync_state = SyncState.PENDING
+        # Kinds are synced concurrently, so each of them keeps its own state
+        self._sync_states: dict[str, str] = {}
 
     @property
     def event_id(self) -> str:
@@ -144,11 +199,15 @@ class Metrics:
 
     @property
     def sync_state(self) -> str:
-        return self._sync_state
+        """The sync state of the resource kind of the current context."""
+        return self.get_sync_state(self.current_resource_kind())
 
     @sync_state.setter
     def sync_state(self, value: str) -> None:
-        self._sync_state = value
+        self._sync_states[self.current_resource_kind()] = value
+
+    def get_sync_state(self, kind: str) -> str:
+        return self._sync_states.get(kind, SyncState.PENDING)
 
     @property
     def integration_version(self) -> str:
@@ -220,6 +279,7 @@ class Metrics:
         if self.multiprocessing_enabled:
             self.cleanup_prometheus_metrics()
         for kind in kind_blockes:
+            self._sync_states[kind] = SyncState.PENDING
             self.set_metric(MetricType.SUCCESS_NAME, [kind, MetricPhase.RESYNC], 0)
             self.set_metric(MetricType.DURATION_NAME, [kind, MetricPhase.RESYNC], 0)
 
@@ -391,7 +451,7 @@ class Metrics:
                     ),
                     "kindIndex": int(kind_key[-1]) if kind_key[-1].isdigit() else 0,
                     "eventId": self.event_id,
-                    "syncState": self.sync_state,
+                    "syncState": self.get_sync_state(kind_key),
                     "blueprint": blueprint if blueprint else "",
                     "metrics": metrics,
                 }
@@ -22,12 +22,15 @@ from port_ocean.context.ocean import (
     initialize_port_ocean_context,
     ocean,
 )
+from port_ocean.core.handlers.entity_processor.jq_process_pool import (
+    shutdown_process_pool,
+)
 from port_ocean.core.handlers.resync_state_updater import ResyncStateUpdater
 from port_ocean.core.handlers.webhook.processor_manager import (
     LiveEventsProcessorManager,
 )
 from port_ocean.core.integrations.base import BaseIntegration
-from port_ocean.core.models import ProcessExecutionMode
+from port_ocean.core.models import CachingStorageMode, ProcessExecutionMode
 from port_ocean.log.sensetive import sensitive_log_filter
 from port_ocean.middlewares import request_handler
 from port_ocean.utils.misc import IntegrationStateStatus
@@ -68,6 +71,7 @@ class Ocean:
             integration_type=self.config.integration.type,
             integration_version=__integration_version__,
             ingest_url=self.config.port.ingest_url,
+            http_settings=self.config.port.http,
         )
         self.cache_provider: CacheProvider = self._get_caching_provider()
         self.process_execution_mode: ProcessExecutionMode = (
@@ -98,6 +102,7 @@ class Ocean:
         self.app_initialized = False
 
         signal_handler.register(self._report_resync_aborted)
+        signal_handler.register(shutdown_process_pool)
 
     async def _report_resync_aborted(self) -> None:
         """
@@ -118,18 +123,32 @@ class Ocean:
             return self.config.process_execution_mode
         return ProcessExecutionMode.single_process
 
+    def _create_memory_caching_provider(self) -> CacheProvider:
+        return InMemoryCacheProvider(
+            max_size_in_bytes=self.config.caching.memory_max_size_in_bytes,
+            default_ttl=self.config.caching.ttl_seconds,
+        )
+
+    def _create_disk_caching_provider(self) -> CacheProvider:
+        return DiskCacheProvider(
+            max_size_in_bytes=self.config.caching.disk_max_size_in_bytes,
+            default_ttl=self.config.caching.ttl_seconds,
+        )
+
     def _get_caching_provider(self) -> CacheProvider:
         if self.config.caching_storage_mode:
-            caching_type_to_provider = {
-                DiskCacheProvider.STORAGE_TYPE: DiskCacheProvider,
-                InMemoryCacheProvider.STORAGE_TYPE: InMemoryCacheProvider,
+            caching_type_to_provider: dict[
+                CachingStorageMode, Callable[[], CacheProvider]
+            ] = {
+                DiskCacheProvider.STORAGE_TYPE: self._create_disk_caching_provider,
+                InMemoryCacheProvider.STORAGE_TYPE: self._create_memory_caching_provider,
             }
             if self.config.caching_storage_mode in caching_type_to_provider:
                 return caching_type_to_provider[self.config.caching_storage_mode]()
 
         if self.config.process_execution_mode == ProcessExecutionMode.multi_process:
-            return DiskCacheProvider()
-        return InMemoryCacheProvider()
+            return self._create_disk_caching_provider()
+        return self._create_memory_caching_provider()
 
     def is_saas(self) -> bool:
         return self.config.runtime.is_saas_runtime
@@ -209,6 +228,7 @@ class Ocean:
         @asynccontextmanager
         async def lifecycle(_: FastAPI) -> AsyncIterator[None]:
             try:
+                await self.port_client.prewarm_connections()
                 await self.integration.start()
                 if self.base_url:
                     await self.webhook_manager.start_processing_event_messages()
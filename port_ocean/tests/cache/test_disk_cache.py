@@ -1,7 +1,10 @@
 import os
+import pickle
 import pytest
 from pathlib import Path
+from types import SimpleNamespace
 
+from port_ocean.cache import disk
 from port_ocean.cache.disk import (
     DiskCacheProvider,
     FailedToReadCacheFileError,
@@ -90,3 +93,63 @@ async def test_disk_cache_write_error(
 
     # Restore permissions
     os.chmod(tmp_path, 0o755)
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_ttl(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that values expire after their ttl, or the default ttl of the cache."""
+    now = 1000.0
+    monkeypatch.setattr(disk, "time", SimpleNamespace(time=lambda: now))
+    disk_cache = DiskCacheProvider(cache_dir=str(tmp_path), default_ttl=60)
+
+    await disk_cache.set("default_ttl", "value")
+    await disk_cache.set("short_ttl", "value", ttl=10)
+
+    now += 30
+    assert await disk_cache.get("short_ttl") is None
+    assert not (tmp_path / "short_ttl.pkl").exists()
+    assert await disk_cache.get("default_ttl") == "value"
+
+    now += 30
+    assert await disk_cache.get("default_ttl") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that the least recently read files are deleted beyond the size limit."""
+    value = "x" * 1000
+    await DiskCacheProvider(cache_dir=str(tmp_path)).set("probe", value)
+    file_size = (tmp_path / "probe.pkl").stat().st_size
+    (tmp_path / "probe.pkl").unlink()
+
+    disk_cache = DiskCacheProvider(
+        cache_dir=str(tmp_path), max_size_in_bytes=file_size * 2
+    )
+    await disk_cache.set("first", value)
+    await disk_cache.set("second", value)
+    # Reading the first value makes the second one the least recently used
+    os.utime(tmp_path / "first.pkl", (0, 0))
+    os.utime(tmp_path / "second.pkl", (0, 0))
+    assert await disk_cache.get("first") == value
+    await disk_cache.set("third", value)
+
+    assert await disk_cache.get("second") is None
+    assert await disk_cache.get("first") == value
+    assert await disk_cache.get("third") == value
+
+    # A value larger than the whole cache is not cached and evicts nothing
+    await disk_cache.set("large", "x" * 10_000)
+    assert await disk_cache.get("large") is None
+    assert await disk_cache.get("first") == value
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_reads_files_without_header(
+    disk_cache: DiskCacheProvider, tmp_path: Path
+) -> None:
+    """Test that the files written before the header was added are still read."""
+    with open(tmp_path / "test_key.pkl", "wb") as f:
+        pickle.dump({"a": 1}, f)
+
+    assert await disk_cache.get("test_key") == {"a": 1}
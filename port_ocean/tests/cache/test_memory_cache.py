@@ -1,7 +1,11 @@
+from types import SimpleNamespace
+
 import pytest
 
+from port_ocean.cache import memory
 from port_ocean.cache.memory import (
     InMemoryCacheProvider,
+    get_approximate_size,
 )
 
 
@@ -57,3 +61,45 @@ async def test_memory_cache_nonexistent_key(
 ) -> None:
     """Test getting a nonexistent key from memory cache."""
     assert await memory_cache.get("nonexistent_key") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used() -> None:
+    """Test that the least recently used entries are evicted beyond the size limit."""
+    value_size = get_approximate_size("x" * 1000)
+    memory_cache = InMemoryCacheProvider(max_size_in_bytes=value_size * 2)
+
+    await memory_cache.set("first", "x" * 1000)
+    await memory_cache.set("second", "y" * 1000)
+    # Reading the first entry makes the second one the least recently used
+    assert await memory_cache.get("first") == "x" * 1000
+    await memory_cache.set("third", "z" * 1000)
+
+    assert await memory_cache.get("second") is None
+    assert await memory_cache.get("first") == "x" * 1000
+    assert await memory_cache.get("third") == "z" * 1000
+    assert memory_cache.size_in_bytes == value_size * 2
+
+    # A value larger than the whole cache is not cached and evicts nothing
+    await memory_cache.set("large", "x" * 10_000)
+    assert await memory_cache.get("large") is None
+    assert await memory_cache.get("first") == "x" * 1000
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that entries expire after their ttl, or the default ttl of the cache."""
+    now = 1000.0
+    monkeypatch.setattr(memory, "time", SimpleNamespace(monotonic=lambda: now))
+    memory_cache = InMemoryCacheProvider(default_ttl=60)
+
+    await memory_cache.set("default_ttl", "value")
+    await memory_cache.set("short_ttl", "value", ttl=10)
+
+    now += 30
+    assert await memory_cache.get("short_ttl") is None
+    assert await memory_cache.get("default_ttl") == "value"
+
+    now += 30
+    assert await memory_cache.get("default_ttl") is None
+    assert memory_cache.size_in_bytes == 0
@@ -1,10 +1,16 @@
+import json
 from typing import Any, Generator, List
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import ReadTimeout
 
-from port_ocean.clients.port.mixins.entities import EntityClientMixin
+from port_ocean.clients.port.mixins.entities import (
+    ENTITIES_BULK_BODY_PREFIX,
+    ENTITIES_BULK_BODY_SEPARATOR,
+    ENTITIES_BULK_BODY_SUFFIX,
+    EntityClientMixin,
+)
 from port_ocean.core.models import Entity
 
 # Mock the ocean context at module level
@@ -61,75 +67,6 @@ async def entity_client(monkeypatch: Any) -> EntityClientMixin:
     return entity_client
 
 
-def test_calculate_entities_batch_size_empty_list(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that empty list returns batch size of 1"""
-    assert entity_client.calculate_entities_batch_size([]) == 1
-
-
-def test_calculate_entities_batch_size_small_entities(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that small entities return max batch size"""
-    small_entities = [
-        Entity(identifier=f"small_{i}", blueprint="test", properties={"small": "value"})
-        for i in range(30)
-    ]
-    # Small entities should allow max batch size
-    assert entity_client.calculate_entities_batch_size(small_entities) == 20
-
-
-def test_calculate_entities_batch_size_large_entities(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that large entities reduce batch size"""
-    large_entities = [
-        Entity(
-            identifier=f"large_{i}",
-            blueprint="test",
-            properties={"large": "x" * (100 * 1024)},  # 100KB per entity
-        )
-        for i in range(30)
-    ]
-    # With 1MB limit and 100KB per entity (plus overhead), should get ~9 entities per batch
-    batch_size = entity_client.calculate_entities_batch_size(large_entities)
-    assert 5 <= batch_size <= 15
-
-
-def test_calculate_entities_batch_size_mixed_entities(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that mixed size entities calculate correct batch size"""
-    mixed_entities = [
-        Entity(identifier=f"small_{i}", blueprint="test", properties={"small": "value"})
-        for i in range(10)
-    ] + [
-        Entity(
-            identifier=f"large_{i}",
-            blueprint="test",
-            properties={"large": "x" * (50 * 1024)},  # 50KB per entity
-        )
-        for i in range(10)
-    ]
-    # With 1MB limit and mixed sizes, should get a reasonable batch size
-    batch_size = entity_client.calculate_entities_batch_size(mixed_entities)
-    assert 15 <= batch_size <= 20
-
-
-def test_calculate_entities_batch_size_single_large_entity(
-    entity_client: EntityClientMixin,
-) -> None:
-    """Test that single very large entity returns batch size of 1"""
-    large_entity = Entity(
-        identifier="huge",
-        blueprint="test",
-        properties={"huge": "x" * (2 * 1024 * 1024)},  # 2MB entity
-    )
-    # Even though entity is larger than limit, we return 1 to ensure at least one entity is processed
-    assert entity_client.calculate_entities_batch_size([large_entity]) == 1
-
-
 async def test_batch_upsert_entities_read_timeout_should_raise_false(
     entity_client: EntityClientMixin,
 ) -> None:
@@ -212,4 +149,201 @@ async def test_search_entities_uses_datasource_route_when_query_is_none(
         "datasource_prefix": "port-ocean/test-integration/",
         "datasource_suffix": "/test-identifier/sync",
     }
-    assert call_args[1]["json"] == expected_json
+    assert json.loads(call_args[1]["content"]) == expected_json
+
+
+async def test_batch_delete_entities_deletes_in_bulk_per_blueprint(
+    entity_client: EntityClientMixin,
+) -> None:
+    """Test that entities are deleted with a bulk request per blueprint and only the failures are deleted one by one"""
+
+    async def mock_bulk_delete(
+        method: str, url: str, content: bytes, **kwargs: Any
+    ) -> MagicMock:
+        response = MagicMock()
+        response.is_error = False
+        response.status_code = 200
+        # The first entity of every request is left undeleted
+        response.json.return_value = {
+            "ok": True,
+            "deletedEntities": json.loads(content)["entities"][1:],
+        }
+        return response
+
+    entity_client.client.request = AsyncMock(side_effect=mock_bulk_delete)  # type: ignore
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    entity_client.auth.api_url = "https://api.getport.io/v1"
+    delete_entity_mock = AsyncMock()
+    entity_client.delete_entity = delete_entity_mock  # type: ignore
+
+    entities = [
+        Entity(identifier=f"entity_{i}", blueprint=f"blueprint_{i % 2}")
+        for i in range(6)
+    ]
+    await entity_client.batch_delete_entities(
+        entities, {"delete_dependent_entities": False}  # type: ignore
+    )
+
+    assert entity_client.client.request.call_count == 2
+    requested = {
+        call.args[1]: json.loads(call.kwargs["content"])["entities"]
+        for call in entity_client.client.request.call_args_list
+    }
+    assert requested == {
+        "https://api.getport.io/v1/blueprints/blueprint_0/bulk/entities": [
+            "entity_0",
+            "entity_2",
+            "entity_4",
+        ],
+        "https://api.getport.io/v1/blueprints/blueprint_1/bulk/entities": [
+            "entity_1",
+            "entity_3",
+            "entity_5",
+        ],
+    }
+    assert sorted(
+        call.args[0].identifier for call in delete_entity_mock.call_args_list
+    ) == ["entity_0", "entity_1"]
+
+
+async def test_batch_delete_entities_falls_back_to_single_deletes_on_failed_bulk(
+    entity_client: EntityClientMixin,
+) -> None:
+    """Test that every entity of a failed bulk delete request is deleted one by one"""
+    response = MagicMock()
+    response.is_error = True
+    response.status_code = 500
+    entity_client.client.request = AsyncMock(return_value=response)  # type: ignore
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+    delete_entity_mock = AsyncMock()
+    entity_client.delete_entity = delete_entity_mock  # type: ignore
+
+    entities = [
+        Entity(identifier=f"entity_{i}", blueprint="blueprint") for i in range(3)
+    ]
+    await entity_client.batch_delete_entities(
+        entities, {"delete_dependent_entities": True}  # type: ignore
+    )
+
+    entity_client.client.request.assert_called_once()
+    assert [call.args[0] for call in delete_entity_mock.call_args_list] == entities
+
+
+async def test_search_entity_keys_paginates_datasource_entities(
+    entity_client: EntityClientMixin,
+) -> None:
+    """Test that search_entity_keys follows the pagination cursor and only keeps the entity keys"""
+    pages = [
+        {
+            "entities": [
+                {"identifier": "a", "blueprint": "service", "properties": {}},
+                {"identifier": "b", "blueprint": "service", "properties": {}},
+            ],
+            "next": "cursor",
+        },
+        {"entities": [{"identifier": "a", "blueprint": "team", "properties": {}}]},
+    ]
+    responses = []
+    for page in pages:
+        response = MagicMock()
+        response.json.return_value = page
+        response.is_error = False
+        response.status_code = 200
+        responses.append(response)
+    entity_client.client.post = AsyncMock(side_effect=responses)  # type: ignore
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+
+    mock_user_agent_type = MagicMock()
+    mock_user_agent_type.value = "sync"
+
+    entity_keys = await entity_client.search_entity_keys(mock_user_agent_type)
+
+    assert entity_keys == {("service", "a"), ("service", "b"), ("team", "a")}
+    assert entity_client.client.post.call_count == 2
+    first_call, second_call = entity_client.client.post.call_args_list
+    assert "from" not in first_call.kwargs["params"]
+    assert second_call.kwargs["params"]["from"] == "cursor"
+
+
+def test_pack_entities_in_bulks_by_serialized_size(
+    entity_client: EntityClientMixin,
+) -> None:
+    """Test that bulks are packed up to the size limit, even when large entities come late in the stream"""
+    small_entities = [
+        Entity(identifier=f"small_{i}", blueprint="test", properties={"small": "value"})
+        for i in range(10)
+    ]
+    large_entities = [
+        Entity(
+            identifier=f"large_{i}",
+            blueprint="test",
+            properties={"large": "x" * (600 * 1024)},  # 600KB per entity
+        )
+        for i in range(2)
+    ]
+    entities = small_entities[:5] + large_entities[:1] + small_entities[5:]
+    entities += large_entities[1:]
+
+    bulks = entity_client._pack_entities_in_bulks(entities)
+
+    assert [len(bulk) for bulk, _ in bulks] == [11, 1]
+    assert [entity for bulk, _ in bulks for entity in bulk] == entities
+    for bulk, serialized_bulk in bulks:
+        assert [json.loads(serialized) for serialized in serialized_bulk] == [
+            entity.dict(exclude_unset=True, by_alias=True) for entity in bulk
+        ]
+        body_size = (
+            len(ENTITIES_BULK_BODY_PREFIX)
+            + len(ENTITIES_BULK_BODY_SEPARATOR.join(serialized_bulk))
+            + len(ENTITIES_BULK_BODY_SUFFIX)
+        )
+        assert body_size <= 1024 * 1024
+
+
+def test_pack_entities_in_bulks_by_length(
+    entity_client: EntityClientMixin,
+) -> None:
+    """Test that bulks don't exceed the maximum number of entities"""
+    entities = [Entity(identifier=f"entity_{i}", blueprint="test") for i in range(45)]
+
+    bulks = entity_client._pack_entities_in_bulks(entities)
+
+    assert [len(bulk) for bulk, _ in bulks] == [20, 20, 5]
+
+
+async def test_upsert_entities_bulk_sends_serialized_entities(
+    mock_ocean: MagicMock,
+) -> None:
+    """Test that the serialized entities are reused as the body of the bulk request"""
+    entity_client = EntityClientMixin(auth=MagicMock(), client=MagicMock())
+    entities = [Entity(identifier=f"entity_{i}", blueprint="test") for i in range(2)]
+    serialized_entities = [b'{"identifier":"entity_0"}', b'{"identifier":"entity_1"}']
+    response = MagicMock()
+    response.is_error = False
+    response.status_code = 200
+    response.json.return_value = {
+        "entities": [
+            {"identifier": entity.identifier, "index": index}
+            for index, entity in enumerate(entities)
+        ]
+    }
+    entity_client.client.post = AsyncMock(return_value=response)  # type: ignore
+    entity_client.auth.headers = AsyncMock(return_value={})  # type: ignore
+
+    await entity_client.upsert_entities_bulk(
+        "test",
+        entities,
+        {
+            "merge": True,
+            "create_missing_related_entities": True,
+            "delete_dependent_entities": False,
+            "validation_only": False,
+        },
+        serialized_entities=serialized_entities,
+    )
+
+    call_kwargs = entity_client.client.post.call_args.kwargs
+    assert call_kwargs["content"] == (
+        b'{"entities":[{"identifier":"entity_0"},{"identifier":"entity_1"}]}'
+    )
+    assert call_kwargs["headers"]["Content-Type"] == "application/json"
@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from port_ocean.clients.port.utils import PortHttpPoolMonitor, _create_http_client
+from port_ocean.config.settings import PortHttpSettings
+from port_ocean.helpers.metric.metric import MetricType
+
+
+async def test_create_http_client_applies_pool_settings() -> None:
+    settings = PortHttpSettings(max_connections=7, max_keepalive_connections=3)
+
+    with patch("port_ocean.clients.port.utils.find_spec", return_value=None):
+        client = _create_http_client(MagicMock(), settings.copy(update={"http2": True}))
+
+    pool = PortHttpPoolMonitor(client)._get_connection_pool()
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    # Falls back to HTTP/1.1 when the h2 package is not installed
+    assert not pool._http2
+    await client.aclose()
+
+
+async def test_pool_monitor_records_the_first_connection_wait_of_a_request() -> None:
+    client = _create_http_client(MagicMock(), PortHttpSettings())
+    request = client.build_request("GET", "https://api.getport.io/v1/blueprints")
+    mock_ocean = MagicMock(initialized=True)
+    mock_ocean.metrics.current_resource_kind.return_value = "kind"
+
+    with patch("port_ocean.clients.port.utils.ocean", mock_ocean):
+        for hook in client.event_hooks["request"]:
+            await hook(request)
+        trace = request.extensions["trace"]
+        await trace("connection.connect_tcp.started", {})
+        await trace("http11.send_request_headers.started", {})
+
+    wait_calls = [
+        call
+        for call in mock_ocean.metrics.inc_metric.call_args_list
+        if call.args[0] == MetricType.PORT_HTTP_POOL_WAIT_NAME
+    ]
+    assert len(wait_calls) == 1
+    assert wait_calls[0].args[2] >= 0
+    mock_ocean.metrics.set_metric.assert_any_call(
+        MetricType.PORT_HTTP_POOL_CONNECTIONS_NAME, ["idle"], 0
+    )
+    await client.aclose()
+
+
+async def test_pool_monitor_skips_connections_when_the_pool_is_not_found() -> None:
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+    monitor = PortHttpPoolMonitor(client)
+    mock_ocean = MagicMock(initialized=True)
+
+    with patch("port_ocean.clients.port.utils.ocean", mock_ocean):
+        monitor._record(0.1)
+
+    assert monitor._get_connection_pool() is None
+    mock_ocean.metrics.inc_metric.assert_any_call(
+        MetricType.PORT_HTTP_POOL_WAIT_NAME,
+        [mock_ocean.metrics.current_resource_kind.return_value],
+        0.1,
+    )
+    mock_ocean.metrics.set_metric.assert_not_called()
+    await client.aclose()
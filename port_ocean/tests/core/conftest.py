@@ -1,3 +1,4 @@
+import json
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -29,6 +30,13 @@ from port_ocean.helpers.metric.metric import Metrics
 from port_ocean.ocean import Ocean
 
 
+def get_request_json(request_kwargs: dict[str, Any]) -> Any:
+    """The JSON body of a mocked request, sent either as json or as pre-serialized content."""
+    if "content" in request_kwargs:
+        return json.loads(request_kwargs["content"])
+    return request_kwargs.get("json", {})
+
+
 @pytest.fixture
 def mock_http_client() -> MagicMock:
     mock_http_client = MagicMock()
@@ -38,7 +46,7 @@ def mock_http_client() -> MagicMock:
         if "/bulk" in url:
             success_entities = []
             failed_entities = []
-            entities_body = kwargs.get("json", {})
+            entities_body = get_request_json(kwargs)
             entities = entities_body.get("entities", [])
             for index, entity in enumerate(entities):
                 if entity.get("properties", {}).get("mock_is_to_fail", False):
@@ -70,7 +78,7 @@ def mock_http_client() -> MagicMock:
                 json={"entities": success_entities, "errors": failed_entities},
             )
         else:
-            entity = kwargs.get("json", {})
+            entity = get_request_json(kwargs)
             if entity.get("properties", {}).get("mock_is_to_fail", False):
                 return Response(
                     404, headers=MagicMock(), json={"ok": False, "error": "not_found"}
@@ -113,6 +121,7 @@ def mock_port_client(mock_http_client: MagicMock) -> PortClient:
     )
 
     mock_port_client.search_entities = AsyncMock(return_value=[])  # type: ignore
+    mock_port_client.search_entity_keys = AsyncMock(return_value=set())  # type: ignore
     mock_port_client.get_organization_feature_flags = AsyncMock(return_value=[])  # type: ignore
     mock_port_client.client = mock_http_client
     return mock_port_client
@@ -127,6 +136,11 @@ def mock_ocean(mock_port_client: PortClient) -> Ocean:
         ocean_mock.config = MagicMock()
         ocean_mock.config.port = MagicMock()
         ocean_mock.config.port.port_app_config_cache_ttl = 60
+        ocean_mock.config.resync_kinds_concurrency = 1
+        ocean_mock.config.parse_items_chunk_size = 1000
+        ocean_mock.config.resync_pipeline_queue_size = 2
+        ocean_mock.config.entity_state_index_enabled = False
+        ocean_mock.config.incremental_reconciliation_enabled = False
         ocean_mock.port_client = mock_port_client
         ocean_mock.process_execution_mode = ProcessExecutionMode.single_process
         ocean_mock.cache_provider = InMemoryCacheProvider()
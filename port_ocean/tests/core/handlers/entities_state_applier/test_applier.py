@@ -119,6 +119,126 @@ async def test_delete_diff_custom_threshold_0_not_deleted(
     mock_safe_delete.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_delete_diff_by_keys_below_threshold(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    entity_keys_before = {("test", "1"), ("test", "2"), ("test", "3")}
+    entities_after = [
+        Entity(identifier="1", blueprint="test"),
+        Entity(identifier="2", blueprint="test"),
+    ]
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch.object(applier, "_safe_delete") as mock_safe_delete:
+            await applier.delete_diff_by_keys(
+                entity_keys_before,
+                entities_after,
+                UserAgentType.exporter,
+                entity_deletion_threshold=0.9,
+            )
+
+    mock_safe_delete.assert_called_once()
+    assert mock_safe_delete.call_args[0][0] == [
+        Entity(identifier="3", blueprint="test")
+    ]
+    assert mock_safe_delete.call_args[0][1] == entities_after
+
+
+@pytest.mark.asyncio
+async def test_delete_diff_by_keys_fetches_relations_to_order_deletion(
+    mock_ocean: Ocean,
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    port_entity = Entity(identifier="2", blueprint="test", relations={"rel": "3"})
+    mock_search_batch_entities = AsyncMock(return_value=[port_entity])
+    setattr(mock_ocean.port_client, "search_batch_entities", mock_search_batch_entities)
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config.copy(
+            update={"delete_dependent_entities": False}
+        )
+        with patch.object(applier, "_safe_delete") as mock_safe_delete:
+            await applier.delete_diff_by_keys(
+                {("test", "1"), ("test", "2")},
+                [Entity(identifier="1", blueprint="test")],
+                UserAgentType.exporter,
+                entity_deletion_threshold=0.9,
+            )
+
+    mock_search_batch_entities.assert_called_once()
+    assert mock_search_batch_entities.call_args[0][1] == [
+        Entity(identifier="2", blueprint="test")
+    ]
+    assert (
+        "relations" in mock_search_batch_entities.call_args[1]["parameters_to_include"]
+    )
+    assert mock_safe_delete.call_args[0][0] == [port_entity]
+
+
+@pytest.mark.asyncio
+async def test_delete_diff_by_keys_above_threshold_not_deleted(
+    mock_context: PortOceanContext,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+
+    with patch.object(applier, "_safe_delete") as mock_safe_delete:
+        await applier.delete_diff_by_keys(
+            {("test", "1"), ("test", "2")},
+            [],
+            UserAgentType.exporter,
+            entity_deletion_threshold=0.9,
+        )
+
+    mock_safe_delete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_safe_delete_skips_protected_and_related_entities(
+    mock_context: PortOceanContext,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    applier = HttpEntitiesStateApplier(mock_context)
+    entities_to_delete = [
+        Entity(identifier="protected", blueprint="service"),
+        Entity(identifier="related", blueprint="team"),
+        Entity(identifier="protected", blueprint="team"),
+        Entity(identifier="related", blueprint="service"),
+    ]
+    entities_to_protect = [
+        Entity(identifier="protected", blueprint="service"),
+        Entity(identifier={"combinator": "and", "rules": []}, blueprint="service"),
+    ]
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config.copy(
+            update={"create_missing_related_entities": True}
+        )
+        with (
+            patch(
+                "port_ocean.core.handlers.entities_state_applier.port.applier.get_related_entities",
+                AsyncMock(
+                    return_value=[Entity(identifier="related", blueprint="team")]
+                ),
+            ),
+            patch.object(applier, "delete") as mock_delete,
+        ):
+            await applier._safe_delete(
+                entities_to_delete, entities_to_protect, UserAgentType.exporter
+            )
+
+    mock_delete.assert_called_once()
+    assert mock_delete.call_args[0][0] == [
+        Entity(identifier="protected", blueprint="team"),
+        Entity(identifier="related", blueprint="service"),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_applier_with_mock_context(
     mock_ocean: Ocean,
@@ -8,6 +8,11 @@ from port_ocean.context.ocean import PortOceanContext
 from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
     JQEntityProcessor,
 )
+from port_ocean.core.handlers.entity_processor.jq_process_pool import (
+    PROCESS_POOL_CHUNK_SIZE,
+    shutdown_process_pool,
+)
+from port_ocean.core.models import JQTransformBackend
 from port_ocean.core.ocean_types import CalculationResult
 from port_ocean.exceptions.core import EntityProcessorException
 from unittest.mock import patch
@@ -83,6 +88,26 @@ class TestJQEntityProcessor:
         assert result.entity_selector_diff.passed[0].properties.get("foo") == "bar"
         assert not result.errors
 
+    async def test_parse_items_validates_mapped_entities(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id",
+            "blueprint": '"service"',
+            "team": ".team",
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = "true"
+        raw_results = [{"id": 1, "team": 5}]
+        result = await mocked_processor._parse_items(mapping, raw_results)
+        entity = result.entity_selector_diff.passed[0]
+        assert entity.identifier == 1
+        assert entity.team == "5"
+        assert not entity.is_using_search_identifier
+        assert not entity.is_using_search_relation
+        assert not result.errors
+
     async def test_in_operator(self, mocked_processor: JQEntityProcessor) -> None:
         data = {
             "key": "GetPort_SelfService",
@@ -357,3 +382,187 @@ class TestJQEntityProcessor:
             "{'blueprint': '.bar', 'identifier': '.foo'} (null, missing, or misconfigured)"
             in logs_captured
         )
+
+    async def test_parse_items_batch_evaluation_matches_field_by_field(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id | tostring",
+            "title": ".name # the title",
+            "blueprint": '"service"',
+            "properties": {
+                "url": ".links[] | .url",
+                "missing": ".missing",
+                "invalid": ".name.first",
+            },
+            "relations": {"owner": ".owners | first"},
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".enabled"
+        raw_results = [
+            {
+                "id": index,
+                "name": f"service-{index}",
+                "enabled": index % 2 == 0,
+                "links": [{"url": f"https://{index}"}, {"url": "ignored"}],
+                "owners": ["team-a"],
+            }
+            for index in range(4)
+        ]
+
+        mocked_processor.context.config.jq_batch_evaluation = True
+        batch_result = await mocked_processor._parse_items(
+            mapping, raw_results, parse_all=True
+        )
+        mocked_processor.context.config.jq_batch_evaluation = False
+        field_by_field_result = await mocked_processor._parse_items(
+            mapping, raw_results, parse_all=True
+        )
+
+        assert batch_result == field_by_field_result
+        assert [
+            entity.identifier for entity in batch_result.entity_selector_diff.passed
+        ] == ["0", "2"]
+        assert batch_result.entity_selector_diff.passed[0].properties == {
+            "url": "https://0",
+            "missing": None,
+            "invalid": None,
+        }
+        assert batch_result.misconfigured_entity_keys == {
+            "missing": ".missing",
+            "invalid": ".name.first",
+        }
+
+    async def test_parse_items_batch_evaluation_selector_errors(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id",
+            "blueprint": '"service"',
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".enabled"
+        raw_results: list[dict[str, Any]] = [
+            {"id": "valid", "enabled": True},
+            {"id": "not-a-boolean", "enabled": "yes"},
+        ]
+
+        mocked_processor.context.config.jq_batch_evaluation = True
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        assert [entity.identifier for entity in result.entity_selector_diff.passed] == [
+            "valid"
+        ]
+        assert len(result.errors) == 1
+        assert isinstance(result.errors[0], EntityProcessorException)
+
+    async def test_parse_items_batch_evaluation_items_to_parse(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".item.id",
+            "blueprint": '"file"',
+            "properties": {"repository": ".repository"},
+        }
+        mapping.port.items_to_parse = ".files"
+        mapping.port.items_to_parse_name = "item"
+        mapping.selector.query = "true"
+        raw_results: list[dict[str, Any]] = [
+            {"repository": "ocean", "files": [{"id": "a"}, {"id": "b"}]},
+            {"repository": "port", "files": "not-a-list"},
+        ]
+
+        mocked_processor.context.config.jq_batch_evaluation = True
+        mocked_processor.context.config.yield_items_to_parse = False
+        result = await mocked_processor._parse_items(mapping, raw_results)
+
+        assert [
+            (entity.identifier, entity.properties["repository"])
+            for entity in result.entity_selector_diff.passed
+        ] == [("a", "ocean"), ("b", "ocean")]
+        assert not result.errors
+
+    @pytest.mark.timeout(60)
+    async def test_parse_items_process_backend_matches_thread_backend(
+        self, mocked_processor: JQEntityProcessor
+    ) -> None:
+        mapping = Mock()
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".id | tostring",
+            "blueprint": '"service"',
+            "properties": {"name": ".name", "missing": ".missing"},
+        }
+        mapping.port.items_to_parse = None
+        mapping.selector.query = ".id % 3 != 0"
+        raw_results: list[dict[str, Any]] = [
+            {"id": index, "name": f"service-{index}"}
+            for index in range(PROCESS_POOL_CHUNK_SIZE * 2 + 1)
+        ]
+        mocked_processor.context.config.jq_batch_evaluation = True
+        mocked_processor.context.config.allow_environment_variables_jq_access = False
+
+        mocked_processor.context.config.jq_transform_backend = JQTransformBackend.thread
+        thread_result = await mocked_processor._parse_items(
+            mapping, raw_results, parse_all=True
+        )
+
+        mocked_processor.context.config.jq_transform_backend = (
+            JQTransformBackend.process
+        )
+        mocked_processor.context.config.jq_process_pool_size = 2
+        try:
+            process_result = await mocked_processor._parse_items(
+                mapping, raw_results, parse_all=True
+            )
+        finally:
+            shutdown_process_pool()
+
+        assert process_result == thread_result
+        assert len(process_result.entity_selector_diff.passed) == len(
+            [item for item in raw_results if item["id"] % 3 != 0]
+        )
+        assert process_result.misconfigured_entity_keys == {"missing": ".missing"}
+
+    @pytest.mark.parametrize("jq_batch_evaluation", [True, False])
+    async def test_parse_items_in_chunks_bounds_expanded_items(
+        self, mocked_processor: JQEntityProcessor, jq_batch_evaluation: bool
+    ) -> None:
+        mapping = Mock()
+        mapping.kind = "file"
+        mapping.port.entity.mappings.dict.return_value = {
+            "identifier": ".item.id",
+            "blueprint": '"file"',
+            "properties": {"repository": ".repository"},
+        }
+        mapping.port.items_to_parse = ".files"
+        mapping.port.items_to_parse_name = "item"
+        mapping.selector.query = "true"
+        raw_results: list[dict[str, Any]] = [
+            {"repository": "ocean", "files": [{"id": f"ocean-{i}"} for i in range(5)]},
+            {"repository": "port", "files": [{"id": f"port-{i}"} for i in range(4)]},
+        ]
+        mocked_processor.context.config.jq_batch_evaluation = jq_batch_evaluation
+        mocked_processor.context.config.yield_items_to_parse = False
+
+        chunks = [
+            result
+            async for result in mocked_processor.parse_items_in_chunks(
+                mapping, raw_results, chunk_size=4
+            )
+        ]
+        full_result = await mocked_processor.parse_items(mapping, raw_results)
+
+        assert [len(chunk.entity_selector_diff.passed) for chunk in chunks] == [
+            4,
+            4,
+            1,
+        ]
+        assert [
+            entity for chunk in chunks for entity in chunk.entity_selector_diff.passed
+        ] == full_result.entity_selector_diff.passed
+        assert [
+            entity.identifier for entity in full_result.entity_selector_diff.passed
+        ] == [f"ocean-{i}" for i in range(5)] + [f"port-{i}" for i in range(4)]
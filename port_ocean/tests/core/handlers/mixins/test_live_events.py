@@ -26,6 +26,7 @@ from port_ocean.core.integrations.mixins.live_events import LiveEventsMixin
 from port_ocean.core.models import Entity
 from port_ocean.core.ocean_types import CalculationResult, EntitySelectorDiff
 from port_ocean.ocean import Ocean
+from port_ocean.tests.core.conftest import get_request_json
 
 entity = Entity(
     identifier="repo-one",
@@ -309,7 +310,7 @@ def mock_http_client() -> MagicMock:
     mock_upserted_entities = []
 
     async def post(url: str, *args: Any, **kwargs: Any) -> Response:
-        entity = kwargs.get("json", {})
+        entity = get_request_json(kwargs)
         if entity.get("properties", {}).get("mock_is_to_fail", {}):
             return Response(
                 404, headers=MagicMock(), json={"ok": False, "error": "not_found"}
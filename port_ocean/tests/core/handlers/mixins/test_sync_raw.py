@@ -1,8 +1,10 @@
-from graphlib import CycleError
+import asyncio
+import os
 from typing import Any, AsyncGenerator
 
+from port_ocean.core.utils.entity_state_index import EntityStateIndex
+from port_ocean.core.utils.kind_reconciliation_index import KindReconciliationIndex
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
-from port_ocean.exceptions.core import OceanAbortException
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from port_ocean.ocean import Ocean
@@ -18,12 +20,17 @@ from port_ocean.core.handlers.entities_state_applier.port.applier import (
 from port_ocean.core.handlers.entity_processor.jq_entity_processor import (
     JQEntityProcessor,
 )
-from port_ocean.core.models import Entity
+from port_ocean.core.models import Entity, ProcessExecutionMode
 from port_ocean.context.event import event_context, EventType
+from port_ocean.context.resource import resource_context
 from port_ocean.clients.port.types import UserAgentType
 from dataclasses import dataclass
 from typing import List, Optional
-from port_ocean.tests.core.conftest import create_entity, no_op_event_context
+from port_ocean.tests.core.conftest import (
+    create_entity,
+    get_request_json,
+    no_op_event_context,
+)
 
 
 @pytest.fixture
@@ -118,7 +125,7 @@ async def test_sync_raw_mixin_self_dependency(
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
     mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+        side_effect=EntityTopologicalSorter.order_by_entities_dependencies_in_waves
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -128,14 +135,14 @@ async def test_sync_raw_mixin_self_dependency(
         )
         event.port_app_config = app_config
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=event.entity_topological_sorter.register_entity)  # type: ignore
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=event.entity_topological_sorter.get_entities)  # type: ignore
+        event.entity_topological_sorter.get_entities_in_waves = MagicMock(side_effect=event.entity_topological_sorter.get_entities_in_waves)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies_in_waves",
                 mock_order_by_entities_dependencies,
             ):
 
@@ -148,7 +155,10 @@ async def test_sync_raw_mixin_self_dependency(
                     len(event.entity_topological_sorter.entities) == 1
                 ), "Expected one failed entity callback due to retry logic"
                 assert event.entity_topological_sorter.register_entity.call_count == 1
-                assert event.entity_topological_sorter.get_entities.call_count == 1
+                assert (
+                    event.entity_topological_sorter.get_entities_in_waves.call_count
+                    == 1
+                )
 
                 assert mock_order_by_entities_dependencies.call_count == 1
                 assert [
@@ -239,7 +249,7 @@ async def test_sync_raw_mixin_circular_dependency(
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
     mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+        side_effect=EntityTopologicalSorter.order_by_entities_dependencies_in_waves
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -256,24 +266,14 @@ async def test_sync_raw_mixin_circular_dependency(
             return org(*args, **kwargs)
 
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=mock_register_entity)  # type: ignore
-        raiesed_error_handle_failed = []
-        org_get_entities = event.entity_topological_sorter.get_entities
-
-        def handle_failed_wrapper(*args: Any, **kwargs: Any) -> Any:
-            try:
-                return list(org_get_entities(*args, **kwargs))
-            except Exception as e:
-                raiesed_error_handle_failed.append(e)
-                raise e
-
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=lambda *args, **kwargs: handle_failed_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities_in_waves = MagicMock(side_effect=event.entity_topological_sorter.get_entities_in_waves)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies_in_waves",
                 mock_order_by_entities_dependencies,
             ):
 
@@ -286,19 +286,17 @@ async def test_sync_raw_mixin_circular_dependency(
                     len(event.entity_topological_sorter.entities) == 2
                 ), "Expected one failed entity callback due to retry logic"
                 assert event.entity_topological_sorter.register_entity.call_count == 2
-                assert event.entity_topological_sorter.get_entities.call_count == 2
-                assert [
-                    call[0]
-                    for call in event.entity_topological_sorter.get_entities.call_args_list
-                ] == [(), (False,)]
-                assert len(raiesed_error_handle_failed) == 1
-                assert isinstance(raiesed_error_handle_failed[0], OceanAbortException)
-                assert isinstance(raiesed_error_handle_failed[0].__cause__, CycleError)
                 assert (
-                    len(mock_ocean.port_client.client.post.call_args_list)  # type: ignore
-                    - len(entities)
+                    event.entity_topological_sorter.get_entities_in_waves.call_count
                     == 1
                 )
+                # The entities of the cycle are retried together in a single bulk request
+                assert mock_ocean.port_client.client.post.call_count == 2  # type: ignore
+                result_retry = mock_ocean.port_client.client.post.call_args_list[1]  # type: ignore
+                assert sorted(
+                    entity.get("identifier")
+                    for entity in get_request_json(result_retry[1]).get("entities")
+                ) == ["entity_1", "entity_2"]
 
                 # Add assertions for actual metrics
                 metrics = mock_ocean.metrics.generate_metrics()
@@ -384,7 +382,7 @@ async def test_sync_raw_mixin_dependency(
     mock_sync_raw_mixin.entity_processor.parse_items = AsyncMock(return_value=calc_result_mock)  # type: ignore
 
     mock_order_by_entities_dependencies = MagicMock(
-        side_effect=EntityTopologicalSorter.order_by_entities_dependencies
+        side_effect=EntityTopologicalSorter.order_by_entities_dependencies_in_waves
     )
     async with event_context(EventType.RESYNC, trigger_type="machine") as event:
         app_config = (
@@ -401,24 +399,14 @@ async def test_sync_raw_mixin_dependency(
             return org(*args, **kwargs)
 
         event.entity_topological_sorter.register_entity = MagicMock(side_effect=mock_register_entity)  # type: ignore
-        raiesed_error_handle_failed = []
-        org_event_get_entities = event.entity_topological_sorter.get_entities
-
-        def get_entities_wrapper(*args: Any, **kwargs: Any) -> Any:
-            try:
-                return org_event_get_entities(*args, **kwargs)
-            except Exception as e:
-                raiesed_error_handle_failed.append(e)
-                raise e
-
-        event.entity_topological_sorter.get_entities = MagicMock(side_effect=lambda *args, **kwargs: get_entities_wrapper(*args, **kwargs))  # type: ignore
+        event.entity_topological_sorter.get_entities_in_waves = MagicMock(side_effect=event.entity_topological_sorter.get_entities_in_waves)  # type: ignore
 
         with patch(
             "port_ocean.core.integrations.mixins.sync_raw.event_context",
             lambda *args, **kwargs: no_op_event_context(event),
         ):
             with patch(
-                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies",
+                "port_ocean.core.utils.entity_topological_sorter.EntityTopologicalSorter.order_by_entities_dependencies_in_waves",
                 mock_order_by_entities_dependencies,
             ):
 
@@ -431,28 +419,34 @@ async def test_sync_raw_mixin_dependency(
                 assert (
                     len(event.entity_topological_sorter.entities) == 5
                 ), "Expected one failed entity callback due to retry logic"
-                assert event.entity_topological_sorter.get_entities.call_count == 1
-                assert len(raiesed_error_handle_failed) == 0
-                assert mock_ocean.port_client.client.post.call_count == 6  # type: ignore
+                assert (
+                    event.entity_topological_sorter.get_entities_in_waves.call_count
+                    == 1
+                )
+                assert mock_ocean.port_client.client.post.call_count == 4  # type: ignore
                 assert mock_order_by_entities_dependencies.call_count == 1
 
                 result_bulk = mock_ocean.port_client.client.post.call_args_list[0]  # type: ignore
-                result_non_bulk = mock_ocean.port_client.client.post.call_args_list[1:6]  # type: ignore
+                result_waves = mock_ocean.port_client.client.post.call_args_list[1:4]  # type: ignore
 
                 assert "-".join(
                     [
                         entity.get("identifier")
-                        for entity in result_bulk[1].get("json").get("entities")
+                        for entity in get_request_json(result_bulk[1]).get("entities")
                     ]
                 ) == "-".join([entity.identifier for entity in entities])
-                assert "-".join(
-                    [call[1].get("json").get("identifier") for call in result_non_bulk]
-                ) in (
-                    "entity_3-entity_4-entity_1-entity_2-entity_5",
-                    "entity_3-entity_4-entity_1-entity_5-entity_2",
-                    "entity_3-entity_1-entity_4-entity_2-entity_5",
-                    "entity_3-entity_1-entity_4-entity_5-entity_2",
-                )
+                # Every wave is upserted in bulk once the entities it depends on were upserted
+                assert [
+                    sorted(
+                        entity.get("identifier")
+                        for entity in get_request_json(call[1]).get("entities")
+                    )
+                    for call in result_waves
+                ] == [
+                    ["entity_3"],
+                    ["entity_1", "entity_4"],
+                    ["entity_2", "entity_5"],
+                ]
 
                 # Add assertions for actual metrics
                 metrics = mock_ocean.metrics.generate_metrics()
@@ -647,6 +641,34 @@ async def test_map_entities_compared_with_port_no_port_entities_all_entities_are
     assert "entity_2" in [e.identifier for e in changed_entities]
 
 
+@pytest.mark.asyncio
+async def test_map_entities_compared_with_port_uses_entity_state_index(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_ocean: Ocean,
+    mock_resource_config: ResourceConfig,
+    tmp_path: Any,
+) -> None:
+    entities = [
+        create_entity(f"entity_{index}", "service", {}, False) for index in range(20)
+    ]
+    index = EntityStateIndex(str(tmp_path / "index.sqlite"))
+    index.start_resync(reseed=True)
+    mock_sync_raw_mixin._entity_state_index = index
+    mock_ocean.port_client.search_entities = AsyncMock(return_value=entities[:15])  # type: ignore
+
+    for _ in range(2):
+        changed_entities = await mock_sync_raw_mixin._map_entities_compared_with_port(
+            entities, mock_resource_config, UserAgentType.exporter
+        )
+        assert changed_entities == entities[15:]
+
+    # The index is seeded once, with the fields mapped by the resource
+    mock_ocean.port_client.search_entities.assert_called_once()
+    assert mock_ocean.port_client.search_entities.call_args.kwargs[
+        "parameters_to_include"
+    ] == mock_sync_raw_mixin._get_mapped_parameters(mock_resource_config)
+
+
 @pytest.mark.asyncio
 async def test_map_entities_compared_with_port_returns_original_entities_when_using_team_search_query(
     mock_sync_raw_mixin: SyncRawMixin,
@@ -896,6 +918,49 @@ async def test_register_resource_raw_skip_event_type_http_request_upsert_called_
         mock_sync_raw_mixin.entities_state_applier.upsert.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_register_resource_raw_upserts_items_to_parse_in_chunks(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.parse_items_chunk_size = 2
+    mock_ocean.config.yield_items_to_parse = False
+    mock_resource_config.port.items_to_parse = ".files"
+    mock_resource_config.port.entity.mappings.identifier = ".item.id"
+    mock_sync_raw_mixin_with_jq_processor._calculate_raw = AsyncMock()  # type: ignore
+    upserted_batches: list[list[Entity]] = []
+
+    async def upsert(entities: list[Entity], user_agent_type: UserAgentType) -> list[Entity]:
+        upserted_batches.append(entities)
+        return entities
+
+    mock_sync_raw_mixin_with_jq_processor.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.HTTP_REQUEST, trigger_type="machine"):
+        result = await mock_sync_raw_mixin_with_jq_processor._register_resource_raw(
+            mock_resource_config,
+            [
+                {"name": "repo-1", "files": [{"id": "a"}, {"id": "b"}, {"id": "c"}]},
+                {"name": "repo-2", "files": [{"id": "d"}, {"id": "e"}]},
+            ],
+            UserAgentType.exporter,
+        )
+
+    assert [
+        [entity.identifier for entity in batch] for batch in upserted_batches
+    ] == [["a", "b"], ["c", "d"], ["e"]]
+    assert [entity.identifier for entity in result.entity_selector_diff.passed] == [
+        "a",
+        "b",
+        "c",
+        "d",
+        "e",
+    ]
+    assert result.number_of_transformed_entities == 5
+    mock_sync_raw_mixin_with_jq_processor._calculate_raw.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_on_resync_start_hooks_are_called(
     mock_sync_raw_mixin: SyncRawMixin,
@@ -1084,3 +1149,336 @@ async def test_on_resync_start_hook_error_prevents_resync(
     assert (
         not resync_complete_called
     ), "on_resync_complete hook should not have been called after error"
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_processes_kinds_concurrently(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.resync_kinds_concurrency = 2
+    mock_port_app_config.resources = [
+        mock_port_app_config.resources[0].copy(update={"kind": f"kind-{index}"})
+        for index in range(4)
+    ]
+    mock_ocean.metrics.report_sync_metrics = AsyncMock(return_value=None)  # type: ignore
+    mock_ocean.metrics.send_metrics_to_webhook = AsyncMock(return_value=None)  # type: ignore
+
+    running = 0
+    max_running = 0
+    processed_kinds: list[str] = []
+
+    async def process_resource(
+        resource: ResourceConfig, index: int, user_agent_type: UserAgentType
+    ) -> tuple[list[Entity], list[Exception]]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        processed_kinds.append(resource.kind)
+        return [], []
+
+    mock_sync_raw_mixin.process_resource = process_resource  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch(
+            "port_ocean.core.integrations.mixins.sync_raw.event_context",
+            lambda *args, **kwargs: no_op_event_context(event),
+        ):
+            assert await mock_sync_raw_mixin.sync_raw_all(
+                trigger_type="machine", user_agent_type=UserAgentType.exporter
+            )
+
+    assert max_running == 2
+    assert sorted(processed_kinds) == [f"kind-{index}" for index in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_reuses_worker_processes_in_multi_process_mode(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.process_execution_mode = ProcessExecutionMode.multi_process
+    mock_ocean.config.resync_kinds_concurrency = 2
+    mock_ocean.config.multi_process_worker_max_tasks = None
+    mock_port_app_config.resources = [
+        mock_port_app_config.resources[0].copy(update={"kind": f"kind-{index}"})
+        for index in range(4)
+    ]
+    mock_ocean.metrics.report_sync_metrics = AsyncMock(return_value=None)  # type: ignore
+    mock_ocean.metrics.send_metrics_to_webhook = AsyncMock(return_value=None)  # type: ignore
+
+    async def process_resource(
+        resource: ResourceConfig,
+        index: int,
+        user_agent_type: UserAgentType,
+        on_entities_registered: Any,
+    ) -> tuple[list[Entity], list[Exception]]:
+        await asyncio.sleep(0.05)
+        await on_entities_registered(
+            [Entity(identifier=str(os.getpid()), blueprint=resource.kind)]
+        )
+        return [], []
+
+    mock_sync_raw_mixin._process_resource = process_resource  # type: ignore
+    mock_sync_raw_mixin.entities_state_applier.delete_diff = AsyncMock(return_value=None)  # type: ignore
+
+    results: list[tuple[list[Entity], list[Exception]]] = []
+    original_process_resource = mock_sync_raw_mixin.process_resource
+
+    async def collect_process_resource(
+        *args: Any,
+    ) -> tuple[list[Entity], list[Exception]]:
+        result = await original_process_resource(*args)
+        results.append(result)
+        return result
+
+    mock_sync_raw_mixin.process_resource = collect_process_resource  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch(
+            "port_ocean.core.integrations.mixins.sync_raw.event_context",
+            lambda *args, **kwargs: no_op_event_context(event),
+        ):
+            assert await mock_sync_raw_mixin.sync_raw_all(
+                trigger_type="machine", user_agent_type=UserAgentType.exporter
+            )
+
+    assert mock_sync_raw_mixin._worker_pool is None
+    workers_pids = {entities[0].identifier for entities, errors in results}
+    assert len(results) == 4
+    assert len(workers_pids) == 2
+    assert str(os.getpid()) not in workers_pids
+
+
+@pytest.mark.asyncio
+async def test_sync_raw_all_retries_failed_entities_of_every_kind_in_multi_process_mode(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    mock_ocean: Ocean,
+    tmp_path: Any,
+) -> None:
+    mock_ocean.process_execution_mode = ProcessExecutionMode.multi_process
+    mock_ocean.config.resync_kinds_concurrency = 1
+    mock_ocean.config.multi_process_worker_max_tasks = None
+    mock_port_app_config.resources = [
+        mock_port_app_config.resources[0].copy(update={"kind": f"kind-{index}"})
+        for index in range(2)
+    ]
+    mock_ocean.metrics.report_sync_metrics = AsyncMock(return_value=None)  # type: ignore
+    mock_ocean.metrics.send_metrics_to_webhook = AsyncMock(return_value=None)  # type: ignore
+    retried_entities_path = tmp_path / "retried_entities"
+
+    async def process_resource(
+        resource: ResourceConfig,
+        index: int,
+        user_agent_type: UserAgentType,
+        on_entities_registered: Any,
+    ) -> tuple[list[Entity], list[Exception]]:
+        event.entity_topological_sorter.register_entity(
+            Entity(identifier=f"failed-{resource.kind}", blueprint=resource.kind)
+        )
+        return [], []
+
+    async def sort_and_upsert_failed_entities(user_agent_type: UserAgentType) -> None:
+        # Runs in the worker, so the retried entities are reported through a file
+        retried_entities_path.write_text(
+            "\n".join(
+                sorted(
+                    entity.identifier
+                    for entity in event.entity_topological_sorter.entities
+                )
+            )
+        )
+
+    mock_sync_raw_mixin._process_resource = process_resource  # type: ignore
+    mock_sync_raw_mixin.sort_and_upsert_failed_entities = sort_and_upsert_failed_entities  # type: ignore
+    mock_sync_raw_mixin.entities_state_applier.delete_diff = AsyncMock(return_value=None)  # type: ignore
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        with patch(
+            "port_ocean.core.integrations.mixins.sync_raw.event_context",
+            lambda *args, **kwargs: no_op_event_context(event),
+        ):
+            assert await mock_sync_raw_mixin.sync_raw_all(
+                trigger_type="machine", user_agent_type=UserAgentType.exporter
+            )
+
+    assert retried_entities_path.read_text().splitlines() == [
+        "failed-kind-0",
+        "failed-kind-1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_resource_in_worker_streams_entities_as_they_are_upserted(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.metrics.report_kind_sync_metrics = AsyncMock(return_value=None)  # type: ignore
+    mock_ocean.metrics.send_metrics_to_webhook = AsyncMock(return_value=None)  # type: ignore
+    first_chunk_received = asyncio.Event()
+
+    async def register_in_batches(
+        resource_config: ResourceConfig,
+        user_agent_type: UserAgentType,
+        on_entities_registered: Any,
+    ) -> tuple[list[Entity], list[Exception]]:
+        await on_entities_registered(
+            [Entity(identifier="entity_1", blueprint="service")]
+        )
+        # The next batch is only upserted once the parent received the first one
+        await asyncio.wait_for(first_chunk_received.wait(), timeout=5)
+        await on_entities_registered(
+            [Entity(identifier="entity_2", blueprint="service")]
+        )
+        return [], []
+
+    mock_sync_raw_mixin._register_in_batches = register_in_batches
+
+    chunks: list[tuple[str, list[Any]]] = []
+    async with event_context(EventType.RESYNC, trigger_type="machine"):
+        async for chunk_type, chunk in mock_sync_raw_mixin._process_resource_in_worker(
+            mock_resource_config, 0, UserAgentType.exporter
+        ):
+            chunks.append((chunk_type, chunk))
+            first_chunk_received.set()
+
+    assert [
+        (chunk_type, [compact[0] for compact in chunk])
+        for chunk_type, chunk in chunks
+        if chunk_type == "entities"
+    ] == [("entities", ["entity_1"]), ("entities", ["entity_2"])]
+    assert chunks[-1] == ("errors", [])
+
+
+@pytest.mark.asyncio
+async def test_register_in_batches_fetches_next_batches_while_upserting(
+    mock_sync_raw_mixin_with_jq_processor: SyncRawMixin,
+    mock_resource_config: ResourceConfig,
+    mock_ocean: Ocean,
+) -> None:
+    mock_ocean.config.send_raw_data_examples = False
+    mock_ocean.config.resync_pipeline_queue_size = 1
+    mixin = mock_sync_raw_mixin_with_jq_processor
+    last_batch_fetched = asyncio.Event()
+
+    async def raw_results_generator() -> AsyncGenerator[list[dict[str, Any]], None]:
+        for index in range(3):
+            yield [{"id": f"entity_{index}", "name": f"Entity {index}"}]
+        last_batch_fetched.set()
+
+    async def upsert(entities: list[Entity], user_agent_type: UserAgentType) -> list[Entity]:
+        # The first upsert can only finish once the next batches were fetched and mapped without it
+        await asyncio.wait_for(last_batch_fetched.wait(), timeout=5)
+        return entities
+
+    mixin._get_resource_raw_results = AsyncMock(return_value=([raw_results_generator()], []))  # type: ignore
+    mixin.entities_state_applier.upsert = upsert  # type: ignore
+
+    async with event_context(EventType.HTTP_REQUEST, trigger_type="machine"):
+        async with resource_context(mock_resource_config):
+            passed_entities, errors = await mixin._register_in_batches(
+                mock_resource_config, UserAgentType.exporter
+            )
+
+    assert not errors
+    assert [entity.identifier for entity in passed_entities] == [
+        "entity_0",
+        "entity_1",
+        "entity_2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sort_and_upsert_failed_entities_retries_only_still_failing_entities(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+) -> None:
+    entity_1 = Entity(identifier="entity_1", blueprint="service")
+    entity_2 = Entity(
+        identifier="entity_2", blueprint="service", relations={"service": "entity_1"}
+    )
+    entity_3 = Entity(identifier="entity_3", blueprint="team")
+    upserted_waves: list[list[str]] = []
+    attempts: dict[str, int] = {}
+
+    async def upsert_entities_in_batches(
+        entities: list[Entity], *args: Any, **kwargs: Any
+    ) -> list[tuple[bool, Entity]]:
+        upserted_waves.append([entity.identifier for entity in entities])
+        results = []
+        for entity in entities:
+            attempts[entity.identifier] = attempts.get(entity.identifier, 0) + 1
+            # entity_3 only succeeds on its second attempt
+            results.append(
+                (entity.identifier != "entity_3" or attempts["entity_3"] > 1, entity)
+            )
+        return results
+
+    port_client = mock_sync_raw_mixin.entities_state_applier.context.port_client
+    port_client.upsert_entities_in_batches = AsyncMock(  # type: ignore
+        side_effect=upsert_entities_in_batches
+    )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        for entity in (entity_2, entity_3, entity_1):
+            event.entity_topological_sorter.register_entity(entity)
+
+        await mock_sync_raw_mixin.sort_and_upsert_failed_entities(
+            UserAgentType.exporter
+        )
+
+    assert sorted(upserted_waves[:2]) == [["entity_1"], ["entity_3"]]
+    assert upserted_waves[2:] == [["entity_2"], ["entity_3"]]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_kind_deletes_only_entities_the_kind_stopped_emitting(
+    mock_sync_raw_mixin: SyncRawMixin,
+    mock_port_app_config: PortAppConfig,
+    tmp_path: Any,
+) -> None:
+    kind_index = KindReconciliationIndex(str(tmp_path / "index.sqlite"))
+    delete_diff_by_keys = AsyncMock(return_value=True)
+    mock_sync_raw_mixin.entities_state_applier.delete_diff_by_keys = delete_diff_by_keys  # type: ignore
+    kept_entity = Entity(identifier="kept", blueprint="service")
+    stale_entity = Entity(identifier="stale", blueprint="service")
+
+    async def reconcile_kind(
+        entities: list[Entity], errors: list[Exception] | None = None
+    ) -> bool:
+        return await mock_sync_raw_mixin._reconcile_kind(
+            kind_index,
+            "project",
+            entities,
+            errors or [],
+            UserAgentType.exporter,
+            mock_port_app_config,
+        )
+
+    async with event_context(EventType.RESYNC, trigger_type="machine") as event:
+        event.port_app_config = mock_port_app_config
+        # The first run of a kind is left to the full reconciliation, which completes it
+        assert not await reconcile_kind([kept_entity, stale_entity])
+        kind_index.complete_kind("project")
+
+        assert await reconcile_kind([kept_entity])
+        # A failed run of the kind is never reconciled
+        assert not await reconcile_kind([], [Exception("failed")])
+
+    delete_diff_by_keys.assert_called_once_with(
+        {("service", "kept"), ("service", "stale")},
+        [kept_entity],
+        UserAgentType.exporter,
+        mock_port_app_config.get_entity_deletion_threshold(),
+    )
+    assert kind_index.get_keys(["project"]) == {("service", "kept")}
@@ -9,6 +9,7 @@ from httpx import Response
 
 from port_ocean import Ocean
 from port_ocean.clients.port.client import PortClient
+from port_ocean.config.settings import IntegrationSettings, MetricsSettings
 from port_ocean.context.event import EventContext, EventType, event_context
 from port_ocean.context.ocean import PortOceanContext, ocean
 from port_ocean.core.handlers.port_app_config.models import (
@@ -36,10 +37,12 @@ from port_ocean.core.integrations.base import BaseIntegration
 from port_ocean.core.integrations.mixins.handler import HandlerMixin
 from port_ocean.core.integrations.mixins.live_events import LiveEventsMixin
 from port_ocean.core.models import Entity
+from port_ocean.helpers.metric.metric import Metrics
 from port_ocean.exceptions.webhook_processor import (
     RetryableError,
     WebhookEventNotSupportedError,
 )
+from port_ocean.tests.core.conftest import get_request_json
 from port_ocean.utils.signal import SignalHandler
 
 
@@ -248,7 +251,7 @@ def mock_http_client() -> MagicMock:
     mock_upserted_entities = []
 
     async def post(url: str, *args: Any, **kwargs: Any) -> Response:
-        entity = kwargs.get("json", {})
+        entity = get_request_json(kwargs)
         if entity.get("properties", {}).get("mock_is_to_fail", {}):
             return Response(
                 404, headers=MagicMock(), json={"ok": False, "error": "not_found"}
@@ -307,6 +310,13 @@ def mock_ocean(mock_port_client: PortClient) -> Ocean:
         ocean_mock.port_client = mock_port_client
         ocean_mock.integration_router = APIRouter()
         ocean_mock.fast_api_app = FastAPI()
+        ocean_mock.metrics = Metrics(
+            metrics_settings=MetricsSettings(enabled=False),
+            integration_configuration=IntegrationSettings(
+                type="test", identifier="test"
+            ),
+            port_client=mock_port_client,
+        )
         return ocean_mock
 
 
@@ -2,11 +2,14 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from port_ocean.core.utils.utils import validate_integration_runtime
+from port_ocean.core.utils.utils import validate_integration_runtime, validate_result
 from port_ocean.clients.port.client import PortClient
-from port_ocean.core.models import Runtime
+from port_ocean.core.models import Entity, Runtime
 from port_ocean.tests.helpers.port_client import get_port_client_for_integration
-from port_ocean.exceptions.core import IntegrationRuntimeException
+from port_ocean.exceptions.core import (
+    IntegrationRuntimeException,
+    RawObjectValidationException,
+)
 
 
 class TestValidateIntegrationRuntime:
@@ -71,3 +74,26 @@ class TestValidateIntegrationRuntime:
             requested_runtime.is_installation_type_compatible(installation_type)
             == expected
         )
+
+
+def test_entity_from_trusted_matches_parse_obj() -> None:
+    data = {
+        "identifier": "service",
+        "blueprint": "microservice",
+        "properties": {"language": "python"},
+        "relations": {"team": "platform"},
+        "createdAt": "2024-01-01T00:00:00Z",
+    }
+
+    entity = Entity.from_trusted(data)
+    parsed_entity = Entity.parse_obj(data)
+
+    assert entity == parsed_entity
+    assert entity.dict(exclude_unset=True) == parsed_entity.dict(exclude_unset=True)
+
+
+def test_validate_result() -> None:
+    assert validate_result([{"id": 1}]) == [{"id": 1}]
+    assert validate_result(({"id": 1},)) == [{"id": 1}]
+    with pytest.raises(RawObjectValidationException):
+        validate_result([1])
@@ -0,0 +1,97 @@
+from pathlib import Path
+from typing import Any
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.entity_state_index import EntityStateIndex
+
+
+def create_entity(identifier: str, **properties: Any) -> Entity:
+    return Entity(identifier=identifier, blueprint="service", properties=properties)
+
+
+def test_entity_state_index_returns_only_changed_entities(tmp_path: Path) -> None:
+    index = EntityStateIndex(str(tmp_path / "index.sqlite"))
+    index.start_resync(reseed=True)
+    index.seed(
+        "service",
+        [
+            create_entity("unchanged", name="a", removed=None),
+            create_entity("changed", name="a"),
+        ],
+    )
+
+    changed_entities = index.get_changed_entities(
+        [
+            create_entity("unchanged", name="a"),
+            create_entity("changed", name="b"),
+            create_entity("new", name="a"),
+        ]
+    )
+
+    assert [entity.identifier for entity in changed_entities] == ["changed", "new"]
+
+
+def test_entity_state_index_is_valid_only_after_a_completed_resync(
+    tmp_path: Path,
+) -> None:
+    index = EntityStateIndex(str(tmp_path / "index.sqlite"))
+    assert not index.is_valid(max_age_seconds=60)
+
+    index.start_resync(reseed=True)
+    assert not index.is_valid(max_age_seconds=60)
+
+    index.complete_resync()
+    assert index.is_valid(max_age_seconds=60)
+    assert not index.is_valid(max_age_seconds=-1)
+
+    index.start_resync()
+    assert not index.is_valid(max_age_seconds=60)
+
+
+def test_entity_state_index_prunes_entities_not_seen_by_the_resync(
+    tmp_path: Path,
+) -> None:
+    path = str(tmp_path / "index.sqlite")
+    index = EntityStateIndex(path)
+    index.start_resync(reseed=True)
+    index.seed(
+        "service", [create_entity("kept", name="a"), create_entity("stale", name="a")]
+    )
+    assert index.get_changed_entities([create_entity("kept", name="a")]) == []
+    index.update([create_entity("upserted", name="a")])
+    index.complete_resync()
+    index.close()
+
+    reopened_index = EntityStateIndex(path)
+    reopened_index.start_resync()
+    changed_entities = reopened_index.get_changed_entities(
+        [
+            create_entity("kept", name="a"),
+            create_entity("upserted", name="a"),
+            create_entity("stale", name="a"),
+        ]
+    )
+
+    assert [entity.identifier for entity in changed_entities] == ["stale"]
+
+
+def test_entity_state_index_is_seeded_once_per_seed_key(tmp_path: Path) -> None:
+    path = str(tmp_path / "index.sqlite")
+    index = EntityStateIndex(path)
+    index.start_resync(reseed=True)
+    assert not index.is_seeded("service")
+
+    index.seed("service", [create_entity("seen", name="a")])
+    assert index.get_changed_entities([create_entity("seen", name="a")]) == []
+    # Seeding again updates the fingerprints without losing that the entity was seen by the resync
+    index.seed("other-fields", [create_entity("seen", name="a")])
+    index.complete_resync()
+    index.close()
+
+    reopened_index = EntityStateIndex(path)
+    reopened_index.start_resync()
+    assert reopened_index.is_seeded("service")
+    assert reopened_index.get_changed_entities([create_entity("seen", name="a")]) == []
+
+    reopened_index.start_resync(reseed=True)
+    assert not reopened_index.is_seeded("service")
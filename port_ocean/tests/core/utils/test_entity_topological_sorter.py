@@ -1,3 +1,7 @@
+from graphlib import CycleError
+
+import pytest
+
 from port_ocean.core.models import Entity
 from port_ocean.core.utils.entity_topological_sorter import EntityTopologicalSorter
 from unittest.mock import MagicMock
@@ -97,3 +101,72 @@ def test_handle_failed_with_circular_dependencies() -> None:
             e.args[0]
             == "Cannot order entities due to cyclic dependencies. \nIf you do want to have cyclic dependencies, please make sure to set the keys 'createMissingRelatedEntities' and 'deleteDependentEntities' in the integration config in Port."
         )
+
+
+def test_order_by_entities_dependencies_in_waves() -> None:
+    entity_a = create_entity("entity_a", "buleprint_a")  # No dependencies
+    entity_b = create_entity("entity_b", "buleprint_b")  # No dependencies
+    entity_c = create_entity(
+        "entity_c", "buleprint_a", {"dep_name_1": "entity_a"}
+    )  # Depends on entity_a
+    entity_d = create_entity(
+        "entity_d", "buleprint_b", {"dep_name_1": "entity_b", "dep_name_2": "entity_c"}
+    )  # Depends on entity_b and entity_c
+
+    waves = EntityTopologicalSorter.order_by_entities_dependencies_in_waves(
+        [entity_d, entity_c, entity_b, entity_a]
+    )
+
+    assert [sorted(entity.identifier for entity in wave) for wave in waves] == [
+        ["entity_a", "entity_b"],
+        ["entity_c"],
+        ["entity_d"],
+    ]
+
+
+def test_order_by_entities_dependencies_in_waves_places_cycles_in_a_single_wave() -> (
+    None
+):
+    entity_a = create_entity("entity_a", "buleprint_a")  # No dependencies
+    entity_b = create_entity(
+        "entity_b", "buleprint_a", {"dep_name_1": "entity_a", "dep_name_2": "entity_c"}
+    )  # Depends on entity_a and entity_c
+    entity_c = create_entity(
+        "entity_c", "buleprint_b", {"dep_name_1": "entity_b"}
+    )  # Depends on entity_b
+    entity_d = create_entity(
+        "entity_d", "buleprint_b", {"dep_name_1": "entity_c"}
+    )  # Depends on entity_c
+
+    waves = EntityTopologicalSorter.order_by_entities_dependencies_in_waves(
+        [entity_d, entity_c, entity_b, entity_a]
+    )
+
+    assert [sorted(entity.identifier for entity in wave) for wave in waves] == [
+        ["entity_a"],
+        ["entity_b", "entity_c"],
+        ["entity_d"],
+    ]
+
+    with pytest.raises(OceanAbortException) as exc_info:
+        EntityTopologicalSorter.order_by_entities_dependencies(
+            [entity_d, entity_c, entity_b, entity_a]
+        )
+    assert isinstance(exc_info.value.__cause__, CycleError)
+
+
+def test_order_by_entities_dependencies_long_chain() -> None:
+    entities = [Entity(identifier="entity_0", blueprint="buleprint_a")] + [
+        Entity(
+            identifier=f"entity_{index}",
+            blueprint="buleprint_a",
+            relations={"parent": f"entity_{index - 1}"},
+        )
+        for index in range(1, 20000)
+    ]
+
+    ordered = EntityTopologicalSorter.order_by_entities_dependencies(entities[::-1])
+
+    assert [entity.identifier for entity in ordered] == [
+        f"entity_{index}" for index in range(20000)
+    ]
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.kind_reconciliation_index import KindReconciliationIndex
+
+
+def create_entities(*identifiers: str) -> list[Entity]:
+    return [
+        Entity(identifier=identifier, blueprint="service") for identifier in identifiers
+    ]
+
+
+def test_kind_reconciliation_index_returns_entities_the_kind_stopped_emitting(
+    tmp_path: Path,
+) -> None:
+    index = KindReconciliationIndex(str(tmp_path / "index.sqlite"))
+    generation = index.start_kind("services")
+    index.record("services", generation, create_entities("kept", "stale"))
+    assert not index.is_completed("services")
+    index.complete_kind("services")
+
+    generation = index.start_kind("services")
+    index.record("services", generation, create_entities("kept", "new"))
+
+    assert index.is_completed("services")
+    assert index.get_stale_keys("services", generation) == {("service", "stale")}
+
+    index.complete_kind("services")
+    assert index.get_keys(["services"]) == {("service", "kept"), ("service", "new")}
+
+
+def test_kind_reconciliation_index_keeps_entities_emitted_by_another_kind(
+    tmp_path: Path,
+) -> None:
+    index = KindReconciliationIndex(str(tmp_path / "index.sqlite"))
+    for kind, identifiers in [
+        ("services", ("shared", "owned")),
+        ("repositories", ("shared",)),
+    ]:
+        index.record(kind, index.start_kind(kind), create_entities(*identifiers))
+        index.complete_kind(kind)
+
+    generation = index.start_kind("services")
+    index.record("services", generation, [])
+
+    assert index.get_stale_keys("services", generation) == {("service", "owned")}
+
+    # Once the other kind stopped emitting it too, the shared entity is stale
+    index.record("repositories", index.start_kind("repositories"), [])
+    index.complete_kind("repositories")
+    assert index.get_stale_keys("services", generation) == {
+        ("service", "owned"),
+        ("service", "shared"),
+    }
+
+
+def test_kind_reconciliation_index_forgets_removed_kinds(tmp_path: Path) -> None:
+    index = KindReconciliationIndex(str(tmp_path / "index.sqlite"))
+    for kind in ["services", "repositories"]:
+        index.record(kind, index.start_kind(kind), create_entities(kind))
+
+    index.retain_kinds(["services"])
+
+    assert index.get_kinds() == {"services"}
+    assert index.get_keys(["repositories"]) == set()
@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from port_ocean.core.handlers.port_app_config.models import (
+    EntityMapping,
+    MappingsConfig,
+    PortResourceConfig,
+    ResourceConfig,
+    Selector,
+)
+from port_ocean.core.models import Blueprint, BlueprintRelation
+from port_ocean.core.utils.kind_scheduler import (
+    KindScheduler,
+    resolve_kinds_dependencies,
+)
+
+
+def create_resource(
+    kind: str, blueprint: str, relations: dict[str, Any] | None = None
+) -> ResourceConfig:
+    return ResourceConfig(
+        kind=kind,
+        selector=Selector(query="true"),
+        port=PortResourceConfig(
+            entity=MappingsConfig(
+                mappings=EntityMapping(
+                    identifier=".id",
+                    title=".name",
+                    blueprint=blueprint,
+                    relations=relations or {},
+                )
+            )
+        ),
+    )
+
+
+def create_blueprint(identifier: str, relations: dict[str, str]) -> Blueprint:
+    return Blueprint(
+        identifier=identifier,
+        schema={},
+        relations={
+            name: BlueprintRelation(many=False, required=False, target=target)
+            for name, target in relations.items()
+        },
+    )
+
+
+def test_resolve_kinds_dependencies_relation_target_is_a_dependency() -> None:
+    resources = [
+        create_resource("pull-request", '"pullRequest"', {"repository": ".repo"}),
+        create_resource("repository", '"repository"'),
+        create_resource("pull-request-self", '"pullRequest"', {"parent": ".parent"}),
+        create_resource("dynamic", ".type", {"repository": ".repo"}),
+    ]
+    blueprints = {
+        "pullRequest": create_blueprint(
+            "pullRequest", {"repository": "repository", "parent": "pullRequest"}
+        )
+    }
+
+    assert resolve_kinds_dependencies(resources, blueprints) == {
+        0: {1},
+        1: set(),
+        2: set(),
+        3: set(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_kind_scheduler_bounds_concurrency_and_keeps_results_order() -> None:
+    resources = [create_resource(f"kind-{i}", '"service"') for i in range(6)]
+    running = 0
+    max_running = 0
+
+    async def process(resource: ResourceConfig, index: int) -> str:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (6 - index))
+        running -= 1
+        return resource.kind
+
+    results = await KindScheduler(resources, concurrency=2).run(process)
+
+    assert max_running == 2
+    assert results == [resource.kind for resource in resources]
+
+
+@pytest.mark.asyncio
+async def test_kind_scheduler_starts_dependencies_first() -> None:
+    resources = [create_resource(f"kind-{i}", '"service"') for i in range(3)]
+    started: list[int] = []
+
+    async def process(resource: ResourceConfig, index: int) -> int:
+        started.append(index)
+        await asyncio.sleep(0.01)
+        return index
+
+    await KindScheduler(resources, concurrency=3, dependencies={0: {2}, 1: {2}}).run(
+        process
+    )
+
+    assert started[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_kind_scheduler_makes_progress_on_dependencies_cycle() -> None:
+    resources = [create_resource(f"kind-{i}", '"service"') for i in range(2)]
+
+    async def process(resource: ResourceConfig, index: int) -> int:
+        return index
+
+    results = await KindScheduler(
+        resources, concurrency=2, dependencies={0: {1}, 1: {0}}
+    ).run(process)
+
+    assert results == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_kind_scheduler_failure_cancels_running_kinds() -> None:
+    resources = [create_resource(f"kind-{i}", '"service"') for i in range(2)]
+    cancelled = asyncio.Event()
+
+    async def process(resource: ResourceConfig, index: int) -> int:
+        if index == 0:
+            raise ValueError("kind failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return index
+
+    with pytest.raises(ValueError):
+        await KindScheduler(resources, concurrency=2).run(process)
+
+    assert cancelled.is_set()
@@ -1,9 +1,14 @@
+from datetime import datetime
 from unittest.mock import patch
+
+import pytest
+
 from port_ocean.core.models import Entity
 from port_ocean.core.utils.utils import (
     are_entities_different,
     resolve_entities_diff,
-    are_entities_fields_equal,
+    get_entity_fingerprint,
+    get_port_diff,
 )
 from typing import Any
 
@@ -26,278 +31,6 @@ def create_test_entity(
     )
 
 
-def test_are_entities_fields_equal_identical_properties_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {"url": "https://test.atlassian.net/browse/test-29081", "totalIssues": 123},
-            {"url": "https://test.atlassian.net/browse/test-29081", "totalIssues": 123},
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_different_number_properties_should_be_false() -> (
-    None
-):
-    assert (
-        are_entities_fields_equal(
-            {"url": "https://test.atlassian.net/browse/test-29081", "totalIssues": 123},
-            {"url": "https://test.atlassian.net/browse/test-29081", "totalIssues": 456},
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_different_date_properties_should_be_false() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "created_at": "2024-03-20T10:00:00Z",
-                "updated_at": "2024-03-21T15:30:00Z",
-            },
-            {
-                "created_at": "2024-03-20T10:00:00Z",
-                "updated_at": "2024-03-22T09:45:00Z",
-            },
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_identical_properties_different_order_should_be_true() -> (
-    None
-):
-    assert (
-        are_entities_fields_equal(
-            {"totalIssues": 123, "url": "https://test.atlassian.net/browse/test-29081"},
-            {"url": "https://test.atlassian.net/browse/test-29081", "totalIssues": 123},
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_identical_relations_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {"reporter": "id1", "project": "project_id"},
-            {"reporter": "id1", "project": "project_id"},
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_different_relations_should_be_false() -> None:
-    assert (
-        are_entities_fields_equal(
-            {"reporter": "id1", "project": "project_id"},
-            {"reporter": "id2", "project": "project_id"},
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_different_relation_keys_should_be_false() -> None:
-    assert (
-        are_entities_fields_equal(
-            {"reporter": "id1", "project": "project_id"},
-            {"assignee": "id1", "project": "project_id"},
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_identical_relations_different_order_should_be_true() -> (
-    None
-):
-    assert (
-        are_entities_fields_equal(
-            {"project": "project_id", "reporter": "id1"},
-            {"reporter": "id1", "project": "project_id"},
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_identical_nested_properties_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "metadata": {
-                    "labels": {"env": "prod", "team": "devops"},
-                    "annotations": {"description": "test"},
-                },
-                "spec": {"replicas": 3},
-            },
-            {
-                "metadata": {
-                    "labels": {"env": "prod", "team": "devops"},
-                    "annotations": {"description": "test"},
-                },
-                "spec": {"replicas": 3},
-            },
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_different_nested_properties_should_be_false() -> (
-    None
-):
-    assert (
-        are_entities_fields_equal(
-            {
-                "metadata": {
-                    "labels": {"env": "prod", "team": "devops"},
-                    "annotations": {"description": "test"},
-                },
-            },
-            {
-                "metadata": {
-                    "labels": {"env": "staging", "team": "devops"},
-                    "annotations": {"description": "test"},
-                },
-            },
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_identical_nested_arrays_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "containers": [
-                    {"name": "app", "image": "nginx:1.14"},
-                    {"name": "sidecar", "image": "proxy:2.1"},
-                ],
-            },
-            {
-                "containers": [
-                    {"name": "app", "image": "nginx:1.14"},
-                    {"name": "sidecar", "image": "proxy:2.1"},
-                ],
-            },
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_different_nested_arrays_should_be_false() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "containers": [
-                    {"name": "app", "image": "nginx:1.14"},
-                    {"name": "sidecar", "image": "proxy:2.1"},
-                ],
-            },
-            {
-                "containers": [
-                    {"name": "app", "image": "nginx:1.15"},  # Different version
-                    {"name": "sidecar", "image": "proxy:2.1"},
-                ],
-            },
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_nested_relations_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "owner": {
-                    "team": "team_id1",
-                    "members": ["user1", "user2"],
-                    "metadata": {"role": "admin"},
-                },
-            },
-            {
-                "owner": {
-                    "team": "team_id1",
-                    "members": ["user1", "user2"],
-                    "metadata": {"role": "admin"},
-                },
-            },
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_different_nested_relations_should_be_false() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "owner": {
-                    "team": "team_id1",
-                    "members": ["user1", "user2"],
-                    "metadata": {"role": "admin"},
-                },
-            },
-            {
-                "owner": {
-                    "team": "team_id1",
-                    "members": ["user1", "user3"],  # Different member
-                    "metadata": {"role": "admin"},
-                },
-            },
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_null_properties_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "team": None,
-                "members": ["user1", "user2"],
-                "metadata": {"role": "admin"},
-            },
-            {"members": ["user1", "user2"], "metadata": {"role": "admin"}},
-        )
-        is True
-    )
-
-
-def test_are_entities_fields_equal_null_properties_and_real_data_in_other_entity_should_be_false() -> (
-    None
-):
-    assert (
-        are_entities_fields_equal(
-            {
-                "team": None,
-                "members": ["user1", "user2"],
-                "metadata": {"role": "admin"},
-            },
-            {
-                "team": "team_id1",
-                "members": ["user1", "user2"],
-                "metadata": {"role": "admin"},
-            },
-        )
-        is False
-    )
-
-
-def test_are_entities_fields_equal_null_properties_in_both_should_be_true() -> None:
-    assert (
-        are_entities_fields_equal(
-            {
-                "team": None,
-                "members": ["user1", "user2"],
-                "metadata": {"role": "admin"},
-            },
-            {
-                "team": None,
-                "members": ["user1", "user2"],
-                "metadata": {"role": "admin"},
-            },
-        )
-        is True
-    )
-
-
 def test_are_entities_different_identical_entities_should_be_false() -> None:
     entity1 = create_test_entity(
         "",
@@ -609,3 +342,152 @@ def test_resolve_entities_diff_multiple_entities() -> None:
     assert changed[0] == entity1_modified_properties
     assert changed[1] == entity2
     assert changed[2] == entity_with_search_identifier
+
+
+def test_get_entity_fingerprint_ignores_key_order_team_order_and_null_fields() -> None:
+    first_entity = create_test_entity(
+        "id1",
+        "bp1",
+        {"a": 1, "b": {"c": [1, 2], "d": "x"}, "missing": None},
+        {"r": "e1"},
+        "Title",
+        ["team_b", "team_a"],
+    )
+    second_entity = create_test_entity(
+        "id1",
+        "bp1",
+        {"b": {"d": "x", "c": [1, 2]}, "a": 1},
+        {"r": "e1", "empty": None},
+        "Title",
+        ["team_a", "team_b"],
+    )
+
+    assert get_entity_fingerprint(first_entity) == get_entity_fingerprint(second_entity)
+    assert get_entity_fingerprint(first_entity) != get_entity_fingerprint(
+        create_test_entity("id1", "bp1", {"a": 2}, {}, "Title", [])
+    )
+
+
+OWNER = {
+    "team": "team_id1",
+    "members": ["user1", "user2"],
+    "metadata": {"role": "admin"},
+}
+CONTAINERS = [
+    {"name": "app", "image": "nginx:1.14"},
+    {"name": "sidecar", "image": "proxy:2.1"},
+]
+
+
+@pytest.mark.parametrize(
+    "first_fields,second_fields",
+    [
+        (
+            {"properties": {"totalIssues": 123, "url": "https://test.atlassian.net"}},
+            {"properties": {"url": "https://test.atlassian.net", "totalIssues": 123}},
+        ),
+        (
+            {"properties": {"owner": {**OWNER, "team": None}}},
+            {"properties": {"owner": {**OWNER, "team": None}}},
+        ),
+        (
+            {"properties": {"team": None, "containers": CONTAINERS}},
+            {"properties": {"containers": [dict(c) for c in CONTAINERS]}},
+        ),
+        (
+            {"relations": {"project": "project_id", "reporter": "id1"}},
+            {"relations": {"reporter": "id1", "project": "project_id"}},
+        ),
+        (
+            {"properties": {"created_at": datetime(2024, 3, 20, 10)}},
+            {"properties": {"created_at": datetime(2024, 3, 20, 10)}},
+        ),
+        ({"team": ["team_b", "team_a"]}, {"team": ["team_a", "team_b"]}),
+    ],
+)
+def test_get_entity_fingerprint_of_entities_with_the_same_fields_is_equal(
+    first_fields: dict[str, Any], second_fields: dict[str, Any]
+) -> None:
+    first_entity = Entity(identifier="id1", blueprint="bp1", **first_fields)
+    second_entity = Entity(identifier="id1", blueprint="bp1", **second_fields)
+
+    assert get_entity_fingerprint(first_entity) == get_entity_fingerprint(second_entity)
+
+
+@pytest.mark.parametrize(
+    "first_fields,second_fields",
+    [
+        ({"properties": {"totalIssues": 123}}, {"properties": {"totalIssues": 456}}),
+        (
+            {"properties": {"updated_at": datetime(2024, 3, 21, 15, 30)}},
+            {"properties": {"updated_at": datetime(2024, 3, 22, 9, 45)}},
+        ),
+        (
+            {"properties": {"owner": {**OWNER, "team": None}}},
+            {"properties": {"owner": OWNER}},
+        ),
+        (
+            {"properties": {"owner": OWNER}},
+            {"properties": {"owner": {**OWNER, "members": ["user1", "user3"]}}},
+        ),
+        (
+            {"properties": {"containers": CONTAINERS}},
+            {
+                "properties": {
+                    "containers": [
+                        {**CONTAINERS[0], "image": "nginx:1.15"},
+                        CONTAINERS[1],
+                    ]
+                }
+            },
+        ),
+        ({"relations": {"reporter": "id1"}}, {"relations": {"reporter": "id2"}}),
+        ({"relations": {"reporter": "id1"}}, {"relations": {"assignee": "id1"}}),
+        ({"team": ["team_a"]}, {"team": ["team_a", "team_b"]}),
+    ],
+)
+def test_get_entity_fingerprint_of_entities_with_different_fields_is_different(
+    first_fields: dict[str, Any], second_fields: dict[str, Any]
+) -> None:
+    first_entity = Entity(identifier="id1", blueprint="bp1", **first_fields)
+    second_entity = Entity(identifier="id1", blueprint="bp1", **second_fields)
+
+    assert get_entity_fingerprint(first_entity) != get_entity_fingerprint(second_entity)
+
+
+def test_resolve_entities_diff_ignores_null_fields_missing_on_either_side() -> None:
+    # A null field is the same as a missing one, whether it is null locally or at Port
+    local_entity = create_test_entity(
+        "id1", "bp1", {"a": 1, "unset": None}, {}, "Title"
+    )
+    port_entity = create_test_entity(
+        "id1", "bp1", {"a": 1}, {"unset_relation": None}, "Title"
+    )
+
+    assert resolve_entities_diff([local_entity], [port_entity]) == []
+    assert resolve_entities_diff([port_entity], [local_entity]) == []
+
+
+def test_get_port_diff_matches_entities_by_blueprint_and_identifier() -> None:
+    before = [
+        Entity(identifier="kept", blueprint="service"),
+        Entity(identifier="deleted", blueprint="service"),
+        Entity(identifier="kept", blueprint="team"),
+    ]
+    after = [
+        Entity(identifier="kept", blueprint="service"),
+        Entity(identifier="created", blueprint="service"),
+        Entity(identifier="deleted", blueprint="team"),
+    ]
+
+    diff = get_port_diff(before, after)
+
+    assert [(e.blueprint, e.identifier) for e in diff.created] == [
+        ("service", "created"),
+        ("team", "deleted"),
+    ]
+    assert [(e.blueprint, e.identifier) for e in diff.modified] == [("service", "kept")]
+    assert [(e.blueprint, e.identifier) for e in diff.deleted] == [
+        ("service", "deleted"),
+        ("team", "kept"),
+    ]
@@ -60,6 +60,11 @@ async def search_entities() -> Dict[str, Any]:
     return {"ok": True, "entities": []}
 
 
+@app.router.post("/v1/blueprints/entities/datasource-entities")
+async def search_datasource_entities() -> Dict[str, Any]:
+    return {"ok": True, "entities": []}
+
+
 @app.router.get("/v1/integration/{integration_id}")
 @app.router.patch("/v1/integration/{integration_id}")
 @app.router.patch("/v1/integration/{integration_id}/resync-state")
@@ -154,6 +159,16 @@ async def auth_token() -> Dict[str, Any]:
     }
 
 
+@app.router.delete("/v1/blueprints/{blueprint_id}/bulk/entities")
+async def delete_entities(blueprint_id: str, request: Request) -> Dict[str, Any]:
+    json = await request.json()
+
+    return {
+        "ok": True,
+        "deletedEntities": json["entities"],
+    }
+
+
 @app.router.delete("/v1/blueprints/{blueprint_id}/all-entities")
 async def delete_blueprint(blueprint_id: str, request: Request) -> Dict[str, Any]:
     return {"migrationId": "ZOMG"}
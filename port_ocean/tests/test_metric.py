@@ -1,6 +1,21 @@
 import ast
+import asyncio
+from unittest.mock import MagicMock
+
 import pytest
 
+from port_ocean.config.settings import IntegrationSettings, MetricsSettings
+from port_ocean.context.metric_resource import metric_resource_context
+from port_ocean.context.resource import resource_context
+from port_ocean.core.handlers.port_app_config.models import (
+    EntityMapping,
+    MappingsConfig,
+    PortResourceConfig,
+    ResourceConfig,
+    Selector,
+)
+from port_ocean.helpers.metric.metric import Metrics, MetricResourceKind, SyncState
+
 
 @pytest.mark.metric
 @pytest.mark.skip(reason="Skipping metric test until we have a way to test the metrics")
@@ -178,3 +193,52 @@ def test_metrics() -> None:
         assert (
             obj.get(key, 0) == expected_val
         ), f"Expected {expected_val} for '{key}', got {obj.get(key)}"
+
+
+def _create_resource_config(kind: str) -> ResourceConfig:
+    return ResourceConfig(
+        kind=kind,
+        selector=Selector(query="true"),
+        port=PortResourceConfig(
+            entity=MappingsConfig(
+                mappings=EntityMapping(
+                    identifier=".id", title=".name", blueprint='"service"'
+                )
+            )
+        ),
+    )
+
+
+async def test_sync_state_is_kept_per_resource_kind() -> None:
+    metrics = Metrics(
+        metrics_settings=MetricsSettings(enabled=True),
+        integration_configuration=IntegrationSettings(type="test", identifier="test"),
+        port_client=MagicMock(),
+    )
+    metrics.initialize_metrics(["repository-0", "issue-1"])
+    both_syncing = asyncio.Event()
+    syncing = 0
+
+    async def sync_kind(kind: str, index: int, state: str) -> None:
+        nonlocal syncing
+        async with resource_context(_create_resource_config(kind), index):
+            metrics.sync_state = SyncState.SYNCING
+            syncing += 1
+            if syncing == 2:
+                both_syncing.set()
+            await both_syncing.wait()
+            metrics.sync_state = state
+
+    await asyncio.gather(
+        sync_kind("repository", 0, SyncState.FAILED),
+        sync_kind("issue", 1, SyncState.COMPLETED),
+    )
+    async with metric_resource_context(MetricResourceKind.RECONCILIATION):
+        metrics.sync_state = SyncState.SYNCING
+
+    assert metrics.get_sync_state("repository-0") == SyncState.FAILED
+    assert metrics.get_sync_state("issue-1") == SyncState.COMPLETED
+    assert (
+        metrics.get_sync_state(MetricResourceKind.RECONCILIATION) == SyncState.SYNCING
+    )
+    assert metrics.sync_state == SyncState.PENDING
@@ -0,0 +1,124 @@
+import asyncio
+import multiprocessing
+
+import pytest
+
+from port_ocean.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_bounds_requests_in_flight() -> None:
+    limiter = AdaptiveConcurrencyLimiter(3)
+    max_in_flight = 0
+
+    async def request() -> None:
+        nonlocal max_in_flight
+        async with limiter.acquire() as slot:
+            max_in_flight = max(max_in_flight, limiter.in_flight)
+            await asyncio.sleep(0.01)
+            slot.record(200)
+
+    await asyncio.gather(*(request() for _ in range(20)))
+
+    assert max_in_flight == 3
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_hands_released_slots_to_waiters_in_order() -> (
+    None
+):
+    limiter = AdaptiveConcurrencyLimiter(1)
+    order: list[int] = []
+
+    async def request(index: int) -> None:
+        async with limiter.acquire() as slot:
+            order.append(index)
+            await asyncio.sleep(0)
+            slot.record(200)
+
+    async with limiter.acquire() as slot:
+        requests = [asyncio.create_task(request(index)) for index in range(5)]
+        await asyncio.sleep(0)
+        # A cancelled waiter doesn't hold a slot or the place of the waiters after it
+        requests[1].cancel()
+        slot.record(200)
+    await asyncio.gather(*requests, return_exceptions=True)
+
+    assert order == [0, 2, 3, 4]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_decreases_once_per_burst_of_failures() -> (
+    None
+):
+    limiter = AdaptiveConcurrencyLimiter(8, max_limit=10)
+    async with limiter.acquire() as first_slot:
+        async with limiter.acquire() as second_slot:
+            first_slot.record(429)
+            second_slot.record(503)
+
+    assert limiter.limit == 4
+
+    async with limiter.acquire() as slot:
+        slot.record(500)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_increases_after_successes() -> None:
+    limiter = AdaptiveConcurrencyLimiter(2, max_limit=3)
+
+    for _ in range(10):
+        async with limiter.acquire() as slot:
+            slot.record(200)
+
+    assert limiter.limit == 3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_decreases_on_errors_and_slow_requests() -> (
+    None
+):
+    limiter = AdaptiveConcurrencyLimiter(8, latency_threshold_seconds=0.01)
+
+    with pytest.raises(ValueError):
+        async with limiter.acquire():
+            raise ValueError("request failed")
+    assert limiter.limit == 4
+
+    async with limiter.acquire() as slot:
+        await asyncio.sleep(0.05)
+        slot.record(200)
+    assert limiter.limit == 2
+
+
+def throttled_request_in_forked_process(limiter: AdaptiveConcurrencyLimiter) -> None:
+    async def request() -> None:
+        # The slot held by the parent process is not accounted for in the forked process
+        assert limiter.in_flight == 0
+        async with limiter.acquire() as slot:
+            slot.record(429)
+        assert limiter.limit == 4
+
+    asyncio.run(request())
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_limiter_is_kept_per_process() -> None:
+    limiter = AdaptiveConcurrencyLimiter(8)
+
+    async with limiter.acquire() as slot:
+        process = multiprocessing.get_context("fork").Process(
+            target=throttled_request_in_forked_process, args=(limiter,)
+        )
+        process.start()
+        process.join()
+        assert limiter.in_flight == 1
+        slot.record(200)
+
+    assert process.exitcode == 0
+    assert limiter.limit == 8
+    assert limiter.in_flight == 0
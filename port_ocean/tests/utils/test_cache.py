@@ -3,9 +3,11 @@ import asyncio
 from port_ocean.utils import cache
 import pytest
 from typing import AsyncGenerator, AsyncIterator, List, TypeVar
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
 from port_ocean.cache.memory import InMemoryCacheProvider
+from port_ocean.core.models import Entity
+from port_ocean.helpers.metric.metric import MetricType
 
 
 @pytest.fixture
@@ -18,7 +20,10 @@ def mock_ocean(memory_cache: InMemoryCacheProvider) -> Any:
     return type(
         "MockOcean",
         (),
-        {"app": type("MockApp", (), {"cache_provider": memory_cache})()},
+        {
+            "app": type("MockApp", (), {"cache_provider": memory_cache})(),
+            "initialized": False,
+        },
     )()
 
 
@@ -272,3 +277,219 @@ async def test_cache_failures_dont_affect_execution(
     # Verify that both read and write errors were raised
     assert isinstance(mock_cache_provider.get.side_effect, FailedToReadCacheError)
     assert isinstance(mock_cache_provider.set.side_effect, FailedToWriteCacheError)
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_single_flight(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+    second_batch_allowed = asyncio.Event()
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        yield [0]
+        await second_batch_allowed.wait()
+        for i in range(1, x):
+            yield [i]
+
+    first_caller = sample_iterator(3)
+    second_caller = sample_iterator(3)
+    # Both callers receive the first batch before the iteration finished
+    assert await anext(first_caller) == [0]
+    assert await anext(second_caller) == [0]
+
+    second_batch_allowed.set()
+    assert await collect_iterator_results(first_caller) == [1, 2]
+    assert await collect_iterator_results(second_caller) == [1, 2]
+    assert call_count == 1
+
+    assert await collect_iterator_results(sample_iterator(3)) == [0, 1, 2]
+    assert call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_coroutine_result_single_flight(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_coroutine_result()
+    async def sample_coroutine(x: int) -> int:
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.1)
+        if x < 0:
+            raise ValueError("negative")
+        return x * 2
+
+    results = await asyncio.gather(*(sample_coroutine(2) for _ in range(5)))
+    assert results == [4] * 5
+    assert call_count == 1
+
+    # A failure is raised to every concurrent caller, and isn't cached
+    failures = await asyncio.gather(
+        *(sample_coroutine(-1) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(failure, ValueError) for failure in failures)
+    assert call_count == 2
+    with pytest.raises(ValueError):
+        await sample_coroutine(-1)
+    assert call_count == 3
+
+
+async def collect_iterator_batches(iterator: AsyncIterator[List[T]]) -> List[List[T]]:
+    return [batch async for batch in iterator]
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_preserves_batches(
+    mock_ocean: Any, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        yield [0, 1, 2]
+        yield [3]
+        yield [4]
+
+    original_batches = cache.cache_iterator_result()(sample_iterator)
+    assert await collect_iterator_batches(original_batches(1)) == [[0, 1, 2], [3], [4]]
+    assert await collect_iterator_batches(original_batches(1)) == [[0, 1, 2], [3], [4]]
+    assert call_count == 1
+
+    resized_batches = cache.cache_iterator_result(batch_size=2)(sample_iterator)
+    assert await collect_iterator_batches(resized_batches(2)) == [[0, 1, 2], [3], [4]]
+    assert await collect_iterator_batches(resized_batches(2)) == [[0, 1], [2, 3], [4]]
+    assert call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_iterator_result_missing_batch(
+    mock_ocean: Any, monkeypatch: Any, memory_cache: InMemoryCacheProvider
+) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        nonlocal call_count
+        call_count += 1
+        yield [0, 1]
+        yield [2]
+        yield [3, 4]
+
+    assert await collect_iterator_results(sample_iterator(1)) == [0, 1, 2, 3, 4]
+
+    # The remaining results are fetched again once a cached batch is missing, e.g. after its eviction
+    cache_key = cache.get_cache_key(sample_iterator, (1,), {})
+    await memory_cache.set(cache.get_batch_key(cache_key, 1), None)
+    assert await collect_iterator_batches(sample_iterator(1)) == [[0, 1], [2], [3, 4]]
+    assert call_count == 2
+
+
+def test_hash_func_is_stable() -> None:
+    class Unidentified:
+        pass
+
+    assert cache.hash_func("f", {"a": 1, "b": {2, 3}}) == cache.hash_func(
+        "f", {"b": {3, 2}, "a": 1}
+    )
+    assert cache.hash_func("f", 1) != cache.hash_func("f", "1")
+    assert cache.hash_func("f", 1) != cache.hash_func("f", True)
+    assert cache.hash_func("f", [1, 2]) != cache.hash_func("f", [[1, 2]])
+    assert cache.hash_func(
+        "f", entity=Entity(identifier="id", blueprint="service")
+    ) == cache.hash_func("f", entity=Entity(identifier="id", blueprint="service"))
+
+    # Objects hashed by their address are reported once per function and type
+    cache._warned_address_repr_keys.clear()
+    assert cache.hash_func("f", Unidentified()) != cache.hash_func("f", Unidentified())
+    assert cache._warned_address_repr_keys == {
+        ("f", "test_hash_func_is_stable.<locals>.Unidentified")
+    }
+
+
+@pytest.mark.asyncio
+async def test_cache_coroutine_result_keys(mock_ocean: Any, monkeypatch: Any) -> None:
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    call_count = 0
+
+    class Client:
+        @cache.cache_coroutine_result()
+        async def get_projects(self, organization: str) -> list[str]:
+            nonlocal call_count
+            call_count += 1
+            return [f"{organization}-project"]
+
+    # Calls on different instances don't share the cache
+    client = Client()
+    assert await client.get_projects("org") == ["org-project"]
+    assert await client.get_projects("org") == ["org-project"]
+    assert call_count == 1
+    assert await Client().get_projects("org") == ["org-project"]
+    assert call_count == 2
+
+    class Workspace:
+        def __init__(self, workspace: str) -> None:
+            self.workspace = workspace
+
+        def __cache_key__(self) -> str:
+            return self.workspace
+
+        @cache.cache_coroutine_result()
+        async def get_repositories(self) -> list[str]:
+            nonlocal call_count
+            call_count += 1
+            return [f"{self.workspace}-repository"]
+
+    # Instances with the same __cache_key__ share the cache
+    assert await Workspace("a").get_repositories() == ["a-repository"]
+    assert await Workspace("a").get_repositories() == ["a-repository"]
+    assert call_count == 3
+    assert await Workspace("b").get_repositories() == ["b-repository"]
+    assert call_count == 4
+
+    @cache.cache_coroutine_result(key=lambda options, page: page)
+    async def get_page(options: object, page: int) -> int:
+        nonlocal call_count
+        call_count += 1
+        return page
+
+    assert await get_page(object(), 1) == 1
+    assert await get_page(object(), 1) == 1
+    assert call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_cache_lookup_metrics(mock_ocean: Any, monkeypatch: Any) -> None:
+    mock_ocean.initialized = True
+    mock_ocean.metrics = MagicMock()
+    monkeypatch.setattr(cache, "ocean", mock_ocean)
+
+    @cache.cache_iterator_result()
+    async def sample_iterator(x: int) -> AsyncGenerator[List[int], None]:
+        yield [x]
+
+    await collect_iterator_results(sample_iterator(1))
+    await collect_iterator_results(sample_iterator(1))
+    await collect_iterator_results(sample_iterator(1))
+
+    function = sample_iterator.__qualname__
+    assert [call.args for call in mock_ocean.metrics.inc_metric.call_args_list] == [
+        (MetricType.CACHE_FUNCTION_MISSES_NAME, [function], 1),
+        (MetricType.CACHE_FUNCTION_HITS_NAME, [function], 1),
+        (MetricType.CACHE_FUNCTION_HITS_NAME, [function], 1),
+    ]
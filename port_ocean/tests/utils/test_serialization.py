@@ -0,0 +1,44 @@
+import json
+from typing import Any, Generator
+
+import pytest
+
+from port_ocean.clients.port.mixins.entities import EntityClientMixin
+from port_ocean.core.models import Entity
+from port_ocean.utils import serialization
+
+
+@pytest.fixture
+def restore_json_dumps() -> Generator[None, None, None]:
+    json_dumps = serialization.get_json_dumps()
+    yield
+    serialization.set_json_dumps(json_dumps)
+
+
+def test_stdlib_dumps_is_compact_utf8() -> None:
+    payload = {"identifier": "service-é", "properties": {"tags": ["a", "b"]}}
+
+    result = serialization.stdlib_dumps(payload)
+
+    assert (
+        result == '{"identifier":"service-é","properties":{"tags":["a","b"]}}'.encode()
+    )
+    assert json.loads(result) == payload
+
+
+def test_entities_are_serialized_with_the_configured_encoder(
+    restore_json_dumps: None,
+) -> None:
+    encoded: list[Any] = []
+
+    def json_dumps(obj: Any) -> bytes:
+        encoded.append(obj)
+        return serialization.stdlib_dumps(obj)
+
+    serialization.set_json_dumps(json_dumps)
+    entity = Entity(identifier="service", blueprint="microservice")
+
+    result = EntityClientMixin._serialize_entity(entity)
+
+    assert encoded == [{"identifier": "service", "blueprint": "microservice"}]
+    assert json.loads(result) == encoded[0]
@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import pytest
+
+from port_ocean.exceptions.utils import WorkerTaskFailedException
+from port_ocean.utils.worker_pool import SubprocessWorkerPool
+
+
+async def get_pid() -> int:
+    return os.getpid()
+
+
+async def add(a: int, b: int) -> int:
+    return a + b
+
+
+async def fail() -> None:
+    raise ValueError("task failed")
+
+
+async def crash() -> None:
+    os._exit(1)
+
+
+HANDLERS: dict[str, Any] = {
+    "get_pid": get_pid,
+    "add": add,
+    "fail": fail,
+    "crash": crash,
+}
+
+
+@pytest.fixture(autouse=True)
+def fork_start_method() -> None:
+    multiprocessing.set_start_method("fork", True)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_reuses_worker_between_tasks() -> None:
+    pool = SubprocessWorkerPool(HANDLERS)
+    try:
+        first_pid = await pool.run("get_pid", default=0)
+        second_pid = await pool.run("get_pid", default=0)
+        assert await pool.run("add", 1, 2, default=0) == 3
+    finally:
+        await pool.close()
+
+    assert first_pid != 0
+    assert first_pid != os.getpid()
+    assert first_pid == second_pid
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_returns_default_when_task_fails() -> None:
+    pool = SubprocessWorkerPool(HANDLERS)
+    try:
+        pid = await pool.run("get_pid", default=0)
+        assert await pool.run("fail", default="failed") == "failed"
+        assert await pool.run("get_pid", default=0) == pid
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_replaces_dead_worker() -> None:
+    pool = SubprocessWorkerPool(HANDLERS)
+    try:
+        pid = await pool.run("get_pid", default=0)
+        assert await pool.run("crash", default="crashed") == "crashed"
+        new_pid = await pool.run("get_pid", default=0)
+    finally:
+        await pool.close()
+
+    assert new_pid != 0
+    assert new_pid != pid
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_recycles_worker_after_max_tasks() -> None:
+    pool = SubprocessWorkerPool(HANDLERS, max_tasks_per_worker=2)
+    try:
+        pids = [await pool.run("get_pid", default=0) for _ in range(4)]
+    finally:
+        await pool.close()
+
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[0] != pids[2]
+
+
+async def stream_items(count: int) -> AsyncIterator[int]:
+    for item in range(count):
+        yield item
+
+
+async def fail_while_streaming() -> AsyncIterator[int]:
+    yield 0
+    raise ValueError("stream failed")
+
+
+STREAM_HANDLERS: dict[str, Any] = {
+    **HANDLERS,
+    "stream_items": stream_items,
+    "fail_while_streaming": fail_while_streaming,
+}
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_streams_handler_items() -> None:
+    pool = SubprocessWorkerPool(STREAM_HANDLERS)
+    try:
+        items = [item async for item in pool.stream("stream_items", 5)]
+        pid = await pool.run("get_pid", default=0)
+        assert await pool.run("get_pid", default=0) == pid
+    finally:
+        await pool.close()
+
+    assert items == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_stream_raises_when_handler_fails() -> None:
+    pool = SubprocessWorkerPool(STREAM_HANDLERS)
+    items = []
+    try:
+        with pytest.raises(WorkerTaskFailedException):
+            async for item in pool.stream("fail_while_streaming"):
+                items.append(item)
+        assert [item async for item in pool.stream("stream_items", 2)] == [0, 1]
+    finally:
+        await pool.close()
+
+    assert items == [0]
+
+
+async def wait_forever() -> AsyncIterator[int]:
+    yield os.getpid()
+    await asyncio.sleep(60)
+    yield 1
+
+
+def record_finalized(path: Path) -> None:
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_finalizer_when_worker_stops(tmp_path: Path) -> None:
+    finalized_path = tmp_path / "finalized"
+    pool = SubprocessWorkerPool(
+        {**HANDLERS, "wait_forever": wait_forever},
+        finalizer=functools.partial(record_finalized, finalized_path),
+    )
+    try:
+        # Leaving the stream early terminates the worker running it
+        async with aclosing(pool.stream("wait_forever")) as items:
+            terminated_pid = await anext(items)
+        assert finalized_path.read_text().split() == [str(terminated_pid)]
+        stopped_pid = await pool.run("get_pid", default=0)
+    finally:
+        await pool.close()
+
+    assert finalized_path.read_text().split() == [
+        str(terminated_pid),
+        str(stopped_pid),
+    ]
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+
+
+class ConcurrencySlot:
+    def __init__(self, started_at: float) -> None:
+        self.started_at = started_at
+        self.status_code: int | None = None
+
+    def record(self, status_code: int) -> None:
+        """Record the status code of the request made with the slot, it drives the adaptation of the limit."""
+        self.status_code = status_code
+
+    @property
+    def is_overloaded(self) -> bool:
+        return self.status_code is not None and (
+            self.status_code == 429 or self.status_code >= 500
+        )
+
+
+class AdaptiveConcurrencyLimiter:
+    """Bound the number of requests in flight with a limit adapted by AIMD (additive increase, multiplicative decrease).
+
+    The limit grows by one once a full limit worth of requests succeeded under the latency threshold, and is
+    multiplied by `decrease_factor` when a request is throttled (429), fails on the server side (5xx), raises or
+    is slower than the latency threshold. Only requests started after the last decrease can decrease the limit
+    again, so a burst of failures of the requests already in flight halves it once. Requests waiting for a slot
+    get it in the order they asked for it, as soon as a slot is released or the limit grows.
+
+    The state is kept per process. A process forked after the limiter was created (e.g. a multi process resync
+    worker) starts from the current limit with no request in flight, so a worker terminated mid-request can't leak
+    slots or a held lock to the other processes.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        latency_threshold_seconds: float | None = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self._min_limit = min_limit
+        self._max_limit = max_limit if max_limit is not None else initial_limit
+        self._latency_threshold_seconds = latency_threshold_seconds
+        self._decrease_factor = decrease_factor
+        self._limit = initial_limit
+        self._reset_process_state()
+
+    def _reset_process_state(self) -> None:
+        self._pid = os.getpid()
+        self._in_flight = 0
+        self._successes = 0
+        self._last_decrease_at = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def _ensure_process_state(self) -> None:
+        # The requests in flight of the parent process are not owned by a forked process
+        if self._pid != os.getpid():
+            self._reset_process_state()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        self._ensure_process_state()
+        return self._in_flight
+
+    def _try_acquire(self) -> bool:
+        self._ensure_process_state()
+        # Waiting requests come first, so a new request can't take the slot released for them
+        if self._waiters or self._in_flight >= self._limit:
+            return False
+        self._in_flight += 1
+        return True
+
+    def _wake_waiters(self) -> None:
+        # The slot is handed over to the waiter, so it is accounted for before the waiter runs
+        while self._waiters and self._in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _release(self, slot: ConcurrencySlot, failed: bool) -> None:
+        latency = time.monotonic() - slot.started_at
+        is_slow = (
+            self._latency_threshold_seconds is not None
+            and latency > self._latency_threshold_seconds
+        )
+        self._in_flight -= 1
+        if failed or slot.is_overloaded or is_slow:
+            if slot.started_at >= self._last_decrease_at:
+                previous_limit = self._limit
+                self._limit = max(
+                    self._min_limit, int(previous_limit * self._decrease_factor)
+                )
+                self._last_decrease_at = time.monotonic()
+                self._successes = 0
+                logger.warning(
+                    f"Decreased concurrency limit from {previous_limit} to {self._limit}",
+                    status_code=slot.status_code,
+                    latency=latency,
+                )
+        elif slot.status_code is not None:
+            self._successes += 1
+            if self._successes >= self._limit and self._limit < self._max_limit:
+                self._limit += 1
+                self._successes = 0
+        self._wake_waiters()
+
+    async def _wait(self) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled after the slot was handed over, so it goes to the next waiter
+                self._in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ConcurrencySlot]:
+        """Wait for a free slot, the outcome recorded on the slot adapts the limit once it is released."""
+        if not self._try_acquire():
+            await self._wait()
+
+        slot = ConcurrencySlot(time.monotonic())
+        failed = False
+        try:
+            yield slot
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(slot, failed)
@@ -1,29 +1,218 @@
+import asyncio
+import dataclasses
 import functools
 import hashlib
 import base64
-from typing import Callable, AsyncIterator, Awaitable, Any
+import inspect
+import json
+import re
+from enum import Enum
+from typing import Callable, AsyncGenerator, AsyncIterator, Awaitable, Any, NamedTuple
+
+from pydantic import BaseModel
+
 from port_ocean.cache.errors import FailedToReadCacheError, FailedToWriteCacheError
 from port_ocean.context.ocean import ocean
+from port_ocean.helpers.metric.metric import MetricType
 from loguru import logger
 
 AsyncIteratorCallable = Callable[..., AsyncIterator[list[Any]]]
 AsyncCallable = Callable[..., Awaitable[Any]]
+KeyFunc = Callable[..., Any]
+
+# The default repr of an object contains its address, so it changes between instances and processes
+ADDRESS_REPR_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+_warned_address_repr_keys: set[tuple[str, str]] = set()
+
+
+class CachedBatches(NamedTuple):
+    """Cached under the key of an iterator function call once all its batches are cached, each under its own key."""
+
+    batch_count: int
+
+
+def get_batch_key(cache_key: str, index: int) -> str:
+    return f"{cache_key}-{index}"
+
+
+def _to_key_part(value: Any, function_name: str) -> Any:
+    """Convert an argument that isn't JSON serializable to a value identifying it for the cache key."""
+    value_type = type(value)
+    if isinstance(value, (set, frozenset)):
+        key_part: Any = sorted(_dumps_key(item, function_name) for item in value)
+    elif isinstance(value, Enum):
+        key_part = value.value
+    elif isinstance(value, BaseModel):
+        key_part = value.dict()
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        key_part = dataclasses.asdict(value)
+    elif isinstance(value, (bytes, bytearray)):
+        key_part = value.hex()
+    elif isinstance(value, type):
+        key_part = f"{value.__module__}.{value.__qualname__}"
+    else:
+        key_part = repr(value)
+        if ADDRESS_REPR_PATTERN.search(key_part):
+            warned_key = (function_name, value_type.__qualname__)
+            if warned_key not in _warned_address_repr_keys:
+                _warned_address_repr_keys.add(warned_key)
+                logger.warning(
+                    f"The cache key of {function_name} depends on the address of a {value_type.__qualname__} "
+                    "argument, so calls with other instances won't hit the cache. Define a __repr__ for it or pass "
+                    "a key function to the cache decorator"
+                )
+    return {"__type__": value_type.__qualname__, "value": key_part}
+
+
+def _dumps_key(value: Any, function_name: str) -> str:
+    """Serialize the value by its content, dicts by sorted keys, so equal values serialize the same across processes."""
+    try:
+        return json.dumps(
+            value,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=functools.partial(_to_key_part, function_name=function_name),
+        )
+    except (TypeError, ValueError):
+        # Dicts with keys that can't be sorted or serialized
+        return repr(value)
 
 
 def hash_func(function_name: str, *args: Any, **kwargs: Any) -> str:
-    args_str = str(args)
-    kwargs_str = str(kwargs)
-    concatenated_string = args_str + kwargs_str
-    hash_object = hashlib.sha256(concatenated_string.encode())
+    """Cache key of a call of the function, from a hash of the content of its arguments."""
+    key = _dumps_key([args, kwargs], function_name)
+    hash_object = hashlib.sha256(key.encode("utf-8", "surrogatepass"))
     short_hash = base64.urlsafe_b64encode(hash_object.digest()[:8]).decode("ascii")
     short_hash = short_hash.rstrip("=").replace("-", "_").replace("+", "_")
     return f"{function_name}_{short_hash}"
 
 
-def cache_iterator_result() -> Callable[[AsyncIteratorCallable], AsyncIteratorCallable]:
+def _get_instance_key_part(instance: Any) -> Any:
+    """Identify the instance a decorated method is called on.
+
+    An instance defining `__cache_key__` is identified by its return value, so the instances it returns the same
+    value for share the cache. An instance with the default repr is identified by its address, otherwise by its
+    content like the other arguments.
+    """
+    instance_type = type(instance)
+    get_instance_key = getattr(instance, "__cache_key__", None)
+    if get_instance_key is not None:
+        return {"__type__": instance_type.__qualname__, "value": get_instance_key()}
+    if instance_type.__repr__ is object.__repr__:
+        return {"__type__": instance_type.__qualname__, "value": id(instance)}
+    return instance
+
+
+@functools.lru_cache(maxsize=None)
+def _is_method(func: Callable[..., Any]) -> bool:
+    try:
+        parameters = list(inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        return False
+    return bool(parameters) and parameters[0] == "self"
+
+
+def get_cache_key(
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    key: KeyFunc | None = None,
+) -> str:
+    """Cache key of a call of a decorated function.
+
+    The key is derived from the value returned by `key` for the call when provided. Otherwise it is derived from
+    the arguments, where the instance of a method is identified as described in `_get_instance_key_part`.
+    """
+    function_id = f"{func.__module__}.{func.__qualname__}"
+    if key is not None:
+        return hash_func(func.__name__, function_id, key(*args, **kwargs))
+    if args and _is_method(func):
+        args = (_get_instance_key_part(args[0]), *args[1:])
+    return hash_func(func.__name__, function_id, *args, **kwargs)
+
+
+def _record_cache_lookup(func: Callable[..., Any], hit: bool) -> None:
+    if not ocean.initialized:
+        return
+    ocean.metrics.inc_metric(
+        (
+            MetricType.CACHE_FUNCTION_HITS_NAME
+            if hit
+            else MetricType.CACHE_FUNCTION_MISSES_NAME
+        ),
+        [func.__qualname__],
+        1,
+    )
+
+
+class _InFlightIteration:
+    """The batches of a cached iterator function being fetched, shared by its concurrent callers.
+
+    The function is iterated by a task, so a caller leaving early doesn't stop the iteration of the others. The
+    task is cancelled once every caller left before the iteration finished.
+    """
+
+    def __init__(self) -> None:
+        self.batches: list[list[Any]] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.task: asyncio.Task[None] | None = None
+        self._subscribers = 0
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def publish(self, batch: list[Any]) -> None:
+        self.batches.append(batch)
+        self._notify()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    async def stream(self) -> AsyncGenerator[list[Any], None]:
+        """Yield the batches fetched so far, then the next ones as they arrive."""
+        self._subscribers += 1
+        try:
+            index = 0
+            while True:
+                if index < len(self.batches):
+                    yield self.batches[index]
+                    index += 1
+                elif self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                else:
+                    await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if not self._subscribers and not self.done and self.task is not None:
+                self.task.cancel()
+
+
+# Iterations and coroutines being fetched by cache key, the concurrent callers of a cached function wait for the
+# same execution instead of calling the function again before its result is cached
+_in_flight_iterations: dict[str, _InFlightIteration] = {}
+_in_flight_coroutines: dict[str, asyncio.Task[Any]] = {}
+
+
+def cache_iterator_result(
+    ttl: float | None = None,
+    batch_size: int | None = None,
+    key: KeyFunc | None = None,
+) -> Callable[[AsyncIteratorCallable], AsyncIteratorCallable]:
     """
     This decorator caches the results of an async iterator function. It checks if the result is already in the cache
-    and if not, it fetches the all the data and caches it at the end of the iteration.
+    and if not, it fetches the all the data and caches it batch by batch.
+
+    Cached results are yielded in the batches the function yielded them, or in batches of `batch_size` items when
+    provided. Each batch is cached under its own key, so a disk cache only loads one batch at a time.
 
     The cache will be stored in the scope of the running event and will be removed when the event is finished.
     If a database is configured, the cache will also be stored in the database.
@@ -33,6 +222,15 @@ def cache_iterator_result() -> Callable[[AsyncIteratorCallable], AsyncIteratorCa
 
     The caching mechanism also detects changes in parameters.
     If a function is called with different parameter values, it will be stored in different hash keys for each unique call.
+    The arguments are hashed by their content. The instance of a decorated method is part of the key, so calls on
+    different instances don't share the cache unless the class defines a `__cache_key__` method returning the
+    same value for them. When the arguments can't identify the call (e.g. objects without a __repr__), `key` is
+    called with the arguments of the call and its return value is hashed instead.
+
+    Concurrent calls with the same parameters iterate the function once, the callers joining an iteration in progress
+    receive the batches already fetched and then the next ones as they arrive.
+
+    When `ttl` is provided, the cached results expire after `ttl` seconds (if the cache provider supports it).
 
     Usage:
     ```python
@@ -45,38 +243,134 @@ def cache_iterator_result() -> Callable[[AsyncIteratorCallable], AsyncIteratorCa
     def decorator(func: AsyncIteratorCallable) -> AsyncIteratorCallable:
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            cache_key = hash_func(func.__name__, *args, **kwargs)
+            cache_key = get_cache_key(func, args, kwargs, key)
 
             # Check if the result is already in the cache
+            replayed_items = 0
             try:
-                if cache := await ocean.app.cache_provider.get(cache_key):
+                cache = await ocean.app.cache_provider.get(cache_key)
+                if isinstance(cache, CachedBatches):
+                    for index in range(cache.batch_count):
+                        batch = await ocean.app.cache_provider.get(
+                            get_batch_key(cache_key, index)
+                        )
+                        if batch is None:
+                            logger.warning(
+                                f"Batch {index} of the cached results of {cache_key} is missing, "
+                                "fetching the remaining results"
+                            )
+                            break
+                        if not index:
+                            _record_cache_lookup(func, hit=True)
+                        yield batch
+                        replayed_items += len(batch)
+                    else:
+                        if not cache.batch_count:
+                            _record_cache_lookup(func, hit=True)
+                        return
+                elif cache:
+                    # Cached in a single batch by an earlier version
+                    _record_cache_lookup(func, hit=True)
                     yield cache
                     return
             except FailedToReadCacheError as e:
                 logger.warning(f"Failed to read cache for {cache_key}: {str(e)}")
 
-            # If not in cache, fetch the data
-            cached_results = list()
-            async for result in func(*args, **kwargs):
-                cached_results.extend(result)
-                yield result
+            # If not in cache, fetch the data, or stream the batches of the caller already fetching it
+            in_flight = _in_flight_iterations.get(cache_key)
+            if not replayed_items:
+                _record_cache_lookup(func, hit=in_flight is not None)
+            if in_flight is None:
+                in_flight = _InFlightIteration()
+                _in_flight_iterations[cache_key] = in_flight
+                in_flight.task = asyncio.create_task(
+                    fetch_results(in_flight, cache_key, *args, **kwargs)
+                )
+
+            batches = in_flight.stream()
+            try:
+                async for result in batches:
+                    # Skip the results already yielded from the cache before a batch was found missing
+                    if replayed_items:
+                        skipped = min(replayed_items, len(result))
+                        replayed_items -= skipped
+                        result = result[skipped:]
+                        if not result:
+                            continue
+                    yield result
+            finally:
+                await batches.aclose()
 
-            # Cache the results
+        async def cache_batch(cache_key: str, index: int, batch: list[Any]) -> bool:
             try:
                 await ocean.app.cache_provider.set(
-                    cache_key,
-                    cached_results,
+                    get_batch_key(cache_key, index), batch, ttl=ttl
                 )
+                return True
             except FailedToWriteCacheError as e:
                 logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
-            return
+                return False
+
+        async def fetch_results(
+            in_flight: _InFlightIteration, cache_key: str, *args: Any, **kwargs: Any
+        ) -> None:
+            batch_count = 0
+            is_caching = True
+            pending_results: list[Any] = []
+            try:
+                async for result in func(*args, **kwargs):
+                    in_flight.publish(result)
+                    if not is_caching:
+                        continue
+
+                    pending_results.extend(result)
+                    while pending_results and (
+                        batch_size is None or len(pending_results) >= batch_size
+                    ):
+                        size = batch_size or len(pending_results)
+                        batch = pending_results[:size]
+                        del pending_results[:size]
+                        is_caching = await cache_batch(cache_key, batch_count, batch)
+                        batch_count += 1
+                        if not is_caching:
+                            break
+
+                # Cache the remaining results, then the manifest making the cached batches visible
+                if is_caching and pending_results:
+                    is_caching = await cache_batch(
+                        cache_key, batch_count, pending_results
+                    )
+                    batch_count += 1
+                if is_caching:
+                    try:
+                        await ocean.app.cache_provider.set(
+                            cache_key,
+                            CachedBatches(batch_count),
+                            ttl=ttl,
+                        )
+                    except FailedToWriteCacheError as e:
+                        logger.warning(
+                            f"Failed to write cache for {cache_key}: {str(e)}"
+                        )
+            except BaseException as e:
+                in_flight.finish(e)
+                if not isinstance(e, Exception):
+                    raise
+            else:
+                in_flight.finish()
+            finally:
+                if _in_flight_iterations.get(cache_key) is in_flight:
+                    del _in_flight_iterations[cache_key]
 
         return wrapper
 
     return decorator
 
 
-def cache_coroutine_result() -> Callable[[AsyncCallable], AsyncCallable]:
+def cache_coroutine_result(
+    ttl: float | None = None,
+    key: KeyFunc | None = None,
+) -> Callable[[AsyncCallable], AsyncCallable]:
     """Coroutine version of `cache_iterator_result` from port_ocean.utils.cache
 
     Decorator that caches the result of a coroutine function.
@@ -86,6 +380,9 @@ def cache_coroutine_result() -> Callable[[AsyncCallable], AsyncCallable]:
     The cache is stored in the scope of the running event and is
     removed when the event is finished.
     If a database is configured, the cache will also be stored in the database.
+    Concurrent calls with the same parameters await a single execution of the function.
+    When `ttl` is provided, the result expires after `ttl` seconds.
+    When `key` is provided, the cache key is derived from its return value for the arguments of the call.
 
     Usage:
     ```python
@@ -98,23 +395,46 @@ def cache_coroutine_result() -> Callable[[AsyncCallable], AsyncCallable]:
     def decorator(func: AsyncCallable) -> AsyncCallable:
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            cache_key = hash_func(func.__name__, *args, **kwargs)
+            cache_key = get_cache_key(func, args, kwargs, key)
             try:
                 if cache := await ocean.app.cache_provider.get(cache_key):
+                    _record_cache_lookup(func, hit=True)
                     return cache
             except FailedToReadCacheError as e:
                 logger.warning(f"Failed to read cache for {cache_key}: {str(e)}")
 
+            # Wait for the caller already fetching the result, the fetch isn't cancelled with a waiting caller
+            in_flight = _in_flight_coroutines.get(cache_key)
+            _record_cache_lookup(func, hit=in_flight is not None)
+            if in_flight is None:
+                in_flight = asyncio.create_task(
+                    fetch_result(cache_key, *args, **kwargs)
+                )
+                _in_flight_coroutines[cache_key] = in_flight
+                in_flight.add_done_callback(
+                    functools.partial(forget_in_flight, cache_key)
+                )
+            return await asyncio.shield(in_flight)
+
+        async def fetch_result(cache_key: str, *args: Any, **kwargs: Any) -> Any:
             result = await func(*args, **kwargs)
             try:
                 await ocean.app.cache_provider.set(
                     cache_key,
                     result,
+                    ttl=ttl,
                 )
             except FailedToWriteCacheError as e:
                 logger.warning(f"Failed to write cache for {cache_key}: {str(e)}")
             return result
 
+        def forget_in_flight(cache_key: str, task: asyncio.Task[Any]) -> None:
+            if _in_flight_coroutines.get(cache_key) is task:
+                del _in_flight_coroutines[cache_key]
+            # Every caller may have left before the fetch failed
+            if not task.cancelled():
+                task.exception()
+
         return wrapper
 
     return decorator
@@ -0,0 +1,45 @@
+import json
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Callable
+
+JsonDumps = Callable[[Any], bytes]
+
+JSON_CONTENT_TYPE_HEADERS = {"Content-Type": "application/json"}
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+orjson_dumps: JsonDumps | None = None
+# orjson is an optional dependency (the orjson extra), the standard library is used when it is not installed
+if find_spec("orjson") is not None:
+    orjson = import_module("orjson")
+
+    def _orjson_dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Values orjson doesn't support (e.g. integers larger than 64 bits) are left to the standard library
+            return stdlib_dumps(obj)
+
+    orjson_dumps = _orjson_dumps
+
+
+_dumps: JsonDumps = orjson_dumps or stdlib_dumps
+
+
+def set_json_dumps(json_dumps: JsonDumps) -> None:
+    """Replace the encoder of the request bodies sent to Port, it must return the compact UTF-8 bytes of the document."""
+    global _dumps
+    _dumps = json_dumps
+
+
+def get_json_dumps() -> JsonDumps:
+    return _dumps
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize a request body sent to Port with the configured encoder."""
+    return _dumps(obj)
@@ -0,0 +1,289 @@
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from contextlib import aclosing
+from types import FrameType
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Coroutine, TypeVar
+
+from loguru import logger
+
+from port_ocean.exceptions.utils import WorkerTaskFailedException
+
+T = TypeVar("T")
+
+WorkerHandler = Callable[..., Coroutine[Any, Any, Any] | AsyncIterator[Any]]
+
+WORKER_SHUTDOWN_TIMEOUT_SECONDS = 10
+
+_ITEM = "item"
+_DONE = "done"
+_FAILED = "failed"
+
+
+async def _execute_task(
+    connection: Connection, handler: WorkerHandler, args: tuple[Any, ...]
+) -> tuple[str, Any]:
+    result = handler(*args)
+    if isinstance(result, Coroutine):
+        return _DONE, await result
+
+    # Items are sent as soon as they are produced, so neither side holds the whole result at once
+    async for item in result:
+        connection.send((_ITEM, item))
+    return _DONE, None
+
+
+async def _serve(
+    connection: Connection,
+    handlers: dict[str, WorkerHandler],
+    initializer: Callable[[], None] | None,
+) -> None:
+    # The initializer runs in the context of this task, so every context bound resource it creates
+    # (e.g. http clients) is inherited by all the tasks the worker executes
+    if initializer is not None:
+        initializer()
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while True:
+            try:
+                message = await loop.run_in_executor(executor, connection.recv)
+            except EOFError:
+                return
+            if message is None:
+                return
+
+            handler_name, args = message
+            try:
+                response = await _execute_task(connection, handlers[handler_name], args)
+            except Exception:
+                logger.exception(f"Worker task {handler_name} failed")
+                response = (_FAILED, None)
+
+            try:
+                connection.send(response)
+            except Exception:
+                logger.exception(
+                    f"Failed to send the result of worker task {handler_name}"
+                )
+                connection.send((_FAILED, None))
+
+
+def _worker_main(
+    connection: Connection,
+    handlers: dict[str, WorkerHandler],
+    initializer: Callable[[], None] | None,
+    finalizer: Callable[[], None] | None,
+    inherited_connections: list[Connection],
+) -> None:
+    # Close the pool ends of the pipes inherited from the parent, so the worker sees EOF
+    # and exits when the parent process goes away
+    for inherited_connection in inherited_connections:
+        inherited_connection.close()
+
+    if finalizer is not None:
+        # A worker terminated by the pool (e.g. on abort) still runs its finalizer before exiting
+        def terminate(signum: int, frame: FrameType | None) -> None:
+            finalizer()
+            os._exit(128 + signum)
+
+        signal.signal(signal.SIGTERM, terminate)
+
+    logger.info("Worker process started successfully")
+    try:
+        asyncio.run(_serve(connection, handlers, initializer))
+    finally:
+        if finalizer is not None:
+            finalizer()
+    logger.info("Worker process finished")
+
+
+class _Worker:
+    def __init__(
+        self, process: multiprocessing.Process, connection: Connection
+    ) -> None:
+        self.process = process
+        self.connection = connection
+        self.tasks_count = 0
+
+
+class SubprocessWorkerPool:
+    """A pool of long-lived worker processes executing async handlers.
+
+    Workers are forked lazily from the current process on demand, so they inherit its state (port client
+    authentication, integration clients, caches) and keep their event loop, connection pools and compiled
+    programs warm between the tasks they execute, while the memory of the tasks stays isolated from the
+    current process.
+
+    The handlers are resolved by name in the worker, arguments and results are pickled over a pipe.
+    Handlers returning an async generator stream their items to the caller while they run.
+    A worker is replaced after `max_tasks_per_worker` tasks or when it dies. The `finalizer` runs in a worker
+    when it stops, including when it is terminated, to release what its tasks started (e.g. process pools).
+
+    Workers are always forked with the context the pool was created in, so the context of the task that
+    happened to start a worker (e.g. its logger bindings) doesn't leak into the tasks of other callers.
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, WorkerHandler],
+        size: int = 1,
+        initializer: Callable[[], None] | None = None,
+        max_tasks_per_worker: int | None = None,
+        finalizer: Callable[[], None] | None = None,
+    ) -> None:
+        self._handlers = handlers
+        self._size = max(1, size)
+        self._initializer = initializer
+        self._finalizer = finalizer
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._workers: list[_Worker] = []
+        self._idle_workers: asyncio.Queue[_Worker] = asyncio.Queue()
+        # Each running task blocks a thread while waiting for its worker
+        self._executor = ThreadPoolExecutor(max_workers=self._size)
+        self._closed = False
+        self._context = contextvars.copy_context()
+
+    def _start_worker(self) -> _Worker:
+        parent_connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(
+                child_connection,
+                self._handlers,
+                self._initializer,
+                self._finalizer,
+                [parent_connection, *(worker.connection for worker in self._workers)],
+            ),
+            # Not a daemon, so the tasks can use process pools of their own (e.g. the JQ process pool)
+            daemon=False,
+        )
+        self._context.run(process.start)
+        child_connection.close()
+        worker = _Worker(process, parent_connection)
+        self._workers.append(worker)
+        logger.info(f"Started worker process {process.pid}")
+        return worker
+
+    async def _acquire(self) -> _Worker:
+        if self._idle_workers.empty() and len(self._workers) < self._size:
+            return self._start_worker()
+        return await self._idle_workers.get()
+
+    async def _stop_worker(self, worker: _Worker, graceful: bool = True) -> None:
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if graceful and worker.process.is_alive():
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, worker.process.join, WORKER_SHUTDOWN_TIMEOUT_SECONDS
+            )
+        if worker.process.is_alive():
+            worker.process.terminate()
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, worker.process.join, WORKER_SHUTDOWN_TIMEOUT_SECONDS
+            )
+        if worker.process.is_alive():
+            # The worker is stuck (e.g. in its finalizer), so it can't be left behind
+            worker.process.kill()
+        worker.connection.close()
+        worker.process.join()
+        logger.info(
+            f"Worker process {worker.process.pid} stopped with exit code {worker.process.exitcode}"
+        )
+
+    async def _release(self, worker: _Worker, healthy: bool) -> None:
+        worker.tasks_count += 1
+        if (
+            not healthy
+            or self._closed
+            or (
+                self._max_tasks_per_worker is not None
+                and worker.tasks_count >= self._max_tasks_per_worker
+            )
+        ):
+            await self._stop_worker(worker, graceful=healthy)
+            return
+        self._idle_workers.put_nowait(worker)
+
+    async def _execute(
+        self, handler_name: str, args: tuple[Any, ...]
+    ) -> AsyncGenerator[tuple[bool, Any], None]:
+        """Yield (False, item) for every streamed item of the task and then (True, result)."""
+        if self._closed:
+            raise RuntimeError("Cannot run tasks on a closed worker pool")
+
+        loop = asyncio.get_running_loop()
+        worker = await self._acquire()
+        # The worker is only reused once it is known to be waiting for its next task
+        healthy = False
+        try:
+            await loop.run_in_executor(
+                self._executor, worker.connection.send, (handler_name, args)
+            )
+            while True:
+                status, payload = await loop.run_in_executor(
+                    self._executor, worker.connection.recv
+                )
+                if status == _ITEM:
+                    yield False, payload
+                    continue
+
+                healthy = True
+                if status == _FAILED:
+                    raise WorkerTaskFailedException(
+                        f"Worker task {handler_name} failed"
+                    )
+                yield True, payload
+                return
+        except WorkerTaskFailedException:
+            raise
+        except (EOFError, OSError) as e:
+            raise WorkerTaskFailedException(
+                f"Worker process {worker.process.pid} died while running {handler_name}: {e}"
+            ) from e
+        except Exception as e:
+            raise WorkerTaskFailedException(
+                f"Failed to exchange {handler_name} task with worker process {worker.process.pid}: {e}"
+            ) from e
+        finally:
+            await self._release(worker, healthy)
+
+    async def stream(self, handler_name: str, *args: Any) -> AsyncGenerator[Any, None]:
+        """
+        Execute an async generator handler in one of the workers and yield its items as they arrive.
+        Raises WorkerTaskFailedException when the handler fails or its worker dies.
+        """
+        async with aclosing(self._execute(handler_name, args)) as messages:
+            async for is_result, payload in messages:
+                if not is_result:
+                    yield payload
+
+    async def run(self, handler_name: str, *args: Any, default: T) -> T:
+        """
+        Execute the handler in one of the workers and return its result.
+        The default is returned when the handler fails or its worker dies.
+        """
+        try:
+            async with aclosing(self._execute(handler_name, args)) as messages:
+                async for is_result, payload in messages:
+                    if is_result:
+                        return payload
+        except WorkerTaskFailedException as e:
+            logger.error(str(e))
+        return default
+
+    async def close(self) -> None:
+        self._closed = True
+        await asyncio.gather(
+            *(self._stop_worker(worker) for worker in list(self._workers)),
+            return_exceptions=True,
+        )
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark of the disk cache provider against the previous synchronous implementation.
+
+For every size, a cached iterator result of that many items is written and read back, while a ticker task measures
+the longest time the event loop was blocked (the stall a webhook or a health check would wait for).
+
+Usage:
+    python ./scripts/benchmark-disk-cache.py [sizes...]
+"""
+
+import asyncio
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from port_ocean.cache.disk import DiskCacheProvider
+
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+TICK_SECONDS = 0.001
+
+
+class SynchronousDiskCacheProvider:
+    """The disk cache provider before the file I/O was moved out of the event loop."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self._cache_dir = Path(cache_dir)
+
+    async def get(self, key: str) -> Any:
+        with open(self._cache_dir / f"{key}.pkl", "rb") as f:
+            return pickle.load(f)
+
+    async def set(self, key: str, value: Any) -> None:
+        with open(self._cache_dir / f"{key}.pkl", "wb") as f:
+            pickle.dump(value, f)
+
+
+def create_items(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": index,
+            "name": f"repository-{index}",
+            "url": f"https://example.com/org/repository-{index}",
+            "topics": ["python", "ocean"],
+        }
+        for index in range(count)
+    ]
+
+
+async def measure(name: str, size: int, fn: Callable[[], Awaitable[Any]]) -> None:
+    max_stall = 0.0
+    running = True
+
+    async def tick() -> None:
+        nonlocal max_stall
+        while running:
+            before = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            max_stall = max(max_stall, time.perf_counter() - before - TICK_SECONDS)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(TICK_SECONDS)
+    start = time.perf_counter()
+    await fn()
+    elapsed = time.perf_counter() - start
+    running = False
+    await ticker
+    print(
+        f"{name:<24} {size:>10} items {elapsed:>9.3f}s, event loop blocked up to {max_stall * 1000:>9.1f}ms"
+    )
+
+
+async def main(sizes: list[int]) -> None:
+    for size in sizes:
+        items = create_items(size)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            providers: dict[str, Any] = {
+                "synchronous": SynchronousDiskCacheProvider(cache_dir),
+                "DiskCacheProvider": DiskCacheProvider(
+                    cache_dir, max_size_in_bytes=None
+                ),
+            }
+            for name, provider in providers.items():
+                key = f"{name}_{size}"
+                await measure(f"{name} set", size, lambda: provider.set(key, items))
+                await measure(f"{name} get", size, lambda: provider.get(key))
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES))
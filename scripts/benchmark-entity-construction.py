@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the construction of entities from mapped or Port data.
+
+Compares the validated construction (`Entity.parse_obj`) used at the API boundaries with the trusted
+construction (`Entity.from_trusted`) used for data built by the JQ mapping or returned by Port.
+
+Usage:
+    python ./scripts/benchmark-entity-construction.py [sizes...]
+"""
+
+import sys
+import time
+from typing import Any, Callable
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.utils import validate_result
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def create_entities_data(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "identifier": f"entity-{index}",
+            "blueprint": f"blueprint-{index % 10}",
+            "title": f"Entity {index}",
+            "properties": {
+                "index": index,
+                "language": "python",
+                "tags": ["a", "b", "c"],
+            },
+            "relations": {"parent": f"entity-{index // 2}"},
+        }
+        for index in range(count)
+    ]
+
+
+def measure(name: str, size: int, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<24} {size:>10} entities {elapsed:>9.3f}s {elapsed / size * 1e9:>9.0f}ns/entity"
+    )
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        data = create_entities_data(size)
+
+        measure(
+            "Entity.parse_obj", size, lambda: [Entity.parse_obj(item) for item in data]
+        )
+        measure(
+            "Entity.from_trusted",
+            size,
+            lambda: [Entity.from_trusted(item) for item in data],
+        )
+        measure("validate_result", size, lambda: validate_result(data))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
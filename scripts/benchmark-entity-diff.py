@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the entity diffing used by the resync reconciliation.
+
+Every diff is keyed on (blueprint, identifier), so the time per entity should stay flat as the
+number of entities grows.
+
+Usage:
+    python ./scripts/benchmark-entity-diff.py [sizes...]
+"""
+
+import sys
+import time
+from typing import Callable
+
+from port_ocean.core.models import Entity
+from port_ocean.core.utils.utils import (
+    get_entity_key,
+    get_port_diff,
+    resolve_entities_diff,
+)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def create_entities(count: int, offset: int = 0) -> list[Entity]:
+    return [
+        Entity(
+            identifier=f"entity-{index}",
+            blueprint=f"blueprint-{index % 10}",
+            properties={"index": index},
+            relations={"parent": f"entity-{index // 2}"},
+        )
+        for index in range(offset, offset + count)
+    ]
+
+
+def measure(name: str, size: int, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<24} {size:>10} entities {elapsed:>9.3f}s {elapsed / size * 1e9:>9.0f}ns/entity"
+    )
+
+
+def main(sizes: list[int]) -> None:
+    for size in sizes:
+        # A tenth of the entities is deleted and a tenth is created
+        before = create_entities(size)
+        after = create_entities(size, offset=size // 10)
+        keys_before = {get_entity_key(entity) for entity in before}
+
+        measure("get_port_diff", size, lambda: get_port_diff(before, after))
+        measure(
+            "resolve_entities_diff", size, lambda: resolve_entities_diff(after, before)
+        )
+        measure(
+            "entity keys diff",
+            size,
+            lambda: keys_before - {get_entity_key(entity) for entity in after},
+        )
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)